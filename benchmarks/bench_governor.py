@@ -0,0 +1,248 @@
+"""Benchmark suite for the governor cabinet on synthetic ledgers.
+
+    python benchmarks/bench_governor.py [--sizes 1000,10000,50000] [--years 3]
+        [--items 300] [--repeat 3] [--out FILE] [--compare OLD.json]
+
+For every ledger size a fresh GovernorCabinetWindow (Qt offscreen) is timed on:
+startup stages and time to first paint, apply_imported_data (first load and a
+re-import with ~1% of the rows changed), collect_stats_data, update_totals,
+update_stats_table (period change), _sort_transactions_by_date,
+export_transactions per format (UI-thread part and total), and the latency from
+a store edit to the sync thread reporting success.
+
+No Google access is made: the sync thread is replaced by one that succeeds at
+once, and the sync batching window is shortened to SYNC_INTERVAL_MS so the
+latency is the cabinet's own work. Results are written as JSON, by default to
+benchmarks/results/ (not tracked); --compare prints the ratio of every metric
+against an earlier results file.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from benchmarks.synthetic_ledger import synthetic_grids
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (1000, 10000, 50000)
+SYNC_INTERVAL_MS = 1
+EDIT_SAMPLES = 5
+WAIT_TIMEOUT_S = 120
+
+
+def _best_ms(fn, repeat, setup=None):
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t = time.perf_counter()
+        fn()
+        dt = (time.perf_counter() - t) * 1000
+        best = dt if best is None else min(best, dt)
+    return round(best, 3)
+
+
+def _wait(app, done, timeout=WAIT_TIMEOUT_S):
+    deadline = time.perf_counter() + timeout
+    while not done():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark step did not finish")
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _changed_grids(grids, share=0.01):
+    """Copy of `grids` with every 1/share-th stats row's quantity changed."""
+    stats = [list(row) for row in grids['stats']]
+    step = max(1, int(1 / share))
+    for row in stats[1::step]:
+        if row[2] == "Expense":
+            qty = int(row[4]) + 1
+            row[4] = str(qty)
+            row[6] = str(-qty * int(row[5]))
+    return {'objects': grids['objects'], 'stats': stats}
+
+
+def bench_size(app, governor, rows, args, out_dir):
+    from PyQt6.QtCore import QDate
+    from PyQt6.QtWidgets import QFileDialog
+    from modules.core.ledger_export import EXPORT_FORMATS
+    from modules.core.sheet_import import parse_fetched
+
+    # Each window restores from its own (empty) autosave directory
+    os.environ['GOVUT_DATA_DIR'] = tempfile.mkdtemp(prefix=f'govut-bench-{rows}-')
+    window = governor.GovernorCabinetWindow({'username': 'bench'})
+    result = {'rows': rows}
+    try:
+        window.resize(1400, 900)
+        window.show()
+        _wait(app, lambda: 'deferred_built' in window.startup.marks)
+        result['startup'] = window.startup.as_dict()
+
+        grids = synthetic_grids(rows, args.items, args.years)
+        parsed = parse_fetched(dict(grids))
+        changed = parse_fetched(_changed_grids(grids))
+
+        def _clear():
+            window.trans_store.clear()
+            window.item_catalog.clear()
+            app.processEvents()
+
+        def _apply(fetched):
+            window.apply_imported_data(fetched)
+            app.processEvents()
+
+        result['apply_imported_data_ms'] = _best_ms(lambda: _apply(parsed), args.repeat, setup=_clear)
+        result['apply_imported_data_patch_ms'] = _best_ms(lambda: _apply(changed), args.repeat,
+                                                          setup=lambda: _apply(parsed))
+        result['collect_stats_data_ms'] = _best_ms(window.collect_stats_data, args.repeat)
+        result['update_totals_ms'] = _best_ms(window.update_totals, args.repeat)
+
+        # Alternate between the whole span and its last year so every call recomputes
+        today = QDate.currentDate()
+        ranges = [(today.addYears(-args.years), today), (today.addYears(-1), today)]
+        state = {'i': 0}
+
+        def _next_period():
+            state['i'] += 1
+            start, end = ranges[state['i'] % 2]
+            window.period_range.setRange(start, end)
+            app.processEvents()
+
+        result['update_stats_table_ms'] = _best_ms(window.update_stats_table, args.repeat, setup=_next_period)
+        result['sort_transactions_by_date_ms'] = _best_ms(window._sort_transactions_by_date, args.repeat)
+        window.period_range.setRange(*ranges[0])
+        app.processEvents()
+
+        # Export: skip the Save As dialog and the completion message box
+        finished = []
+        window._on_export_finished = lambda path, error=None: finished.append(error)
+        for fmt in EXPORT_FORMATS:
+            path = os.path.join(out_dir, f'export_{rows}.{fmt}')
+            QFileDialog.getSaveFileName = staticmethod(lambda *a, p=path, **k: (p, ''))
+            ui_times, total_times = [], []
+            for _ in range(args.repeat):
+                finished.clear()
+                t = time.perf_counter()
+                window.export_transactions()
+                ui_times.append((time.perf_counter() - t) * 1000)
+                _wait(app, lambda: bool(finished))
+                total_times.append((time.perf_counter() - t) * 1000)
+                if finished[0] is not None:
+                    raise RuntimeError(f"export {fmt} failed: {finished[0]}")
+            result[f'export_{fmt}_ui_ms'] = round(min(ui_times), 3)
+            result[f'export_{fmt}_total_ms'] = round(min(total_times), 3)
+
+        # Edit -> recompute pass -> sync batch -> payload collected -> sync thread done.
+        # Rows are picked among the visible ones: those are the rows a user can edit.
+        window._sync_interval_ms = SYNC_INTERVAL_MS
+        _wait(app, lambda: not window.autosave.pending)
+        latencies = []
+        store, model = window.trans_store, window.trans_model
+        visible = model.rowCount() - 1
+        for k in range(EDIT_SAMPLES):
+            row = model.store_row((k * 7919) % visible)
+            t = time.perf_counter()
+            store.update(row, qty=store.qty[row] + 1)
+            _wait(app, lambda: not window.autosave.pending)
+            latencies.append((time.perf_counter() - t) * 1000)
+        result['edit_to_sync_ms'] = round(statistics.median(latencies), 3)
+        result['edit_to_sync_max_ms'] = round(max(latencies), 3)
+    finally:
+        window.close()
+        app.processEvents()
+    return result
+
+
+def compare(results, baseline_path):
+    """Print new/old ratios of every timing present in both result files."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    old_sizes = {str(r['rows']): r for r in baseline.get('results', [])}
+    print(f"compared with {baseline_path} ({baseline.get('meta', {}).get('revision')})")
+    for res in results:
+        old = old_sizes.get(str(res['rows']))
+        if old is None:
+            continue
+        print(f"  rows={res['rows']}")
+        for key, value in res.items():
+            if key.endswith('_ms') and isinstance(old.get(key), (int, float)) and old[key] > 0:
+                ratio = value / old[key]
+                flag = '  <-- slower' if ratio > 1.2 else ''
+                print(f"    {key:34s} {old[key]:10.2f} -> {value:10.2f} ms  x{ratio:.2f}{flag}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                    help="comma-separated ledger sizes (rows)")
+    ap.add_argument('--items', type=int, default=300)
+    ap.add_argument('--years', type=int, default=3)
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--out', default=os.path.join(RESULTS_DIR, 'bench_governor.json'))
+    ap.add_argument('--compare', default=None, help="earlier results file to compare against")
+    args = ap.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+
+    from PyQt6.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    import modules.ui.governor as governor
+
+    governor.GovernorCabinetWindow._auto_import_on_open = lambda self: None
+    # The sheets are never contacted: every sync succeeds at once
+    governor.GoogleSheetSyncThread.run = lambda self: self.finished_ok.emit()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='govut-bench-out-') as out_dir:
+        for rows in sizes:
+            res = bench_size(app, governor, rows, args, out_dir)
+            results.append(res)
+            print(f"rows={rows}: " + ", ".join(f"{k[:-3]} {v:.1f}" for k, v in res.items() if k.endswith('_ms')))
+
+    doc = {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'qt': QT_VERSION_STR,
+            'pyqt': PYQT_VERSION_STR,
+            'platform': platform.platform(),
+            'qpa': os.environ.get('QT_QPA_PLATFORM'),
+            'items': args.items,
+            'years': args.years,
+            'repeat': args.repeat,
+            'sync_interval_ms': SYNC_INTERVAL_MS,
+        },
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(doc, f, ensure_ascii=False, indent=2)
+    print(f"results written to {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Time the governor import pipeline on a synthetic ledger.
+
+    python benchmarks/bench_import.py [--rows 10000] [--items 200] [--repeat 3]
+
+Reports the worker-thread part (parse_fetched) and the UI-thread part
+(apply_imported_data with pre-parsed columns) separately, plus apply on raw
+grids for comparison. Both loads start from empty stores; re-importing the
+same data (the row diff finding nothing to change) is reported on its own.
+Runs Qt offscreen; no Google access is made.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+# Keep the cabinet autosave away from the user's real data
+os.environ.setdefault('GOVUT_DATA_DIR', tempfile.mkdtemp(prefix='govut-bench-'))
+
+from benchmarks.synthetic_ledger import synthetic_grids
+
+
+def _best(fn, repeat, setup=None):
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument('--rows', type=int, default=10000)
+    ap.add_argument('--items', type=int, default=200)
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args(argv)
+
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    import modules.ui.governor as governor
+    from modules.core.sheet_import import parse_fetched
+
+    governor.GovernorCabinetWindow._auto_import_on_open = lambda self: None
+    window = governor.GovernorCabinetWindow({'username': 'bench'})
+    try:
+        # Shown like in the app, so the UI-thread figures include the view updates
+        window.show()
+        app.processEvents()
+        grids = synthetic_grids(args.rows, args.items)
+
+        parse_s = _best(lambda: parse_fetched(dict(grids)), args.repeat)
+        parsed = parse_fetched(dict(grids))
+
+        def _apply(fetched):
+            window.apply_imported_data(fetched)
+            app.processEvents()
+
+        def _clear():
+            window.trans_store.clear()
+            window.item_catalog.clear()
+            app.processEvents()
+
+        apply_s = _best(lambda: _apply(parsed), args.repeat, setup=_clear)
+        raw_s = _best(lambda: _apply(dict(grids)), args.repeat, setup=_clear)
+        reimport_s = _best(lambda: _apply(parsed), args.repeat)
+
+        print(f"rows={args.rows} items={args.items} (best of {args.repeat})")
+        print(f"  parse (worker thread)      {parse_s * 1000:9.1f} ms")
+        print(f"  apply parsed (UI thread)   {apply_s * 1000:9.1f} ms")
+        print(f"  apply raw grids (UI only)  {raw_s * 1000:9.1f} ms")
+        print(f"  re-import, no changes      {reimport_s * 1000:9.1f} ms")
+        print(f"  loaded: {len(window.trans_store)} transactions, {len(window.item_catalog)} items")
+    finally:
+        window.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Synthetic governor data shaped like the real 'objects' and 'stats' sheets.
+
+Transactions are spread over the last `years` years up to today, in date
+order (as a ledger grows), with a skewed item popularity and ~15% income.
+Everything is seeded, so a given (rows, items, years, seed) is reproducible.
+"""
+import datetime
+import random
+
+OBJECTS_HEADER = ["Item Name", "Base Price"]
+STATS_HEADER = ["#", "Date", "Type", "Item", "Qty", "Price", "Sum"]
+INCOME_SHARE = 0.15
+
+
+def synthetic_items(items: int = 200, seed: int = 1):
+    """[(name, base price)] of the item catalog."""
+    rnd = random.Random(seed)
+    return [(f"Предмет {i}", rnd.randint(1, 500) * 10) for i in range(items)]
+
+
+def synthetic_transactions(rows: int, items: int = 200, years: int = 2, seed: int = 1, end=None):
+    """[(date 'dd.MM.yyyy', is_income, item, qty, price)] in date order."""
+    rnd = random.Random(seed)
+    catalog = synthetic_items(items, seed)
+    end = end or datetime.date.today()
+    span = max(1, int(years * 365.25))
+    first = end.toordinal() - span + 1
+    days = sorted(first + rnd.randrange(span) for _ in range(rows))
+    # A few items account for most of the rows
+    picks = rnd.choices(range(items), weights=[1.0 / (k + 1) for k in range(items)], k=rows)
+    out = []
+    for day, k in zip(days, picks):
+        name, base = catalog[k]
+        date = datetime.date.fromordinal(day).strftime('%d.%m.%Y')
+        if rnd.random() < INCOME_SHARE:
+            out.append((date, True, name, 1, rnd.randint(100, 50000)))
+        else:
+            out.append((date, False, name, rnd.randint(1, 20), max(1, base + rnd.randint(-base // 5, base // 5))))
+    return out
+
+
+def synthetic_grids(rows: int, items: int = 200, years: int = 2, seed: int = 1) -> dict:
+    """Objects and stats sheet grids as GoogleService.get_sheet_data returns them."""
+    objects = [OBJECTS_HEADER] + [[name, str(price)] for name, price in synthetic_items(items, seed)]
+    stats = [STATS_HEADER]
+    for i, (date, income, name, qty, price) in enumerate(synthetic_transactions(rows, items, years, seed), 1):
+        total = price if income else -qty * price
+        stats.append([str(i), date, "Income" if income else "Expense", name, str(qty), str(price), str(total)])
+    return {'objects': objects, 'stats': stats}
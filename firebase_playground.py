@@ -5,6 +5,8 @@ Usage:
   py .\firebase_playground.py recreate   - delete users collection content and recreate from Google Sheets
   py .\firebase_playground.py migrate    - merge users from Google Sheets into Firestore (create/update)
   py .\firebase_playground.py read_users - print users currently in Firestore
+  py .\firebase_playground.py backup --dir DIR   - export users/role_settings to a JSONL snapshot
+  py .\firebase_playground.py restore --dir DIR  - upload a snapshot back (resumable)
 
 This script centralizes the migration logic; other code should keep using the Firestore `users` collection.
 """
@@ -228,10 +230,41 @@ def fix_user_roles():
             pprint(e)
 
 
+def backup_collections(snapshot_dir):
+    """Export users and role_settings to a compressed JSONL snapshot."""
+    from modules.core.firestore_backup import export_snapshot
+    try:
+        manifest = export_snapshot(snapshot_dir)
+    except Exception as e:
+        print('Ошибка экспорта:', e)
+        return
+    for name, info in manifest['collections'].items():
+        print(f"{name}: {info['count']} документов -> {info['file']}")
+
+
+def restore_collections(snapshot_dir, workers=4):
+    """Restore a snapshot created by backup_collections (continues an interrupted run)."""
+    from modules.core.firestore_backup import restore_snapshot
+
+    def _progress(name, written, total):
+        print(f'\r{name}: {written}/{total}', end='', flush=True)
+
+    try:
+        written = restore_snapshot(snapshot_dir, workers=workers, progress=_progress)
+    except Exception as e:
+        print('\nОшибка восстановления (запустите снова для продолжения):', e)
+        return
+    print()
+    for name, count in written.items():
+        print(f'{name}: восстановлено {count} документов')
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description='Firebase users migration playground')
-    parser.add_argument('action', nargs='?', default='recreate', choices=['recreate', 'migrate', 'read_users', 'fix_roles'], help='Действие')
+    parser.add_argument('action', nargs='?', default='recreate', choices=['recreate', 'migrate', 'read_users', 'fix_roles', 'backup', 'restore'], help='Действие')
+    parser.add_argument('--dir', default='users_snapshot', help='Папка снимка для backup/restore')
+    parser.add_argument('--workers', type=int, default=4, help='Параллельных пакетов при restore')
     args = parser.parse_args()
 
     if args.action == 'recreate':
@@ -242,6 +275,10 @@ def main():
         read_users()
     elif args.action == 'fix_roles':
         fix_user_roles()
+    elif args.action == 'backup':
+        backup_collections(args.dir)
+    elif args.action == 'restore':
+        restore_collections(args.dir, workers=args.workers)
 
 
 if __name__ == '__main__':
@@ -166,4 +166,11 @@ if __name__ == "__main__":
     login.login_success.connect(start_launcher)
     login.show()
 
+    # Build the Firestore client in the background while the user types credentials
+    try:
+        from modules.core.firebase_service import warm_up_firestore
+        warm_up_firestore()
+    except Exception:
+        pass
+
     sys.exit(app.exec())
\ No newline at end of file
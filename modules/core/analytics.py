@@ -0,0 +1,159 @@
+"""Vectorized ledger analytics (NumPy) for the governor's Trends tab.
+
+`LedgerArrays.capture()` copies the store columns into NumPy arrays (a buffer
+copy per column, no per-row Python work). `ledger_trends()` then answers the
+Trends tab from them with whole-array operations: bincount group-bys per item
+and per day, cumsum running balance, a moving average from cumsum differences
+and argpartition/argsort for the top spenders.
+
+NumPy is optional: without it `available()` is False and the tab says so.
+"""
+from dataclasses import dataclass, field
+from typing import List
+
+from modules.core.item_catalog import item_key
+
+try:
+    import numpy as np
+except ImportError:  # analytics are disabled without numpy
+    np = None
+
+DEFAULT_WINDOW = 7
+DEFAULT_TOP = 10
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _column(arr):
+    # Copy through the buffer protocol; a live view would stop the store's
+    # arrays from resizing
+    return np.frombuffer(arr, dtype=np.dtype(arr.typecode)).astype(np.int64)
+
+
+def _key_ids(names):
+    """(interned id -> key id array, name per key id): names equal under item_key
+    share one id, as in ItemStats and LedgerRollup. Key id 0 is the empty name."""
+    ids = {'': 0}
+    key_names = ['']
+    mapping = np.empty(len(names), dtype=np.int64)
+    for i, name in enumerate(names):
+        key = item_key(name)
+        k = ids.get(key)
+        if k is None:
+            k = ids[key] = len(key_names)
+            key_names.append(name.strip())
+        mapping[i] = k
+    return mapping, key_names
+
+
+@dataclass
+class LedgerArrays:
+    day: 'np.ndarray'
+    income: 'np.ndarray'
+    item: 'np.ndarray'
+    qty: 'np.ndarray'
+    total: 'np.ndarray'
+    names: List[str] = field(default_factory=list)       # display name per item key id
+
+    @classmethod
+    def capture(cls, store):
+        # `item` holds item key ids: the store interns exact names, the views group by item_key
+        key_of, names = _key_ids(store.item_names)
+        return cls(_column(store.day), _column(store.income).astype(bool), key_of[_column(store.item_id)],
+                   _column(store.qty), _column(store.total), names)
+
+    def __len__(self):
+        return len(self.day)
+
+    def period_mask(self, start_day=None, end_day=None, include_undated=False):
+        mask = self.day > 0
+        if start_day is not None:
+            mask &= self.day >= start_day
+        if end_day is not None:
+            mask &= self.day <= end_day
+        if include_undated:
+            mask |= self.day == 0
+        return mask
+
+
+@dataclass
+class LedgerTrends:
+    first_day: int = 0                  # julian day of daily[0]
+    daily_income: 'np.ndarray' = None   # per calendar day, days without rows included
+    daily_expense: 'np.ndarray' = None  # negative, as in the store
+    balance: 'np.ndarray' = None        # running balance at the end of each day
+    moving_expense: 'np.ndarray' = None  # trailing `window`-day mean of daily_expense
+    window: int = DEFAULT_WINDOW
+    top: list = field(default_factory=list)  # [(name, expense, qty, count)], biggest expense first
+    income: int = 0
+    expense: int = 0
+    count: int = 0
+
+    @property
+    def days(self) -> int:
+        return 0 if self.daily_income is None else len(self.daily_income)
+
+
+def moving_average(values, window: int):
+    """Trailing mean over `window` values (shorter at the start), via cumsum."""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values) or window <= 1:
+        return values.copy()
+    csum = np.cumsum(values)
+    out = csum.copy()
+    out[window:] = csum[window:] - csum[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return out / counts
+
+
+def item_totals(ledger: LedgerArrays, mask=None):
+    """(expense, qty, count) per item key id over the masked expense rows."""
+    n = len(ledger.names)
+    rows = ~ledger.income if mask is None else (mask & ~ledger.income)
+    items = ledger.item[rows]
+    expense = np.bincount(items, weights=ledger.total[rows], minlength=n)
+    qty = np.bincount(items, weights=ledger.qty[rows], minlength=n)
+    count = np.bincount(items, minlength=n)
+    return expense, qty, count
+
+
+def top_spenders(ledger: LedgerArrays, mask=None, top: int = DEFAULT_TOP):
+    """[(name, expense, qty, count)] of the `top` items with the largest expense."""
+    expense, qty, count = item_totals(ledger, mask)
+    # Rows with an empty name are not an item
+    expense[0] = 0
+    spent = -expense
+    candidates = np.flatnonzero(spent > 0)
+    if len(candidates) > top:
+        part = np.argpartition(spent[candidates], -top)[-top:]
+        candidates = candidates[part]
+    order = candidates[np.argsort(-spent[candidates], kind='stable')]
+    return [(ledger.names[i], int(expense[i]), int(qty[i]), int(count[i])) for i in order]
+
+
+def ledger_trends(ledger: LedgerArrays, start_day=None, end_day=None,
+                  window: int = DEFAULT_WINDOW, top: int = DEFAULT_TOP) -> LedgerTrends:
+    mask = ledger.period_mask(start_day, end_day)
+    result = LedgerTrends(window=window)
+    if not mask.any():
+        return result
+    day = ledger.day[mask]
+    total = ledger.total[mask]
+    income = ledger.income[mask]
+    first = int(day.min())
+    offset = day - first
+    span = int(offset.max()) + 1
+    daily_income = np.bincount(offset[income], weights=total[income], minlength=span)
+    daily_expense = np.bincount(offset[~income], weights=total[~income], minlength=span)
+    result.first_day = first
+    result.daily_income = daily_income
+    result.daily_expense = daily_expense
+    result.balance = np.cumsum(daily_income + daily_expense)
+    result.moving_expense = moving_average(daily_expense, window)
+    result.top = top_spenders(ledger, mask, top)
+    result.income = int(daily_income.sum())
+    result.expense = int(daily_expense.sum())
+    result.count = int(mask.sum())
+    return result
@@ -0,0 +1,346 @@
+"""Crash-safe local autosave of the governor cabinet (transactions and items).
+
+Every store edit is appended to an operation log; every COMPACT_EVERY edits,
+and on every reset or reorder, a snapshot of both stores starts a new log
+generation. Restoring reads one snapshot and replays a short tail of ops.
+
+    <dir>/snapshot.json       {"version", "gen", "seq", "synced", "transactions", "items"}
+    <dir>/ops-<gen>.log       one JSON op per line; a torn last line is ignored
+
+Ops address rows by position and are replayed in order through the store
+methods:
+
+    ["ti", first, [[day, is_income, item, qty, price], ...]]   insert rows
+    ["td", first, last]                                        remove rows
+    ["tu", row, {field: value}]                                update a row
+    ["ii", first, [[name, price], ...]] / ["id", ...] / ["iu", ...]   items
+    ["synced", seq]                    edits up to `seq` reached the sheets
+
+Files are written by a writer thread; the UI thread only turns store events
+into small lists (and copies the columns for a snapshot) and queues them. The
+writer drains the queue in batches and fsyncs once per batch. Edits after the
+last "synced" op are the remote sync still pending after a restore.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from array import array
+
+from modules.core.transaction_store import FIELDS
+
+SNAPSHOT_NAME = 'snapshot.json'
+SNAPSHOT_VERSION = 1
+# Edits logged before the log is compacted into a new snapshot
+COMPACT_EVERY = 2000
+# The writer collects ops for this long before writing and fsyncing them
+FLUSH_INTERVAL = 0.5
+
+_STOP = object()
+
+
+def _log_name(gen: int) -> str:
+    return f'ops-{gen}.log'
+
+
+def _fsync_dir(path: str):
+    # Makes a rename durable on POSIX; directories cannot be opened on Windows
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+class _Snapshot:
+    """Columns of both stores copied on the UI thread; serialized by the writer."""
+
+    def __init__(self, store, catalog, gen, seq, synced):
+        self.gen, self.seq, self.synced = gen, seq, synced
+        self.day = array('l', store.day)
+        self.income = array('b', store.income)
+        self.item_id = array('l', store.item_id)
+        self.qty = array('q', store.qty)
+        self.price = array('q', store.price)
+        self.names = list(store.item_names)
+        self.items = catalog.row_tuples()
+
+    def write_to(self, f):
+        # One json.dumps per column keeps each stretch of GIL-holding work short
+        head = {'version': SNAPSHOT_VERSION, 'gen': self.gen, 'seq': self.seq, 'synced': self.synced}
+        f.write(_dumps(head)[:-1] + ',"transactions":{')
+        columns = (('names', self.names), ('day', self.day.tolist()), ('income', self.income.tolist()),
+                   ('item_id', self.item_id.tolist()), ('qty', self.qty.tolist()), ('price', self.price.tolist()))
+        for k, (name, values) in enumerate(columns):
+            f.write(('' if k == 0 else ',') + f'"{name}":' + _dumps(values))
+        f.write('},"items":' + _dumps(self.items) + '}')
+
+
+class CabinetAutosave:
+    def __init__(self, directory: str, compact_every: int = COMPACT_EVERY,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.directory = directory
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self.store = None
+        self.catalog = None
+        self.gen = 0
+        self.seq = 0           # edits logged so far, across generations
+        self.synced = 0        # seq covered by the last successful remote sync
+        self._since_snapshot = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._writer_gen = 0   # generation of the log the writer appends to
+        self._failed = False
+
+    @property
+    def pending(self) -> bool:
+        """True when some logged edits have not reached the sheets yet."""
+        return self.seq > self.synced
+
+    # --- restore -------------------------------------------------------------
+    def restore(self, store, catalog) -> bool:
+        """Load the last saved state into the (not yet attached) stores.
+        Returns False when there is nothing to restore."""
+        try:
+            with open(os.path.join(self.directory, SNAPSHOT_NAME), 'r', encoding='utf-8') as f:
+                snap = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"[Autosave] snapshot unreadable, starting empty: {e}")
+            return False
+        if snap.get('version') != SNAPSHOT_VERSION:
+            return False
+        self.gen = int(snap.get('gen', 0))
+        self.seq = int(snap.get('seq', 0))
+        self.synced = int(snap.get('synced', 0))
+        t = snap['transactions']
+        names = t['names']
+        store.load_columns(t['day'], t['income'], [names[i] for i in t['item_id']], t['qty'], t['price'])
+        catalog.load(snap.get('items', ()))
+        replayed = 0
+        for op in self._read_log(self.gen):
+            try:
+                if self._replay(op, store, catalog):
+                    self.seq += 1
+                    replayed += 1
+            except Exception as e:
+                # Positions after a failed op are meaningless; keep what applied
+                print(f"[Autosave] replay stopped at {op[0]}: {e}")
+                break
+        self._since_snapshot = replayed
+        print(f"[Autosave] restored {len(store)} transactions, {len(catalog)} items "
+              f"({replayed} logged edits, sync pending: {self.pending})")
+        return True
+
+    def _read_log(self, gen):
+        try:
+            f = open(os.path.join(self.directory, _log_name(gen)), 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # torn write of the last batch
+                    return
+
+    def _replay(self, op, store, catalog) -> bool:
+        """Apply one logged op; returns True for edits (False for sync marks)."""
+        kind = op[0]
+        if kind == 'synced':
+            self.synced = max(self.synced, int(op[1]))
+            return False
+        if kind == 'ti':
+            first, rows = op[1], op[2]
+            if first == len(store):
+                cols = list(zip(*rows))
+                store.append_columns(*cols)
+            else:
+                for k, row in enumerate(rows):
+                    store.insert(first + k, **dict(zip(FIELDS, row)))
+        elif kind == 'td':
+            for row in range(op[2], op[1] - 1, -1):
+                store.remove(row)
+        elif kind == 'tu':
+            store.update(op[1], **op[2])
+        elif kind == 'ii':
+            for k, (name, price) in enumerate(op[2]):
+                catalog.insert(op[1] + k, name, price)
+        elif kind == 'id':
+            for row in range(op[2], op[1] - 1, -1):
+                catalog.remove(row)
+        elif kind == 'iu':
+            catalog.update(op[1], **op[2])
+        else:
+            raise ValueError(f"unknown op {kind!r}")
+        return True
+
+    # --- logging -------------------------------------------------------------
+    def attach(self, store, catalog):
+        """Start logging edits of both stores (after restore())."""
+        self.store = store
+        self.catalog = catalog
+        store.add_listener(self._on_store_event)
+        catalog.add_listener(self._on_catalog_event)
+        if self._thread is None:
+            self._writer_gen = self.gen
+            self._thread = threading.Thread(target=self._run, name='CabinetAutosave', daemon=True)
+            self._thread.start()
+        # Start a fresh generation so the log never mixes with a replayed one
+        self.compact()
+
+    def _log(self, op):
+        self.seq += 1
+        self._since_snapshot += 1
+        self._queue.put(op)
+        if self._since_snapshot >= self.compact_every:
+            self.compact()
+
+    def _on_store_event(self, event, *args):
+        s = self.store
+        if event == 'insert':
+            first, last = args
+            names = s.item_names
+            self._log(['ti', first, [[s.day[r], s.income[r], names[s.item_id[r]], s.qty[r], s.price[r]]
+                                     for r in range(first, last + 1)]])
+        elif event == 'remove':
+            self._log(['td', args[0], args[1]])
+        elif event == 'update':
+            row, fields = args[0], args[1]
+            rec = dict(zip(FIELDS, (s.day[row], s.income[row], s.item_name(row), s.qty[row], s.price[row])))
+            self._log(['tu', row, {f: rec[f] for f in fields}])
+        elif event in ('reset', 'reorder'):
+            self.compact()
+
+    def _on_catalog_event(self, event, *args):
+        c = self.catalog
+        if event == 'insert':
+            first, last = args
+            self._log(['ii', first, [[c.names[r], c.prices[r]] for r in range(first, last + 1)]])
+        elif event == 'remove':
+            self._log(['id', args[0], args[1]])
+        elif event == 'update':
+            row, fields = args[0], args[1]
+            rec = {'name': c.names[row], 'price': c.prices[row]}
+            self._log(['iu', row, {f: rec[f] for f in fields}])
+        elif event == 'reset':
+            self.compact()
+
+    def compact(self):
+        """Queue a snapshot of both stores; later ops go to the next generation's log."""
+        if self.store is None:
+            return
+        self.gen += 1
+        self._since_snapshot = 0
+        self._queue.put(_Snapshot(self.store, self.catalog, self.gen, self.seq, self.synced))
+
+    def mark_synced(self, seq=None):
+        """Record that the sheets hold every edit up to `seq` (default: all so far)."""
+        seq = self.seq if seq is None else seq
+        if seq <= self.synced:
+            return
+        self.synced = seq
+        if self.store is not None:
+            self._queue.put(['synced', seq])
+
+    def close(self):
+        """Write a final snapshot and wait for the writer to finish."""
+        th = self._thread
+        if th is None:
+            return
+        if self._since_snapshot:
+            self.compact()
+        self._queue.put(_STOP)
+        th.join()
+        self._thread = None
+        for listener, owner in ((self._on_store_event, self.store), (self._on_catalog_event, self.catalog)):
+            if owner is not None:
+                owner.remove_listener(listener)
+
+    # --- writer thread ---------------------------------------------------------
+    def _run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        log = None
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not _STOP:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                log, stop = self._write_batch(log, batch)
+            except Exception as e:
+                # Keep the app running; the next snapshot starts clean
+                if not self._failed:
+                    print(f"[Autosave] write failed: {e}")
+                self._failed = True
+                stop = stop or any(item is _STOP for item in batch)
+        if log is not None:
+            log.close()
+
+    def _write_batch(self, log, batch):
+        lines = []
+        stop = False
+
+        def flush_lines():
+            if lines and log is not None:
+                log.write('\n'.join(lines) + '\n')
+                log.flush()
+                os.fsync(log.fileno())
+            lines.clear()
+
+        for item in batch:
+            if item is _STOP:
+                stop = True
+            elif isinstance(item, _Snapshot):
+                flush_lines()
+                if log is not None:
+                    log.close()
+                log = self._write_snapshot(item)
+            else:
+                if log is None:
+                    log = open(os.path.join(self.directory, _log_name(self._writer_gen)), 'a', encoding='utf-8')
+                lines.append(_dumps(item))
+        flush_lines()
+        return log, stop
+
+    def _write_snapshot(self, snap):
+        """Atomically replace the snapshot, then open its (empty) log and drop old ones."""
+        path = os.path.join(self.directory, SNAPSHOT_NAME)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            snap.write_to(f)
+            f.flush()
+            os.fsync(f.fileno())
+        log = open(os.path.join(self.directory, _log_name(snap.gen)), 'w', encoding='utf-8')
+        os.replace(tmp, path)
+        _fsync_dir(self.directory)
+        self._writer_gen = snap.gen
+        self._failed = False
+        keep = _log_name(snap.gen)
+        for name in os.listdir(self.directory):
+            if name.startswith('ops-') and name.endswith('.log') and name != keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        return log
@@ -0,0 +1,288 @@
+"""Bulk import of transactions from pasted TSV text or CSV/TSV/XLSX files.
+
+Runs without Qt so BulkImportThread can read and validate on a worker thread.
+`parse_bulk_grid()` makes one pass over the rows and returns LedgerColumns that
+TransactionStore.append_columns() adds with a single insert; rows that fail
+validation are skipped and reported with their line numbers.
+
+Columns are taken from a header row when there is one (Russian or English
+names, see HEADER_ALIASES). Without a header, the transaction export layout
+(№, Дата, Тип, Предмет, Кол-во, Цена, Сумма) is recognized by its leading
+number and date; rows starting with a date are read as Дата, Тип, Предмет,
+Кол-во, Цена, Сумма and any other rows as Предмет, Кол-во, Цена, Сумма.
+The aligned TXT export (columns joined by ' | ' under a dashed rule, totals
+footer) is read back as well.
+"""
+import csv
+import datetime
+import io
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from xml.etree import ElementTree
+
+from modules.core.item_catalog import item_key
+from modules.core.ledger_export import TXT_SEP
+from modules.core.sheet_import import LedgerColumns, normalize_type_to_income_flag
+from modules.core.transaction_store import JULIAN_OFFSET, date_to_day, today_day
+
+HEADER_ALIASES = {
+    'num': ('№', '#', 'n', 'no'),
+    'date': ('дата', 'date'),
+    'type': ('тип', 'type'),
+    'item': ('предмет', 'предмет|услуга', 'услуга', 'товар', 'item', 'item name', 'name'),
+    'qty': ('кол-во', 'количество', 'qty', 'quantity'),
+    'price': ('цена', 'price', 'base price'),
+    'sum': ('сумма', 'sum', 'total', 'итого'),
+}
+_ALIAS_FIELD = {alias: name for name, aliases in HEADER_ALIASES.items() for alias in aliases}
+
+DEFAULT_LAYOUT = ('date', 'type', 'item', 'qty', 'price', 'sum')
+EXPORT_LAYOUT = ('num', 'date', 'type', 'item', 'qty', 'price', 'sum')
+ITEM_LAYOUT = ('item', 'qty', 'price', 'sum')
+
+BULK_FILE_FILTER = "Таблицы (*.csv *.tsv *.txt *.xlsx);;All Files (*)"
+
+_THOUSANDS_DOTS = re.compile(r'^-?\d{1,3}(\.\d{3})+$')
+_THOUSANDS_COMMAS = re.compile(r'^-?\d{1,3}(,\d{3})+$')
+# The dashed line under the header of the aligned TXT export
+_TXT_RULE = re.compile(r'^-+( \| -+)+\s*$')
+_ISO_DATE = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})')
+_EXCEL_EPOCH = datetime.date(1899, 12, 30).toordinal() + JULIAN_OFFSET
+_XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+@dataclass
+class BulkResult:
+    columns: LedgerColumns = field(default_factory=LedgerColumns)
+    errors: List[Tuple[int, str]] = field(default_factory=list)   # (line number, message)
+    filled_prices: int = 0                                        # prices taken from the catalog
+
+    def __len__(self):
+        return len(self.columns)
+
+
+# --- reading --------------------------------------------------------------------
+def split_aligned_txt(lines):
+    """Rows of the aligned TXT export: cells of the ' | ' lines, without the
+    dashed rule and the totals footer. Item names containing ' | ' are joined
+    back using the header's column count."""
+    grid = []
+    width = item_col = None
+    for line in lines:
+        if TXT_SEP not in line or _TXT_RULE.match(line):
+            continue
+        cells = [c.strip() for c in line.rstrip('\r\n').split(TXT_SEP)]
+        if width is None:
+            width = len(cells)
+            fields = [_ALIAS_FIELD.get(c.lower()) for c in cells]
+            item_col = fields.index('item') if 'item' in fields else None
+        elif len(cells) > width and item_col is not None:
+            extra = len(cells) - width
+            cells[item_col:item_col + extra + 1] = [TXT_SEP.join(cells[item_col:item_col + extra + 1])]
+        grid.append(cells)
+    return grid
+
+
+def split_text(text: str):
+    """Rows of pasted or file text: the aligned TXT export when its dashed rule
+    follows the first line; else tab-separated when there are tabs, else CSV
+    with ';' or ',' (whichever the first line has more of)."""
+    text = text.lstrip('﻿')
+    lines = [ln for ln in text.splitlines()[:3] if ln.strip()]
+    if len(lines) >= 2 and _TXT_RULE.match(lines[1]):
+        return split_aligned_txt(text.splitlines())
+    first = text.split('\n', 1)[0]
+    if '\t' in text:
+        delimiter = '\t'
+    elif first.count(';') > first.count(','):
+        delimiter = ';'
+    else:
+        delimiter = ','
+    return list(csv.reader(io.StringIO(text), delimiter=delimiter))
+
+
+def _column_index(ref: str) -> int:
+    n = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        n = n * 26 + ord(ch.upper()) - 64
+    return n - 1
+
+
+def read_xlsx(path: str):
+    """Cell texts of the first worksheet. Numbers are returned as written in
+    the file (dates stay Excel serials; parse_bulk_grid understands those)."""
+    with zipfile.ZipFile(path) as zf:
+        shared = []
+        if 'xl/sharedStrings.xml' in zf.namelist():
+            root = ElementTree.fromstring(zf.read('xl/sharedStrings.xml'))
+            for si in root.iter(_XLSX_NS + 'si'):
+                shared.append(''.join(t.text or '' for t in si.iter(_XLSX_NS + 't')))
+        sheets = sorted(n for n in zf.namelist() if n.startswith('xl/worksheets/sheet') and n.endswith('.xml'))
+        if not sheets:
+            return []
+        grid = []
+        with zf.open(sheets[0]) as fh:
+            for _event, elem in ElementTree.iterparse(fh):
+                if elem.tag != _XLSX_NS + 'row':
+                    continue
+                row = []
+                for c in elem.iter(_XLSX_NS + 'c'):
+                    kind = c.get('t')
+                    if kind == 'inlineStr':
+                        value = ''.join(t.text or '' for t in c.iter(_XLSX_NS + 't'))
+                    else:
+                        v = c.find(_XLSX_NS + 'v')
+                        value = v.text if v is not None and v.text is not None else ''
+                        if kind == 's' and value:
+                            value = shared[int(value)]
+                    col = _column_index(c.get('r', '')) if c.get('r') else len(row)
+                    row.extend([''] * (col - len(row) + 1))
+                    row[col] = value
+                grid.append(row)
+                elem.clear()
+        return grid
+
+
+def read_grid_file(path: str):
+    if os.path.splitext(path)[1].lower() == '.xlsx':
+        return read_xlsx(path)
+    with open(path, 'rb') as fh:
+        raw = fh.read()
+    try:
+        text = raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        text = raw.decode('cp1251')
+    return split_text(text)
+
+
+# --- parsing --------------------------------------------------------------------
+def parse_amount(text):
+    """'1.234$', '1,234', '+500', '-1 000', '12,0' -> int; None when empty; ValueError on garbage."""
+    t = str(text if text is not None else '').strip()
+    t = t.replace('$', '').replace(' ', '').replace(' ', '').replace('+', '')
+    if not t:
+        return None
+    if _THOUSANDS_DOTS.match(t) or _THOUSANDS_COMMAS.match(t):
+        t = t.replace('.', '').replace(',', '')
+    return int(float(t.replace(',', '.')))
+
+
+def parse_day(text) -> int:
+    """Julian day of dd.MM.yyyy, dd/MM/yyyy, yyyy-MM-dd or an Excel serial; 0 if invalid."""
+    t = str(text or '').strip()
+    if not t:
+        return 0
+    day = date_to_day(t.replace('/', '.'))
+    if day:
+        return day
+    m = _ISO_DATE.match(t)
+    if m:
+        try:
+            return datetime.date(int(m.group(1)), int(m.group(2)), int(m.group(3))).toordinal() + JULIAN_OFFSET
+        except ValueError:
+            return 0
+    try:
+        serial = float(t)
+    except ValueError:
+        return 0
+    # Excel serials of 1954..2119; smaller numbers are not taken for dates
+    if 20000 <= serial < 80000:
+        return _EXCEL_EPOCH + int(serial)
+    return 0
+
+
+def _header_layout(row):
+    fields = tuple(_ALIAS_FIELD.get(str(c).strip().lower()) for c in row)
+    if sum(1 for f in fields if f) >= 2 and 'item' in fields:
+        return fields
+    return None
+
+
+def _guess_layout(row):
+    cells = [str(c).strip() for c in row]
+    if len(cells) >= 7 and cells[0].isdigit() and parse_day(cells[1]):
+        return EXPORT_LAYOUT
+    if parse_day(cells[0]):
+        return DEFAULT_LAYOUT
+    return ITEM_LAYOUT
+
+
+def parse_bulk_grid(grid, prices=None, default_day=None) -> BulkResult:
+    """Validate rows into store columns. `prices` maps item_key -> catalog price
+    and fills expense rows without a price (income rows take their sum); rows
+    without a date get `default_day` (today when None).
+    """
+    prices = prices or {}
+    if default_day is None:
+        default_day = today_day()
+    result = BulkResult()
+    cols = result.columns
+    layout = None
+    for line, row in enumerate(grid, 1):
+        if not row or not any(str(c).strip() for c in row):
+            continue
+        if layout is None:
+            layout = _header_layout(row)
+            if layout is not None:
+                continue
+            layout = _guess_layout(row)
+        values = {}
+        for name, cell in zip(layout, row):
+            if name and name not in values:
+                values[name] = str(cell).strip()
+        try:
+            item = values.get('item', '')
+            if not item:
+                raise ValueError("не указан предмет")
+            date_text = values.get('date', '')
+            day = parse_day(date_text) if date_text else default_day
+            if not day:
+                raise ValueError(f"неверная дата «{date_text}»")
+            total = parse_amount(values.get('sum'))
+            income = normalize_type_to_income_flag(values.get('type', ''), values.get('sum', ''))
+            qty = parse_amount(values.get('qty'))
+            if qty is None or income:
+                qty = 1 if qty is None else qty
+            if not income and qty <= 0:
+                raise ValueError(f"неверное количество «{values.get('qty', '')}»")
+            price = parse_amount(values.get('price'))
+            if not price and income:
+                # An income amount is never a catalog price
+                if not total:
+                    raise ValueError("не указана сумма дохода")
+                price = abs(total)
+            elif not price:
+                catalog_price = prices.get(item_key(item))
+                if catalog_price:
+                    price = catalog_price
+                    result.filled_prices += 1
+                elif total:
+                    price = abs(total) // max(1, qty)
+                if not price:
+                    raise ValueError("не указана цена и предмета нет в каталоге")
+        except ValueError as e:
+            msg = str(e)
+            if not msg or msg.startswith(('invalid literal', 'could not convert')):
+                msg = "неверное число"
+            result.errors.append((line, msg))
+            continue
+        cols.day.append(day)
+        cols.income.append(1 if income else 0)
+        cols.items.append(item)
+        cols.qty.append(abs(qty))
+        cols.price.append(abs(price))
+    return result
+
+
+def parse_bulk_source(source, prices=None) -> BulkResult:
+    """`source` is pasted text or ('file', path)."""
+    if isinstance(source, tuple):
+        grid = read_grid_file(source[1])
+    else:
+        grid = split_text(source)
+    return parse_bulk_grid(grid, prices)
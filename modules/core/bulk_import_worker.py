@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from modules.core.bulk_import import parse_bulk_source
+
+
+class BulkImportThread(QThread):
+    """Reads and validates pasted text or a table file in a background thread."""
+
+    parsed = pyqtSignal(object)   # BulkResult
+    error = pyqtSignal(str)
+
+    def __init__(self, source, prices: dict, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.prices = prices
+
+    def run(self) -> None:
+        try:
+            self.parsed.emit(parse_bulk_source(self.source, self.prices))
+        except Exception as e:
+            self.error.emit(str(e))
@@ -1,3 +1,6 @@
+import os
+import sys
+
 ARTICLES = [
     ("6.1", "Статья 6.1", 25000),
     ("6.2", "Статья 6.2", 50000),
@@ -94,3 +97,7 @@ ARTICLES = [
 
 # Shared constants or paths
 FILES_PATH = "" # Placeholder if needed for file paths
+
+# Debug-only self checks (e.g. the governor totals audit) are enabled when running
+# from source, or in a packaged build with GOVUT_DEBUG=1 in the environment.
+DEBUG = os.environ.get('GOVUT_DEBUG') == '1' or not getattr(sys, 'frozen', False)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from modules.core.ledger_export import LedgerSnapshot, ExportCancelled, export_ledger
+
+
+class LedgerExportThread(QThread):
+    """Writes a captured LedgerSnapshot to a file in a background thread."""
+
+    progress = pyqtSignal(int, int)   # rows written, rows total
+    exported = pyqtSignal(str, int)   # path, rows written
+    error = pyqtSignal(str)
+
+    def __init__(self, snapshot: LedgerSnapshot, path: str, fmt: str = None, parent=None):
+        super().__init__(parent)
+        self.snapshot = snapshot
+        self.path = path
+        self.fmt = fmt
+
+    def run(self) -> None:
+        try:
+            count = export_ledger(self.snapshot, self.path, self.fmt,
+                                  progress=self.progress.emit, cancelled=self.isInterruptionRequested)
+            self.exported.emit(self.path, count)
+        except ExportCancelled:
+            pass
+        except Exception as e:
+            self.error.emit(str(e))
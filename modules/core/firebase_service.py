@@ -1,16 +1,45 @@
 import os
+import threading
+from concurrent.futures import Future
 
 from modules.core.utils import get_resource_path
 
 _initialized = False
 _db = None
+# Serializes client construction between the warm-up thread and callers
+_init_lock = threading.Lock()
+# Future of the background warm-up started by warm_up_firestore()
+_warmup_future: Future | None = None
+# Seconds init_firestore() waits for a running warm-up; the client works without it
+WARMUP_WAIT = 2.0
 
 
 def init_firestore(service_account_path: str | None = None):
     """Initialize and return a Firestore client.
     Attempts to load service account from provided path or from assets/service_account.json.
+    If a background warm-up is in progress its result is awaited (at most
+    WARMUP_WAIT seconds) instead of building a second client.
     Raises ImportError if firebase_admin is not installed.
     """
+    if (_initialized and _db is not None):
+        return _db
+
+    future = _warmup_future
+    if future is not None:
+        try:
+            return future.result(timeout=WARMUP_WAIT)
+        except Exception:
+            # warm-up failed (no network, missing file...) or its RPC is still
+            # waiting on a slow network: continue synchronously; the client the
+            # warm-up built is reused, otherwise the caller gets the real error
+            pass
+
+    with _init_lock:
+        return _create_client(service_account_path)
+
+
+def _create_client(service_account_path: str | None = None):
+    """Build the Firestore client. Must be called with _init_lock held."""
     global _initialized, _db
     if (_initialized and _db is not None):
         return _db
@@ -53,19 +82,51 @@ def init_firestore(service_account_path: str | None = None):
     return _db
 
 
+def _warm_up(future: Future, service_account_path: str | None):
+    try:
+        with _init_lock:
+            db = _create_client(service_account_path)
+        try:
+            # Cheap read of a missing document: opens the gRPC channel and
+            # completes the auth handshake before the first real query.
+            db.collection('users').document('__warmup__').get()
+        except Exception:
+            pass
+        future.set_result(db)
+    except BaseException as e:
+        future.set_exception(e)
+
+
+def warm_up_firestore(service_account_path: str | None = None) -> Future:
+    """Start Firestore initialization on a background thread and return its Future.
+    Imports firebase_admin, parses credentials, builds the client and performs one
+    cheap RPC so the connection is open before the first login. Safe to call
+    repeatedly; init_firestore() joins the running warm-up.
+    """
+    global _warmup_future
+    with _init_lock:
+        if _warmup_future is not None:
+            return _warmup_future
+        future = Future()
+        if _initialized and _db is not None:
+            future.set_result(_db)
+        _warmup_future = future
+    if not future.done():
+        threading.Thread(target=_warm_up, args=(future, service_account_path),
+                         name='firestore-warmup', daemon=True).start()
+    return future
+
+
 def get_usernames():
     """Return a list of usernames from collection 'users'. If collection doesn't exist return []."""
     try:
-        db = init_firestore()
+        init_firestore()
     except Exception:
         return []
 
     try:
-        users_ref = db.collection('users')
-        docs = users_ref.stream()
         names = []
-        for d in docs:
-            data = d.to_dict() or {}
+        for data in iter_users(fields=('username', 'Username', 'login')):
             name = data.get('username') or data.get('Username') or data.get('login')
             if name:
                 names.append(name)
@@ -94,16 +155,68 @@ def save_role_config(username: str, roles: list, departments: list):
         raise
 
 
-def list_users():
-    """Return list of user documents (dicts) from 'users'."""
+# Fields needed to list users and evaluate ACL rules (can_manage_user etc.).
+# Used as a select() projection so directory loads do not transfer password hashes
+# and other unrelated fields.
+USER_DIRECTORY_FIELDS = ('username', 'login', 'roles', 'departments', 'permissions')
+
+# Default number of documents fetched per request by iter_users
+USERS_PAGE_SIZE = 500
+
+
+def _users_page(db, fields=None, page_size=None, start_after=None):
+    """Return one page of user dicts ordered by document id.
+    `fields` limits the returned fields (Firestore select projection), `start_after`
+    is the document id (username) after which the page starts.
+    """
+    query = db.collection('users')
+    if fields:
+        query = query.select(list(fields))
+    query = query.order_by('__name__')
+    if start_after:
+        query = query.start_after({'__name__': start_after})
+    if page_size:
+        query = query.limit(int(page_size))
+    page = []
+    for d in query.stream():
+        data = d.to_dict() or {}
+        data.setdefault('username', d.id)
+        data['_doc_id'] = d.id
+        page.append(data)
+    return page
+
+
+def iter_users(fields=None, page_size: int = USERS_PAGE_SIZE, start_after: str | None = None):
+    """Yield user documents (dicts) from 'users' page by page.
+    Only one page is held in memory at a time. `fields` is an optional projection
+    (e.g. USER_DIRECTORY_FIELDS), `start_after` resumes after the given document id.
+    """
+    db = init_firestore()
+    cursor = start_after
+    while True:
+        page = _users_page(db, fields=fields, page_size=page_size, start_after=cursor)
+        for data in page:
+            cursor = data.pop('_doc_id')
+            yield data
+        if not page_size or len(page) < page_size:
+            return
+
+
+def list_users(fields=None, page_size: int | None = None, start_after: str | None = None):
+    """Return list of user documents (dicts) from 'users'.
+    Without `page_size` all users are returned; with `page_size` only one page
+    starting after document id `start_after` is returned. `fields` limits the
+    returned fields (see USER_DIRECTORY_FIELDS).
+    """
     db = init_firestore()
     users = []
     try:
-        docs = db.collection('users').stream()
-        for d in docs:
-            data = d.to_dict() or {}
-            data.setdefault('username', d.id)
-            users.append(data)
+        if page_size:
+            for data in _users_page(db, fields=fields, page_size=page_size, start_after=start_after):
+                data.pop('_doc_id', None)
+                users.append(data)
+        else:
+            users.extend(iter_users(fields=fields, start_after=start_after))
     except Exception:
         pass
     return users
@@ -141,6 +254,7 @@ def create_user(username: str, password: str, role: str = None, departments: lis
         'permissions': permissions or [],
     }
     doc_ref.set(data)
+    _notify_directory_change(username, data)
     return True
 
 
@@ -149,6 +263,7 @@ def update_user(username: str, data: dict):
     db = init_firestore()
     doc_ref = db.collection('users').document(username)
     doc_ref.set(data, merge=True)
+    _notify_directory_change(username, data)
     return True
 
 
@@ -169,6 +284,7 @@ def delete_user(username: str) -> bool:
     try:
         if doc_ref.get().exists:
             doc_ref.delete()
+            _notify_directory_change(username, None)
             return True
         return False
     except Exception:
@@ -275,6 +391,7 @@ def save_user_roles(username: str, roles: list, departments: list, permissions:
     if permissions is not None:
         data['permissions'] = permissions
     db.collection('users').document(username).set(data, merge=True)
+    _notify_directory_change(username, data)
     return True
 
 
@@ -301,9 +418,11 @@ def can_manage_user(assigner_doc: dict | str, target_doc: dict | str) -> bool:
     if isinstance(target_doc, str):
         target_doc = get_user(target_doc) or {}
 
-    assigner = resolve_user_permissions(assigner_doc)
-    target = resolve_user_permissions(target_doc)
+    return _can_manage_resolved(resolve_user_permissions(assigner_doc), resolve_user_permissions(target_doc))
 
+
+def _can_manage_resolved(assigner: dict, target: dict) -> bool:
+    """can_manage_user() for already resolved permission dicts (see resolve_user_permissions)."""
     # admins can manage anyone
     if 'admin.full' in assigner.get('permissions', set()):
         return True
@@ -359,3 +478,282 @@ def can_assign_departments(assigner_doc: dict | str, target_departments: list |
 
     target_set = set(target_departments or [])
     return target_set.issubset(assigner_depts)
+
+
+def permission_departments(permission: str) -> set:
+    """Departments whose permission this is (DEPT_DEFAULT_PERMS and department-scoped roles)."""
+    owners = {d for d, perms in DEPT_DEFAULT_PERMS.items() if permission in perms}
+    for info in ROLE_DEFS.values():
+        if permission in info.get('permissions', []):
+            owners.update(info.get('departments', []))
+    return owners
+
+
+def can_assign_permission(assigner_doc: dict | str, permission: str) -> bool:
+    """Return True if assigner is allowed to grant or revoke `permission`.
+    'admin.full' needs the right to assign the Admin role; a department permission
+    needs can_assign_departments for the department(s) owning it; any other
+    role-granted permission needs the right to assign every role granting it.
+    Unknown permissions are left to admins.
+    """
+    if isinstance(assigner_doc, str):
+        assigner_doc = get_user(assigner_doc) or {}
+    if permission == 'admin.full':
+        return can_assign_role(assigner_doc, 'Admin')
+    owners = permission_departments(permission)
+    if owners:
+        return can_assign_departments(assigner_doc, owners)
+    granting = [r for r, info in ROLE_DEFS.items() if permission in info.get('permissions', [])]
+    if granting:
+        return all(can_assign_role(assigner_doc, r) for r in granting)
+    return can_assign_role(assigner_doc, 'Admin')
+
+
+# Firestore limits a single write batch to 500 operations
+BATCH_WRITE_LIMIT = 500
+
+
+def _apply_list_delta(values, add=None, remove=None) -> list:
+    """Return `values` with `remove` dropped and `add` appended, keeping order and uniqueness."""
+    removed = set(remove or [])
+    result = []
+    for v in list(values or []) + list(add or []):
+        if v and v not in removed and v not in result:
+            result.append(v)
+    return result
+
+
+def bulk_update_user_roles(assigner_doc: dict | str, usernames: list,
+                           add_roles: list | None = None, remove_roles: list | None = None,
+                           add_departments: list | None = None, remove_departments: list | None = None,
+                           add_permissions: list | None = None, remove_permissions: list | None = None):
+    """Apply a roles/departments/permissions delta to many users at once.
+    All targets are fetched in one request and validated against the ACL rules
+    (can_manage_user, can_assign_role, can_assign_departments, can_assign_permission)
+    with the assigner resolved once; a user whose permissions would change in a way
+    the assigner may not make is rejected. Permitted updates are committed in a
+    single write batch (split only above Firestore's 500 writes limit).
+    Returns a list of per-user results:
+    {'username', 'ok', 'error', 'roles', 'departments', 'permissions'}.
+    """
+    if isinstance(assigner_doc, str):
+        assigner_doc = get_user(assigner_doc) or {}
+    assigner = resolve_user_permissions(assigner_doc)
+
+    # Role/department rights depend only on the assigner, so check them once
+    changed_roles = set(add_roles or []) | set(remove_roles or [])
+    denied_roles = sorted(r for r in changed_roles if not can_assign_role(assigner_doc, r))
+    changed_depts = set(add_departments or []) | set(remove_departments or [])
+    depts_allowed = (not changed_depts) or can_assign_departments(assigner_doc, changed_depts)
+    changed_perms = set(add_permissions or []) | set(remove_permissions or [])
+    denied_perms = {p for p in changed_perms if not can_assign_permission(assigner_doc, p)}
+
+    names = []
+    for name in usernames or []:
+        name = str(name or '').strip()
+        if name and name not in names:
+            names.append(name)
+    if not names:
+        return []
+
+    db = init_firestore()
+    col = db.collection('users')
+    refs = [col.document(n) for n in names]
+    docs = {}
+    for snap in db.get_all(refs, field_paths=list(USER_DIRECTORY_FIELDS)):
+        if snap.exists:
+            docs[snap.id] = snap.to_dict() or {}
+
+    results = []
+    writes = []
+    for name, ref in zip(names, refs):
+        res = {'username': name, 'ok': False, 'error': None,
+               'roles': None, 'departments': None, 'permissions': None}
+        results.append(res)
+        doc = docs.get(name)
+        if doc is None:
+            res['error'] = 'Пользователь не найден'
+            continue
+        if not _can_manage_resolved(assigner, resolve_user_permissions(doc)):
+            res['error'] = 'Нет прав на управление пользователем'
+            continue
+        if denied_roles:
+            res['error'] = f"Нельзя назначать роли: {', '.join(denied_roles)}"
+            continue
+        if not depts_allowed:
+            res['error'] = 'Нельзя назначать выбранные отделы'
+            continue
+        permissions = _apply_list_delta(doc.get('permissions'), add_permissions, remove_permissions)
+        # Only the permissions this user actually gains or loses need the right
+        touched = set(permissions) ^ set(doc.get('permissions') or [])
+        if touched & denied_perms:
+            res['error'] = f"Нельзя назначать разрешения: {', '.join(sorted(touched & denied_perms))}"
+            continue
+        data = {
+            'roles': _apply_list_delta(doc.get('roles'), add_roles, remove_roles),
+            'departments': _apply_list_delta(doc.get('departments'), add_departments, remove_departments),
+            'permissions': permissions,
+        }
+        res.update(data)
+        writes.append((ref, data, res))
+
+    for start in range(0, len(writes), BATCH_WRITE_LIMIT):
+        chunk = writes[start:start + BATCH_WRITE_LIMIT]
+        batch = db.batch()
+        for ref, data, _ in chunk:
+            batch.set(ref, data, merge=True)
+        try:
+            batch.commit()
+            for ref, data, res in chunk:
+                res['ok'] = True
+                _notify_directory_change(res['username'], data)
+        except Exception as e:
+            for _, _, res in chunk:
+                res['error'] = str(e)
+    return results
+
+
+class DepartmentIndex:
+    """In-memory reverse index of the user directory.
+    Keeps department -> usernames, role -> usernames and rank -> usernames sets
+    built from resolved permissions (see resolve_user_permissions), so ACL
+    questions such as "users manageable by X in department D" are answered with
+    set operations instead of scanning every user document.
+    """
+
+    def __init__(self, docs=None):
+        self._lock = threading.RLock()
+        self._docs = {}      # username -> directory fields (roles/departments/permissions)
+        self._resolved = {}  # username -> resolve_user_permissions() result
+        self.by_department = {}
+        self.by_role = {}
+        self.by_rank = {}
+        if docs:
+            self.rebuild(docs)
+
+    def rebuild(self, docs):
+        """Replace the index content with the given user documents."""
+        with self._lock:
+            self._docs.clear()
+            self._resolved.clear()
+            self.by_department.clear()
+            self.by_role.clear()
+            self.by_rank.clear()
+            for d in docs:
+                name = d.get('username') or d.get('login')
+                if name:
+                    self._add(name, d)
+
+    def _add(self, username, doc):
+        doc = {k: list(doc.get(k) or []) for k in ('roles', 'departments', 'permissions')}
+        res = resolve_user_permissions(doc)
+        self._docs[username] = doc
+        self._resolved[username] = res
+        for dept in res['departments']:
+            self.by_department.setdefault(dept, set()).add(username)
+        for role in res['roles']:
+            self.by_role.setdefault(role, set()).add(username)
+        self.by_rank.setdefault(res['rank'], set()).add(username)
+
+    def _discard(self, username):
+        res = self._resolved.pop(username, None)
+        self._docs.pop(username, None)
+        if res is None:
+            return
+        for key, index in ((res['departments'], self.by_department), (res['roles'], self.by_role), ([res['rank']], self.by_rank)):
+            for k in key:
+                members = index.get(k)
+                if members is not None:
+                    members.discard(username)
+                    if not members:
+                        del index[k]
+
+    def upsert(self, username: str, data: dict):
+        """Merge changed fields of one user (same semantics as set(merge=True))."""
+        with self._lock:
+            doc = dict(self._docs.get(username) or {})
+            doc.update({k: v for k, v in data.items() if k in ('roles', 'departments', 'permissions')})
+            self._discard(username)
+            self._add(username, doc)
+
+    def remove(self, username: str):
+        with self._lock:
+            self._discard(username)
+
+    def usernames(self) -> set:
+        with self._lock:
+            return set(self._resolved)
+
+    def departments(self) -> list:
+        with self._lock:
+            return sorted(self.by_department)
+
+    def users_in_department(self, department: str) -> set:
+        with self._lock:
+            return set(self.by_department.get(department, ()))
+
+    def users_with_role(self, role: str) -> set:
+        with self._lock:
+            return set(self.by_role.get(role, ()))
+
+    def users_without_department(self) -> set:
+        with self._lock:
+            members = set()
+            for users in self.by_department.values():
+                members |= users
+            return set(self._resolved) - members
+
+    def manageable_by(self, assigner_doc: dict | str, department: str | None = None) -> set:
+        """Return usernames the assigner may manage (same rules as can_manage_user),
+        optionally restricted to members of `department`.
+        """
+        if isinstance(assigner_doc, str):
+            assigner_doc = get_user(assigner_doc) or {}
+        assigner = resolve_user_permissions(assigner_doc)
+        with self._lock:
+            if 'admin.full' in assigner.get('permissions', set()):
+                result = set(self._resolved)
+            else:
+                assigner_rank = assigner.get('rank', 99)
+                result = set()
+                for rank, users in self.by_rank.items():
+                    if rank > assigner_rank:
+                        result |= users
+                # Restricted roles manage only users sharing a department with them
+                if set(assigner.get('roles', [])) & {'Minister', 'Head', 'Deputy'}:
+                    shared = set()
+                    for dept in assigner.get('departments', []):
+                        shared |= self.by_department.get(dept, set())
+                    result &= shared
+            if department is not None:
+                result &= self.by_department.get(department, set())
+            return result
+
+
+_department_index: DepartmentIndex | None = None
+
+
+def get_department_index(refresh: bool = False) -> DepartmentIndex:
+    """Return the shared DepartmentIndex, loading the user directory on first use.
+    Local writes through this module (create/update/delete/save roles) keep it
+    current; pass refresh=True to reload changes made by other clients.
+    """
+    global _department_index
+    if _department_index is None or refresh:
+        index = DepartmentIndex(iter_users(fields=USER_DIRECTORY_FIELDS))
+        _department_index = index
+    return _department_index
+
+
+def _notify_directory_change(username: str, data: dict | None):
+    """Apply a local write to the department index if it has been built."""
+    index = _department_index
+    if index is None:
+        return
+    try:
+        if data is None:
+            index.remove(username)
+        else:
+            index.upsert(username, data)
+    except Exception:
+        pass
@@ -0,0 +1,361 @@
+"""Snapshot export/restore of Firestore collections to compressed JSON-lines.
+
+A snapshot is a directory with one `<collection>.jsonl.gz` file per collection
+(one `{"id": ..., "data": {...}}` object per line) and a `manifest.json` holding
+document counts and SHA256 checksums of the files.
+
+All functions take the Firestore client as `db` (defaults to init_firestore()),
+so they also work against the Firestore emulator or MemoryFirestore below.
+"""
+import base64
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DEFAULT_COLLECTIONS = ('users', 'role_settings')
+MANIFEST_NAME = 'manifest.json'
+PROGRESS_NAME = 'restore_progress.json'
+SNAPSHOT_VERSION = 1
+# Firestore accepts at most 500 writes per batch
+DEFAULT_BATCH_SIZE = 400
+# Batches read ahead of the commits, per worker
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _get_db(db):
+    if db is not None:
+        return db
+    from modules.core.firebase_service import init_firestore
+    return init_firestore()
+
+
+def _firestore_types():
+    """(GeoPoint, DocumentReference, DatetimeWithNanoseconds), None where not importable."""
+    try:
+        from google.cloud.firestore_v1 import GeoPoint, DocumentReference
+    except Exception:
+        GeoPoint = DocumentReference = None
+    try:
+        from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+    except Exception:
+        DatetimeWithNanoseconds = None
+    return GeoPoint, DocumentReference, DatetimeWithNanoseconds
+
+
+def _encode_value(value):
+    """Convert Firestore values that JSON cannot hold into tagged dicts.
+    Raises TypeError for values of any other non-JSON type."""
+    if isinstance(value, dict):
+        return {k: _encode_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(v) for v in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    geo_point, doc_ref, nanos_dt = _firestore_types()
+    if nanos_dt is not None and isinstance(value, nanos_dt):
+        # Firestore timestamps keep nanoseconds; isoformat() would drop them
+        return {'__type__': 'timestamp', 'value': value.rfc3339()}
+    if isinstance(value, datetime.datetime):
+        return {'__type__': 'datetime', 'value': value.isoformat()}
+    if isinstance(value, bytes):
+        return {'__type__': 'bytes', 'value': base64.b64encode(value).decode('ascii')}
+    if geo_point is not None and isinstance(value, geo_point):
+        return {'__type__': 'geopoint', 'lat': value.latitude, 'lng': value.longitude}
+    if doc_ref is not None and isinstance(value, doc_ref):
+        return {'__type__': 'reference', 'value': value.path}
+    raise TypeError(f'unsupported value type {type(value).__name__}')
+
+
+def _decode_value(value, db=None):
+    """Inverse of _encode_value; references are rebuilt with `db.document(path)`."""
+    if isinstance(value, dict):
+        kind = value.get('__type__')
+        if kind == 'datetime':
+            return datetime.datetime.fromisoformat(value['value'])
+        if kind == 'timestamp':
+            nanos_dt = _firestore_types()[2]
+            if nanos_dt is not None:
+                return nanos_dt.from_rfc3339(value['value'])
+            return datetime.datetime.fromisoformat(value['value'])
+        if kind == 'bytes':
+            return base64.b64decode(value['value'])
+        if kind == 'geopoint':
+            geo_point = _firestore_types()[0]
+            if geo_point is None:
+                raise TypeError('restoring a GeoPoint needs google-cloud-firestore')
+            return geo_point(value['lat'], value['lng'])
+        if kind == 'reference':
+            if db is None:
+                raise TypeError(f'restoring the reference {value["value"]} needs a database client')
+            return db.document(value['value'])
+        return {k: _decode_value(v, db) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(v, db) for v in value]
+    return value
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def export_snapshot(out_dir: str, collections=DEFAULT_COLLECTIONS, db=None) -> dict:
+    """Stream the given collections into `out_dir` and write the manifest.
+    Documents are written as they arrive, so memory use does not grow with
+    collection size. Files are written under temporary names and renamed only
+    once every collection is exported, so a failed export leaves no partial
+    snapshot. A value that cannot be stored raises TypeError naming its
+    collection and document. Returns the manifest dict.
+    """
+    db = _get_db(db)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {
+        'version': SNAPSHOT_VERSION,
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'collections': {},
+    }
+    written = []    # (temporary path, final path)
+    try:
+        for name in collections:
+            file_name = f'{name}.jsonl.gz'
+            path = os.path.join(out_dir, file_name)
+            tmp = path + '.tmp'
+            written.append((tmp, path))
+            count = 0
+            with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+                for doc in db.collection(name).stream():
+                    try:
+                        data = _encode_value(doc.to_dict() or {})
+                    except TypeError as e:
+                        raise TypeError(f'Collection {name}, document {doc.id}: {e}') from None
+                    line = json.dumps({'id': doc.id, 'data': data}, ensure_ascii=False, separators=(',', ':'))
+                    f.write(line + '\n')
+                    count += 1
+            manifest['collections'][name] = {
+                'file': file_name,
+                'count': count,
+                'sha256': _file_sha256(tmp),
+            }
+        manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        written.append((manifest_path + '.tmp', manifest_path))
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    except BaseException:
+        for tmp, _ in written:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        raise
+    # The manifest goes last: a snapshot without one is never read
+    for tmp, path in written:
+        os.replace(tmp, path)
+    return manifest
+
+
+def read_manifest(snapshot_dir: str) -> dict:
+    with open(os.path.join(snapshot_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def verify_snapshot(snapshot_dir: str) -> dict:
+    """Check file checksums against the manifest. Raises ValueError on mismatch."""
+    manifest = read_manifest(snapshot_dir)
+    for name, info in manifest.get('collections', {}).items():
+        path = os.path.join(snapshot_dir, info['file'])
+        if not os.path.exists(path):
+            raise ValueError(f'Snapshot file missing: {info["file"]}')
+        if _file_sha256(path) != info.get('sha256'):
+            raise ValueError(f'Checksum mismatch for collection {name}')
+    return manifest
+
+
+def _iter_chunks(path: str, size: int):
+    chunk = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            chunk.append(json.loads(line))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def restore_snapshot(snapshot_dir: str, collections=None, db=None, workers: int = 4,
+                     batch_size: int = DEFAULT_BATCH_SIZE, resume: bool = True, progress=None) -> dict:
+    """Upload a snapshot back into Firestore using parallel batched writes.
+    Documents are overwritten (set without merge). Committed batches are recorded
+    in `restore_progress.json` inside the snapshot directory, so an interrupted
+    restore continues where it stopped when run again with resume=True.
+    `progress(collection, written, total)` is called after each committed batch.
+    The file is read only a few batches ahead of the commits, so memory use does
+    not grow with collection size. Restoring 'users' into the app's own database
+    rebuilds the shared department index.
+    Returns {collection: written_document_count}.
+    """
+    default_db = db is None
+    db = _get_db(db)
+    manifest = verify_snapshot(snapshot_dir)
+    batch_size = max(1, min(int(batch_size), 500))
+    progress_path = os.path.join(snapshot_dir, PROGRESS_NAME)
+
+    state = {'created_at': manifest.get('created_at'), 'batch_size': batch_size, 'done': {}}
+    if resume and os.path.exists(progress_path):
+        try:
+            with open(progress_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            # Batch boundaries only match when the snapshot and batch size are the same
+            if saved.get('created_at') == state['created_at'] and saved.get('batch_size') == batch_size:
+                state['done'] = saved.get('done', {})
+        except Exception:
+            pass
+    lock = threading.Lock()
+
+    def _save_state():
+        tmp = progress_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, progress_path)
+
+    names = list(collections or manifest.get('collections', {}).keys())
+    written = {}
+    for name in names:
+        info = manifest['collections'].get(name)
+        if info is None:
+            raise ValueError(f'Collection {name} is not in the snapshot')
+        done = set(state['done'].get(name, []))
+        total = info.get('count', 0)
+        written[name] = min(total, len(done) * batch_size)
+        col = db.collection(name)
+
+        def _commit(index, chunk, name=name, col=col, done=done, total=total):
+            batch = db.batch()
+            for rec in chunk:
+                batch.set(col.document(rec['id']), _decode_value(rec.get('data') or {}, db))
+            batch.commit()
+            with lock:
+                done.add(index)
+                state['done'][name] = sorted(done)
+                written[name] += len(chunk)
+                _save_state()
+                if progress:
+                    progress(name, min(written[name], total), total)
+
+        skip = set(done)
+        workers = max(1, int(workers))
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i, chunk in enumerate(_iter_chunks(os.path.join(snapshot_dir, info['file']), batch_size)):
+                if i in skip:
+                    continue
+                if len(in_flight) >= workers * IN_FLIGHT_PER_WORKER:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        # re-raise the first failed batch; completed ones stay recorded
+                        fut.result()
+                in_flight.add(pool.submit(_commit, i, chunk))
+            for fut in in_flight:
+                fut.result()
+        written[name] = min(written[name], total)
+
+    if default_db and 'users' in names:
+        # Restored user docs bypass the firebase_service writers that keep the index current
+        try:
+            from modules.core.firebase_service import get_department_index
+            get_department_index(refresh=True)
+        except Exception as e:
+            print(f"Department index refresh failed: {e}")
+
+    try:
+        os.remove(progress_path)
+    except OSError:
+        pass
+    return written
+
+
+class MemoryFirestore:
+    """Minimal in-memory stand-in for the Firestore client.
+    Supports what the snapshot functions use (collection().stream()/document(),
+    document(path), document().set()/get(), batch()), for trying out snapshots offline.
+    """
+
+    class _Snapshot:
+        def __init__(self, doc_id, data):
+            self.id = doc_id
+            self.exists = data is not None
+            self._data = data
+
+        def to_dict(self):
+            return dict(self._data) if self._data is not None else None
+
+    class _DocumentRef:
+        def __init__(self, store, doc_id):
+            self._store = store
+            self.id = doc_id
+
+        def set(self, data, merge=False):
+            with self._store['lock']:
+                docs = self._store['docs']
+                if merge and self.id in docs:
+                    docs[self.id].update(data)
+                else:
+                    docs[self.id] = dict(data)
+
+        def get(self):
+            with self._store['lock']:
+                return MemoryFirestore._Snapshot(self.id, self._store['docs'].get(self.id))
+
+        def delete(self):
+            with self._store['lock']:
+                self._store['docs'].pop(self.id, None)
+
+    class _CollectionRef:
+        def __init__(self, store):
+            self._store = store
+
+        def document(self, doc_id):
+            return MemoryFirestore._DocumentRef(self._store, doc_id)
+
+        def stream(self):
+            with self._store['lock']:
+                items = sorted(self._store['docs'].items())
+            for doc_id, data in items:
+                yield MemoryFirestore._Snapshot(doc_id, data)
+
+    class _Batch:
+        def __init__(self):
+            self._ops = []
+
+        def set(self, ref, data, merge=False):
+            self._ops.append((ref, data, merge))
+
+        def commit(self):
+            for ref, data, merge in self._ops:
+                ref.set(data, merge=merge)
+            self._ops = []
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections = {}
+
+    def collection(self, name):
+        with self._lock:
+            store = self._collections.setdefault(name, {'lock': threading.Lock(), 'docs': {}})
+        return MemoryFirestore._CollectionRef(store)
+
+    def document(self, path):
+        collection, _, doc_id = path.rpartition('/')
+        return self.collection(collection).document(doc_id)
+
+    def batch(self):
+        return MemoryFirestore._Batch()
@@ -55,11 +55,13 @@ class GoogleService:
     def sync_multiple_sheets(self, updates: Dict[str, List[List[Union[str, int, float]]]]):
         """
         Sync multiple sheets in a single batch update to minimize API calls.
+        Raises when a sheet could not be written, so callers never take a failed
+        sync for a successful one.
         :param updates: dict mapping sheet_title -> 2D list of rows
         """
         self._ensure_connection()
         if not self.doc:
-            return
+            raise ConnectionError(f"Target spreadsheet {self.target_spreadsheet_id} is not connected")
 
         data_blocks = []
         for title, rows in updates.items():
@@ -111,6 +113,7 @@ class GoogleService:
                 # Ignore and attempt per-sheet updates
                 pass
             # Fallback: per-sheet clear+update
+            failed = []
             for title, rows in updates.items():
                 try:
                     ws = self.doc.worksheet(title)
@@ -127,23 +130,23 @@ class GoogleService:
                         else:
                             ws = None
                 try:
-                    if ws is not None:
+                    if ws is None:
+                        raise RuntimeError("worksheet unavailable")
+                    try:
+                        ws.clear()
+                    except Exception:
+                        pass
+                    if rows:
                         try:
-                            ws.clear()
+                            ws.update(range_name='A1', values=rows)
                         except Exception:
-                            pass
-                        if rows:
-                            try:
-                                ws.update(range_name='A1', values=rows)
-                            except Exception:
-                                for r in rows:
-                                    try:
-                                        ws.append_row(r)
-                                    except Exception:
-                                        pass
-                except Exception:
-                    # ignore per-sheet failures here
-                    pass
+                            for r in rows:
+                                ws.append_row(r)
+                except Exception as e3:
+                    failed.append(f"{title}: {e3}")
+            if failed:
+                # Keep the batch error text: callers detect quota errors (429) in it
+                raise RuntimeError(f"Sheets not written ({'; '.join(failed)}) after batch error: {e}")
 
     def get_users(self):
         """Fetches all users from Users sheet, creating it if needed."""
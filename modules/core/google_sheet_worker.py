@@ -5,6 +5,8 @@ from typing import Any, Dict, Optional
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from modules.core.sheet_import import parse_fetched
+
 
 @dataclass
 class SheetPayload:
@@ -32,7 +34,8 @@ class GoogleSheetLoadThread(QThread):
                 fetched['objects'] = objs
             if stats is not None:
                 fetched['stats'] = stats
-            self.loaded.emit(fetched)
+            # Parse/normalize here so the UI thread only loads ready columns
+            self.loaded.emit(parse_fetched(fetched))
         except Exception as e:
             self.error.emit(str(e))
 
@@ -63,12 +66,16 @@ class GoogleSheetSyncThread(QThread):
                 try:
                     self.google_service.sync_multiple_sheets(batch_updates)
                 except Exception as e:
-                    # Fall back to per-sheet calls if needed
+                    # Fall back to per-sheet calls; any sheet still failing fails the sync
+                    failed = []
                     for sheet, rows in batch_updates.items():
                         try:
                             self.google_service.sync_sheet_data(sheet, rows)
-                        except Exception:
-                            pass
+                        except Exception as e2:
+                            failed.append(f"{sheet}: {e2}")
+                    if failed:
+                        raise RuntimeError(f"{e}; per-sheet retry failed: {'; '.join(failed)}")
+            # Only a confirmed write gets here: the caller records the edits as synced
             self.finished_ok.emit()
         except Exception as e:
             self.error.emit(str(e))
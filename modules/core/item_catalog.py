@@ -0,0 +1,204 @@
+"""In-memory list of the governor's item definitions (name and base price).
+
+Rows are plain data; the items table is a model view over them. Writers go
+through the methods below, which notify listeners with the same events as
+TransactionStore:
+
+    before_reset / reset
+    before_insert(first, last) / insert(first, last)
+    before_remove(first, last) / remove(first, last)
+    update(row, fields, old)         fields: tuple of changed field names,
+                                     old: the row's values before the change
+
+Rows are also indexed by normalized name (`item_key`), kept current on every
+write, so `price_of()` is a dict lookup rather than a scan.
+"""
+from array import array
+from collections import OrderedDict
+
+ITEM_FIELDS = ('name', 'price')
+PRICE_RANGE = (0, 1000000000)
+
+
+def item_key(name) -> str:
+    """Normalized item name used for lookups: stripped and lower-cased."""
+    return str(name or '').strip().lower()
+
+
+def parse_price(value) -> int:
+    """Sheet cell -> whole price clamped to PRICE_RANGE (0 on garbage)."""
+    try:
+        price = int(float(value))
+    except Exception:
+        return 0
+    return max(PRICE_RANGE[0], min(PRICE_RANGE[1], price))
+
+
+class ItemCatalog:
+    def __init__(self):
+        self.names = []
+        self.prices = array('q')
+        self.ids = array('q')
+        self._next_id = 1
+        self._rows_by_id = None
+        self._ids_by_key = {}    # item_key -> ids of the rows with that name
+        self._listeners = []
+
+    def __len__(self):
+        return len(self.names)
+
+    # --- listeners -------------------------------------------------------
+    def add_listener(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def _notify(self, event, *args):
+        for listener in list(self._listeners):
+            try:
+                listener(event, *args)
+            except Exception as e:
+                print(f"[ItemCatalog] listener failed on {event}: {e}")
+
+    # --- row ids -------------------------------------------------------------
+    def _new_ids(self, count: int):
+        first = self._next_id
+        self._next_id += count
+        self._rows_by_id = None
+        return range(first, first + count)
+
+    def row_of(self, row_id: int) -> int:
+        if self._rows_by_id is None:
+            self._rows_by_id = {rid: row for row, rid in enumerate(self.ids)}
+        return self._rows_by_id.get(row_id, -1)
+
+    # --- name index ------------------------------------------------------------
+    def _index_add(self, name, row_id):
+        key = item_key(name)
+        if key:
+            self._ids_by_key.setdefault(key, []).append(row_id)
+
+    def _index_discard(self, name, row_id):
+        key = item_key(name)
+        ids = self._ids_by_key.get(key)
+        if ids is None:
+            return
+        try:
+            ids.remove(row_id)
+        except ValueError:
+            pass
+        if not ids:
+            del self._ids_by_key[key]
+
+    def row_of_name(self, name) -> int:
+        """Row of the item called `name` (normalized); the last row wins on duplicates."""
+        ids = self._ids_by_key.get(item_key(name))
+        if not ids:
+            return -1
+        if len(ids) == 1:
+            return self.row_of(ids[0])
+        return max(self.row_of(rid) for rid in ids)
+
+    def price_of(self, name, default=None):
+        row = self.row_of_name(name)
+        return self.prices[row] if row >= 0 else default
+
+    # --- reads ---------------------------------------------------------------
+    def items(self):
+        """Ordered name -> price for rows with a (stripped) name; later rows win."""
+        m = OrderedDict()
+        for name, price in zip(self.names, self.prices):
+            name = name.strip()
+            if name:
+                m[name] = price
+        return m
+
+    def price_map(self):
+        """item_key -> price (last row wins), for lookups off the UI thread."""
+        return {key: self.prices[self.row_of_name(key)] for key in self._ids_by_key}
+
+    def rows(self):
+        """[name, price] per row, as written to the objects sheet."""
+        return [[name, price] for name, price in zip(self.names, self.prices)]
+
+    def row_tuples(self):
+        """(name, price) per row, in ITEM_FIELDS order."""
+        return list(zip(self.names, self.prices))
+
+    # --- writes --------------------------------------------------------------
+    def load(self, rows):
+        """Replace all items. `rows` yields (name, price)."""
+        self._notify('before_reset')
+        names = []
+        prices = array('q')
+        for name, price in rows:
+            names.append(str(name or ''))
+            prices.append(parse_price(price))
+        self.names, self.prices = names, prices
+        self.ids = array('q', self._new_ids(len(names)))
+        self._ids_by_key = {}
+        for name, row_id in zip(self.names, self.ids):
+            self._index_add(name, row_id)
+        self._notify('reset')
+
+    def clear(self):
+        self.load(())
+
+    def insert(self, row=None, name='', price=0) -> int:
+        n = len(self.names)
+        if row is None or row > n or row < 0:
+            row = n
+        self._notify('before_insert', row, row)
+        self.names.insert(row, str(name or ''))
+        self.prices.insert(row, parse_price(price))
+        self.ids.insert(row, self._new_ids(1)[0])
+        self._index_add(self.names[row], self.ids[row])
+        self._notify('insert', row, row)
+        return row
+
+    def append(self, name='', price=0) -> int:
+        return self.insert(None, name, price)
+
+    def remove(self, row: int):
+        if row < 0 or row >= len(self.names):
+            return
+        self._notify('before_remove', row, row)
+        self._index_discard(self.names[row], self.ids[row])
+        del self.names[row]
+        del self.prices[row]
+        del self.ids[row]
+        self._rows_by_id = None
+        self._notify('remove', row, row)
+
+    def update(self, row: int, **fields) -> bool:
+        if row < 0 or row >= len(self.names):
+            return False
+        old = {'name': self.names[row], 'price': self.prices[row]}
+        changed = []
+        for field, value in fields.items():
+            if field == 'name':
+                value = str(value or '')
+                if self.names[row] != value:
+                    self._index_discard(self.names[row], self.ids[row])
+                    self._index_add(value, self.ids[row])
+                    self.names[row] = value
+                    changed.append(field)
+            elif field == 'price':
+                value = parse_price(value)
+                if self.prices[row] != value:
+                    self.prices[row] = value
+                    changed.append(field)
+            else:
+                raise KeyError(field)
+        if not changed:
+            return False
+        self._notify('update', row, tuple(changed), old)
+        return True
+
+    def set_field(self, row: int, field: str, value) -> bool:
+        return self.update(row, **{field: value})
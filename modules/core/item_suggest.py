@@ -0,0 +1,192 @@
+"""Ranked item-name suggestions over the item catalog.
+
+The index (sorted word keys for prefix lookups, n-gram sets for substring
+lookups) is rebuilt lazily after the catalog's names change; price edits and
+transaction edits do not invalidate it. Usage counts per item come from the
+transaction store and are kept current by delta.
+
+Ranking, best first: exact match, name prefix, word prefix, substring; then
+higher usage, shorter name, catalog order. Only the top `limit` candidates are
+selected (heapq), never the whole list sorted.
+"""
+import heapq
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from modules.core.item_catalog import item_key
+
+DEFAULT_LIMIT = 50
+# substring lookups use n-grams up to this length
+NGRAM = 3
+
+
+class ItemSuggester:
+    def __init__(self, catalog=None, store=None):
+        self.catalog = catalog
+        self.store = store
+        self.names = []          # display names, catalog order
+        self.keys = []           # normalized names, same order
+        self._index_of = {}      # normalized name -> index
+        self._name_keys = []     # sorted normalized names ...
+        self._name_idx = []      # ... and their indexes, for prefix bisects
+        self._word_keys = []     # sorted key suffixes starting at each word ...
+        self._word_idx = []      # ... and their indexes, for word-prefix bisects
+        self._grams = {}         # n-gram -> set of indexes, n = 1..NGRAM
+        self._dirty = True
+        self._rank = None        # indexes by (-usage, length, catalog order); None = stale
+        self.usage = Counter()   # normalized name -> transactions using it
+        if catalog is not None:
+            catalog.add_listener(self._on_catalog_event)
+        if store is not None:
+            self._recount_usage()
+            store.add_listener(self._on_store_event)
+
+    # --- invalidation --------------------------------------------------------
+    def invalidate(self):
+        self._dirty = True
+
+    def _on_catalog_event(self, event, *args):
+        if event in ('reset', 'insert', 'remove'):
+            self._dirty = True
+        elif event == 'update' and 'name' in args[1]:
+            self._dirty = True
+
+    def _rebuild(self):
+        names = list(self.catalog.items().keys()) if self.catalog is not None else self.names
+        self.set_names(names)
+
+    def set_names(self, names):
+        """Index the given display names (used directly when there is no catalog)."""
+        self.names = []
+        self.keys = []
+        index_of = {}
+        for name in names:
+            key = item_key(name)
+            if key and key not in index_of:
+                index_of[key] = len(self.keys)
+                self.names.append(str(name).strip())
+                self.keys.append(key)
+        words = []
+        grams = defaultdict(set)
+        for idx, key in enumerate(self.keys):
+            prev = ' '
+            for i, ch in enumerate(key):
+                if prev.isspace() and not ch.isspace():
+                    words.append((key[i:], idx))
+                prev = ch
+            for n in range(1, NGRAM + 1):
+                for i in range(len(key) - n + 1):
+                    grams[key[i:i + n]].add(idx)
+        names_sorted = sorted(index_of.items())
+        words.sort()
+        self._index_of = index_of
+        self._name_keys = [k for k, _ in names_sorted]
+        self._name_idx = [i for _, i in names_sorted]
+        self._word_keys = [k for k, _ in words]
+        self._word_idx = [i for _, i in words]
+        self._grams = dict(grams)
+        self._rank = None
+        self._dirty = False
+
+    # --- usage -----------------------------------------------------------------
+    def _recount_usage(self):
+        s = self.store
+        by_id = Counter(s.item_id)
+        usage = Counter()
+        for iid, n in by_id.items():
+            key = item_key(s.item_names[iid])
+            if key:
+                usage[key] += n
+        self.usage = usage
+        self._rank = None
+
+    def _count(self, item_id, delta):
+        key = item_key(self.store.item_names[item_id])
+        if key:
+            self.usage[key] += delta
+            if self.usage[key] <= 0:
+                del self.usage[key]
+            self._rank = None
+
+    def _on_store_event(self, event, *args):
+        s = self.store
+        if event == 'reset':
+            self._recount_usage()
+        elif event == 'insert':
+            for row in range(args[0], args[1] + 1):
+                self._count(s.item_id[row], 1)
+        elif event == 'before_remove':
+            for row in range(args[0], args[1] + 1):
+                self._count(s.item_id[row], -1)
+        elif event == 'update' and 'item' in args[1]:
+            row, _fields, old = args
+            self._count(old['item_id'], -1)
+            self._count(s.item_id[row], 1)
+
+    # --- queries -----------------------------------------------------------------
+    def _ranked(self):
+        if self._rank is None:
+            keys, usage = self.keys, self.usage
+            self._rank = sorted(range(len(keys)), key=lambda i: (-usage.get(keys[i], 0), len(keys[i]), i))
+        return self._rank
+
+    @staticmethod
+    def _slice(keys, idx, query):
+        lo = bisect_left(keys, query)
+        hi = bisect_left(keys, query + '\U0010ffff', lo)
+        return idx[lo:hi]
+
+    def _substring_matches(self, query):
+        if len(query) <= NGRAM:
+            return self._grams.get(query, set())
+        grams = self._grams
+        sets = sorted((grams.get(query[i:i + NGRAM], set()) for i in range(len(query) - NGRAM + 1)), key=len)
+        found = set(sets[0])
+        for other in sets[1:]:
+            if not found:
+                break
+            found &= other
+        keys = self.keys
+        return {i for i in found if query in keys[i]}
+
+    def _pick(self, candidates, limit, out):
+        """Append the best `limit` of `candidates` to `out`, in rank order."""
+        if not candidates or limit <= 0:
+            return
+        rank = self._ranked()
+        if len(candidates) * 8 < len(rank):
+            keys, usage = self.keys, self.usage
+            out.extend(heapq.nsmallest(limit, candidates,
+                                       key=lambda i: (-usage.get(keys[i], 0), len(keys[i]), i)))
+            return
+        # Dense candidate set: walk the global ranking and stop after `limit` hits
+        for i in rank:
+            if i in candidates:
+                out.append(i)
+                if len(out) >= limit:
+                    break
+
+    def suggest(self, text, limit=DEFAULT_LIMIT):
+        """Best `limit` display names for the typed text (all items when empty)."""
+        if self._dirty:
+            self._rebuild()
+        query = item_key(text)
+        if not query:
+            return [self.names[i] for i in self._ranked()[:limit]]
+
+        out = []
+        exact = self._index_of.get(query)
+        seen = set() if exact is None else {exact}
+        out.extend(seen)
+        # Each tier strictly outranks the next, so tiers are filled in order
+        for tier in (self._slice(self._name_keys, self._name_idx, query),
+                     self._slice(self._word_keys, self._word_idx, query),
+                     self._substring_matches(query)):
+            if len(out) >= limit:
+                break
+            candidates = set(tier) - seen
+            seen |= candidates
+            picked = []
+            self._pick(candidates, limit - len(out), picked)
+            out.extend(picked)
+        return [self.names[i] for i in out]
@@ -0,0 +1,236 @@
+"""Streaming export of governor transactions to TXT, CSV, JSON lines or XLSX.
+
+`LedgerSnapshot.capture()` copies the store columns on the UI thread (array
+copies, no per-row Python objects); the writers then run anywhere, e.g. on
+ExportThread, and stream one row at a time. The aligned TXT layout needs column
+widths up front: they come from the snapshot's value ranges and the lengths of
+the item names actually used, not from a pass that materializes every row.
+XLSX is written with zipfile as a minimal SpreadsheetML package, so it needs no
+extra dependency.
+"""
+import csv
+import json
+import os
+import re
+import zipfile
+from array import array
+from dataclasses import dataclass, field
+from typing import List
+from xml.sax.saxutils import escape
+
+from modules.core.transaction_store import day_to_date, format_display_amount
+
+EXPORT_HEADERS = ["№", "Дата", "Тип", "Предмет|Услуга", "Кол-во", "Цена", "Сумма"]
+# Use alignment per column: right for numeric-ish, center for type, left for text
+TXT_ALIGNS = ['>', '<', '^', '<', '>', '>', '>']
+TXT_SEP = ' | '
+
+EXPORT_FORMATS = ('txt', 'csv', 'jsonl', 'xlsx')
+# QFileDialog filters, in EXPORT_FORMATS order
+EXPORT_FILTERS = ("Text Files (*.txt)", "CSV (*.csv)", "JSON Lines (*.jsonl)", "Excel (*.xlsx)")
+
+PROGRESS_EVERY = 2000
+
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+@dataclass
+class LedgerSnapshot:
+    """Store columns copied for export; `rows` lists store rows in output order."""
+    rows: array = field(default_factory=lambda: array('q'))
+    day: array = field(default_factory=lambda: array('l'))
+    income: array = field(default_factory=lambda: array('b'))
+    item_id: array = field(default_factory=lambda: array('l'))
+    qty: array = field(default_factory=lambda: array('q'))
+    price: array = field(default_factory=lambda: array('q'))
+    total: array = field(default_factory=lambda: array('q'))
+    names: List[str] = field(default_factory=list)
+    income_total: int = 0
+    expense_total: int = 0
+
+    @classmethod
+    def capture(cls, store, rows=None):
+        if rows is None:
+            rows = range(len(store))
+        return cls(array('q', (r for r in rows if r >= 0)),
+                   array(store.day.typecode, store.day), array(store.income.typecode, store.income),
+                   array(store.item_id.typecode, store.item_id), array(store.qty.typecode, store.qty),
+                   array(store.price.typecode, store.price), array(store.total.typecode, store.total),
+                   # Clean unwanted whitespace characters from the free-text names
+                   [n.replace('\t', ' ').replace('\n', ' ').strip() for n in store.item_names],
+                   store.income_total, store.expense_total)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def records(self):
+        """(number, date, is_income, item, qty or None, price, total) per output row."""
+        names = self.names
+        for pos, r in enumerate(self.rows, 1):
+            inc = self.income[r]
+            yield (pos, day_to_date(self.day[r]), inc, names[self.item_id[r]],
+                   None if inc else self.qty[r], self.price[r], self.total[r])
+
+    def txt_widths(self):
+        """Column widths of the aligned TXT table, from value ranges only."""
+        widths = [len(h) for h in EXPORT_HEADERS]
+        if not self.rows:
+            return widths
+        rows = self.rows
+        used = {self.item_id[r] for r in rows}
+        expense_qty = [self.qty[r] for r in rows if not self.income[r]]
+        totals = [self.total[r] for r in rows]
+        prices = [self.price[r] for r in rows]
+        cells = [
+            len(str(len(rows))),
+            max(len(day_to_date(d)) for d in {self.day[r] for r in rows}),
+            1,
+            max(len(self.names[i]) for i in used),
+            max(len(str(min(expense_qty))), len(str(max(expense_qty)))) if expense_qty else 0,
+            max(len(str(min(prices))), len(str(max(prices)))),
+            max(len(format_display_amount(min(totals))), len(format_display_amount(max(totals)))),
+        ]
+        return [max(w, c) for w, c in zip(widths, cells)]
+
+
+def format_for_path(path: str, default: str = 'txt') -> str:
+    ext = os.path.splitext(path)[1].lower().lstrip('.')
+    return ext if ext in EXPORT_FORMATS else default
+
+
+def _tick(done, total, progress, cancelled):
+    if done % PROGRESS_EVERY:
+        return
+    if cancelled is not None and cancelled():
+        raise ExportCancelled()
+    if progress is not None:
+        progress(done, total)
+
+
+def write_txt(snap: LedgerSnapshot, fh, progress=None, cancelled=None):
+    widths = snap.txt_widths()
+    fmts = [f"{{:{a}{w}}}" for a, w in zip(TXT_ALIGNS, widths)]
+    fh.write(TXT_SEP.join(f.format(h) for f, h in zip(fmts, EXPORT_HEADERS)) + '\n')
+    fh.write(TXT_SEP.join('-' * w for w in widths) + '\n')
+    line = TXT_SEP.join(fmts) + '\n'
+    total = len(snap)
+    for done, (num, date, inc, name, qty, price, amount) in enumerate(snap.records(), 1):
+        fh.write(line.format(str(num), date, '+' if inc else '-', name,
+                             '' if qty is None else str(qty), str(price), format_display_amount(amount)))
+        _tick(done, total, progress, cancelled)
+    fh.write('\n')
+    fh.write(f"Доходы: {format_display_amount(snap.income_total)}\n")
+    fh.write(f"Расходы: {format_display_amount(snap.expense_total)}\n")
+    fh.write(f"Баланс: {format_display_amount(snap.income_total + snap.expense_total)}\n")
+
+
+def write_csv(snap: LedgerSnapshot, fh, progress=None, cancelled=None):
+    writer = csv.writer(fh)
+    writer.writerow(EXPORT_HEADERS)
+    total = len(snap)
+    for done, (num, date, inc, name, qty, price, amount) in enumerate(snap.records(), 1):
+        writer.writerow((num, date, '+' if inc else '-', name, '' if qty is None else qty, price, amount))
+        _tick(done, total, progress, cancelled)
+
+
+def write_jsonl(snap: LedgerSnapshot, fh, progress=None, cancelled=None):
+    total = len(snap)
+    dumps = json.dumps
+    for done, (num, date, inc, name, qty, price, amount) in enumerate(snap.records(), 1):
+        fh.write(dumps({'n': num, 'date': date, 'type': 'income' if inc else 'expense', 'item': name,
+                        'qty': qty, 'price': price, 'sum': amount}, ensure_ascii=False) + '\n')
+        _tick(done, total, progress, cancelled)
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>')
+_XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>')
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Transactions" sheetId="1" r:id="rId1"/></sheets></workbook>')
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/></Relationships>')
+
+
+def _xlsx_row(r, values):
+    cells = []
+    for c, v in zip('ABCDEFG', values):
+        if v is None or v == '':
+            continue
+        if isinstance(v, int):
+            cells.append(f'<c r="{c}{r}"><v>{v}</v></c>')
+        else:
+            text = escape(_ILLEGAL_XML.sub('', str(v)))
+            cells.append(f'<c r="{c}{r}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{r}">{"".join(cells)}</row>'
+
+
+def write_xlsx(snap: LedgerSnapshot, path, progress=None, cancelled=None):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+        zf.writestr('_rels/.rels', _XLSX_RELS)
+        zf.writestr('xl/workbook.xml', _XLSX_WORKBOOK)
+        zf.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+        with zf.open('xl/worksheets/sheet1.xml', 'w') as raw:
+            def put(text):
+                raw.write(text.encode('utf-8'))
+            put('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            put(_xlsx_row(1, EXPORT_HEADERS))
+            total = len(snap)
+            for done, (num, date, inc, name, qty, price, amount) in enumerate(snap.records(), 1):
+                put(_xlsx_row(done + 1, (num, date, '+' if inc else '-', name, qty, price, amount)))
+                _tick(done, total, progress, cancelled)
+            put('</sheetData></worksheet>')
+
+
+def export_ledger(snap: LedgerSnapshot, path: str, fmt: str = None, progress=None, cancelled=None) -> int:
+    """Write `snap` to `path` in `fmt` (default: from the extension). Returns the
+    number of rows written. `progress(done, total)` is called every
+    PROGRESS_EVERY rows; when `cancelled()` turns true the partial file is
+    removed and ExportCancelled is raised.
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format: {fmt}")
+    try:
+        if fmt == 'xlsx':
+            write_xlsx(snap, path, progress, cancelled)
+        else:
+            writer = {'txt': write_txt, 'csv': write_csv, 'jsonl': write_jsonl}[fmt]
+            # CSV gets a BOM so Excel opens the Cyrillic text correctly
+            encoding = 'utf-8-sig' if fmt == 'csv' else 'utf-8'
+            with open(path, 'w', encoding=encoding, newline='' if fmt == 'csv' else None) as fh:
+                writer(snap, fh, progress, cancelled)
+    except ExportCancelled:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    if progress is not None:
+        progress(len(snap), len(snap))
+    return len(snap)
@@ -0,0 +1,64 @@
+"""Coalescing of derived-view recomputes after edits.
+
+Edits only mark what became stale (`mark('totals', 'sync')`); the registered
+recompute functions run once per burst, in registration order, when the owner
+calls `flush()`. The first mark after a flush calls `schedule()` so the owner
+can post that flush to the event loop (the governor uses QTimer.singleShot(0)).
+"""
+
+TOTALS = 'totals'
+STATS = 'stats'
+SYNC = 'sync'
+TRENDS = 'trends'
+
+
+class RecomputeScheduler:
+    def __init__(self, schedule=None):
+        self._schedule = schedule
+        self._jobs = []          # (flag, fn) in run order
+        self._dirty = set()
+        self._scheduled = False
+        self._flushing = False
+        self.runs = {}           # flag -> times recomputed, for diagnostics
+
+    def register(self, flag: str, fn):
+        self._jobs.append((flag, fn))
+        self.runs.setdefault(flag, 0)
+
+    def is_dirty(self, flag: str) -> bool:
+        return flag in self._dirty
+
+    def mark(self, *flags):
+        self._dirty.update(flags)
+        if self._scheduled or self._flushing or not self._dirty:
+            return
+        self._scheduled = True
+        if self._schedule is not None:
+            try:
+                self._schedule()
+            except Exception as e:
+                self._scheduled = False
+                print(f"[RecomputeScheduler] schedule failed: {e}")
+
+    def flush(self):
+        """Run the recompute of every dirty flag once. Flags marked by a job while
+        flushing are picked up by later jobs in the same pass or by the next pass.
+        """
+        self._scheduled = False
+        if self._flushing:
+            return
+        self._flushing = True
+        try:
+            for flag, fn in self._jobs:
+                if flag not in self._dirty:
+                    continue
+                self._dirty.discard(flag)
+                self.runs[flag] += 1
+                try:
+                    fn()
+                except Exception as e:
+                    print(f"[RecomputeScheduler] {flag} recompute failed: {e}")
+        finally:
+            self._flushing = False
+        if self._dirty:
+            self.mark()
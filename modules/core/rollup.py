@@ -0,0 +1,273 @@
+"""Income/expense/qty rollups of the transaction store by item x day, month and year.
+
+Buckets are julian days ('day'), year * 12 + month - 1 ('month') and years
+('year'). Every bucket keeps a per-item cell and a bucket total, each
+[income, expense, qty, count] with expense negative as in the store and qty
+counted for expenses only. Cells follow store edits by delta, like ItemStats.
+
+A date range is answered by splitting it into whole years, whole months and
+the leftover days at its edges, so the cost is the number of those buckets,
+not the number of transactions. Rows without a date are kept apart
+(`undated`) and only counted when asked for.
+
+A store reset only marks the rollup stale; it is rebuilt by the first query
+after it, so bulk imports don't pay for it while no report is open.
+Listeners get a single 'changed' event after every store change.
+"""
+import datetime
+from functools import lru_cache
+
+from modules.core.transaction_store import JULIAN_OFFSET
+
+LEVELS = ('day', 'month', 'year')
+MONTH_NAMES = ("Январь", "Февраль", "Март", "Апрель", "Май", "Июнь",
+               "Июль", "Август", "Сентябрь", "Октябрь", "Ноябрь", "Декабрь")
+
+INCOME, EXPENSE, QTY, COUNT = range(4)
+
+
+@lru_cache(maxsize=8192)
+def day_buckets(day: int):
+    """(month bucket, year) of a julian day."""
+    d = datetime.date.fromordinal(day - JULIAN_OFFSET)
+    return d.year * 12 + d.month - 1, d.year
+
+
+def month_start(month: int) -> int:
+    return datetime.date(month // 12, month % 12 + 1, 1).toordinal() + JULIAN_OFFSET
+
+
+def year_start(year: int) -> int:
+    return datetime.date(year, 1, 1).toordinal() + JULIAN_OFFSET
+
+
+def month_range(month: int):
+    """(first day, last day) of a month bucket."""
+    return month_start(month), month_start(month + 1) - 1
+
+
+def year_range(year: int):
+    return year_start(year), year_start(year + 1) - 1
+
+
+def bucket_label(level: str, bucket: int) -> str:
+    if level == 'year':
+        return str(bucket)
+    if level == 'month':
+        return f"{MONTH_NAMES[bucket % 12]} {bucket // 12}"
+    d = datetime.date.fromordinal(bucket - JULIAN_OFFSET)
+    return d.strftime('%d.%m.%Y')
+
+
+def _add_into(target, values, sign=1):
+    target[INCOME] += sign * values[INCOME]
+    target[EXPENSE] += sign * values[EXPENSE]
+    target[QTY] += sign * values[QTY]
+    target[COUNT] += sign * values[COUNT]
+
+
+class LedgerRollup:
+    def __init__(self, store):
+        self.store = store
+        self.cells = {level: {} for level in LEVELS}    # level -> bucket -> item key -> values
+        self.totals = {level: {} for level in LEVELS}   # level -> bucket -> values
+        self.undated = {}                               # item key -> values
+        self.names = {}                                 # item key -> display name
+        self._listeners = []
+        self._stale = True
+        store.add_listener(self._on_store_event)
+
+    def add_listener(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def _notify(self, event, *args):
+        for listener in list(self._listeners):
+            try:
+                listener(event, *args)
+            except Exception as e:
+                print(f"[LedgerRollup] listener failed on {event}: {e}")
+
+    # --- maintenance -------------------------------------------------------------
+    def _item_key(self, item_id):
+        name = self.store.item_names[item_id].strip()
+        key = name.lower()
+        self.names.setdefault(key, name)
+        return key
+
+    def _apply(self, day, item_id, values, sign):
+        key = self._item_key(item_id)
+        if not day:
+            self._bump(self.undated, key, values, sign)
+            return
+        month, year = day_buckets(day)
+        for level, bucket in (('day', day), ('month', month), ('year', year)):
+            self._bump(self.cells[level].setdefault(bucket, {}), key, values, sign)
+            self._bump(self.totals[level], bucket, values, sign)
+            if not self.cells[level][bucket]:
+                del self.cells[level][bucket]
+
+    @staticmethod
+    def _bump(table, key, values, sign):
+        cell = table.get(key)
+        if cell is None:
+            cell = table[key] = [0, 0, 0, 0]
+        _add_into(cell, values, sign)
+        if cell[COUNT] <= 0:
+            del table[key]
+
+    @staticmethod
+    def _values(inc, qty, total):
+        if inc:
+            return (total, 0, 0, 1)
+        return (0, total, qty, 1)
+
+    def _apply_row(self, row, sign):
+        s = self.store
+        self._apply(s.day[row], s.item_id[row], self._values(s.income[row], s.qty[row], s.total[row]), sign)
+
+    def rebuild(self):
+        """Full recount: rows are first summed per (day, item), then folded into the levels."""
+        s = self.store
+        self.names = {}
+        keys = [self._item_key(iid) for iid in range(len(s.item_names))]
+        per_day = {}
+        for day, inc, iid, qty, total in zip(s.day, s.income, s.item_id, s.qty, s.total):
+            cell = per_day.get((day, iid))
+            if cell is None:
+                cell = per_day[(day, iid)] = [0, 0, 0, 0]
+            if inc:
+                cell[INCOME] += total
+            else:
+                cell[EXPENSE] += total
+                cell[QTY] += qty
+            cell[COUNT] += 1
+        cells = {level: {} for level in LEVELS}
+        totals = {level: {} for level in LEVELS}
+        undated = {}
+        for (day, iid), values in per_day.items():
+            key = keys[iid]
+            if not day:
+                cell = undated.get(key)
+                if cell is None:
+                    undated[key] = values
+                else:
+                    _add_into(cell, values)
+                continue
+            month, year = day_buckets(day)
+            inc, exp, qty, count = values
+            for level, bucket in (('day', day), ('month', month), ('year', year)):
+                bucket_cells = cells[level].get(bucket)
+                if bucket_cells is None:
+                    bucket_cells = cells[level][bucket] = {}
+                for table, k in ((bucket_cells, key), (totals[level], bucket)):
+                    cell = table.get(k)
+                    if cell is None:
+                        table[k] = [inc, exp, qty, count]
+                    else:
+                        cell[INCOME] += inc
+                        cell[EXPENSE] += exp
+                        cell[QTY] += qty
+                        cell[COUNT] += count
+        self.cells, self.totals, self.undated = cells, totals, undated
+        self._stale = False
+
+    def _ensure(self):
+        if self._stale:
+            self.rebuild()
+
+    def _on_store_event(self, event, *args):
+        if event == 'reset':
+            self._stale = True
+        elif self._stale:
+            # deltas are folded in by the rebuild that follows
+            pass
+        elif event == 'insert':
+            for row in range(args[0], args[1] + 1):
+                self._apply_row(row, 1)
+        elif event == 'before_remove':
+            for row in range(args[0], args[1] + 1):
+                self._apply_row(row, -1)
+        elif event == 'update':
+            row, _fields, old = args
+            self._apply(old['day'], old['item_id'], self._values(old['is_income'], old['qty'], old['total']), -1)
+            self._apply_row(row, 1)
+        else:
+            return
+        self._notify('changed')
+
+    # --- queries -------------------------------------------------------------------
+    def year_span(self):
+        """(first day, last day) of the years holding dated transactions, or None."""
+        self._ensure()
+        years = self.totals['year']
+        if not years:
+            return None
+        return year_start(min(years)), year_range(max(years))[1]
+
+    def decompose(self, start_day=None, end_day=None):
+        """Cover [start_day, end_day] with the fewest (level, bucket) pieces."""
+        span = self.year_span()
+        if span is None:
+            return []
+        start = span[0] if start_day is None else max(start_day, span[0])
+        end = span[1] if end_day is None else min(end_day, span[1])
+        pieces = []
+        day = start
+        while day <= end:
+            month, year = day_buckets(day)
+            y_first, y_last = year_range(year)
+            if day == y_first and y_last <= end:
+                pieces.append(('year', year))
+                day = y_last + 1
+                continue
+            m_first, m_last = month_range(month)
+            if day == m_first and m_last <= end:
+                pieces.append(('month', month))
+                day = m_last + 1
+                continue
+            pieces.append(('day', day))
+            day += 1
+        return pieces
+
+    def range_totals(self, start_day=None, end_day=None, include_undated=False):
+        """[income, expense, qty, count] over the range."""
+        out = [0, 0, 0, 0]
+        self._ensure()
+        for level, bucket in self.decompose(start_day, end_day):
+            values = self.totals[level].get(bucket)
+            if values is not None:
+                _add_into(out, values)
+        if include_undated:
+            for values in self.undated.values():
+                _add_into(out, values)
+        return out
+
+    def item_totals(self, start_day=None, end_day=None, include_undated=False):
+        """item key -> [income, expense, qty, count] over the range."""
+        out = {}
+        self._ensure()
+        parts = [self.cells[level].get(bucket) for level, bucket in self.decompose(start_day, end_day)]
+        if include_undated:
+            parts.append(self.undated)
+        for cells in parts:
+            if not cells:
+                continue
+            for key, values in cells.items():
+                cell = out.get(key)
+                if cell is None:
+                    cell = out[key] = [0, 0, 0, 0]
+                _add_into(cell, values)
+        return out
+
+    def series(self, level: str, start_bucket: int, end_bucket: int):
+        """[(bucket, [income, expense, qty, count])] for each bucket of `level` in the range."""
+        self._ensure()
+        totals = self.totals[level]
+        return [(b, list(totals.get(b, (0, 0, 0, 0)))) for b in range(start_bucket, end_bucket + 1)]
@@ -0,0 +1,68 @@
+"""Row-level diff between the local rows of a store and a freshly fetched grid.
+
+Rows are compared by content (tuples of field values). The common prefix and
+suffix are skipped first, so a remote edit, insert or delete costs time in the
+size of the changed region; only that region goes through SequenceMatcher.
+`patch_rows()` applies the result to a store (TransactionStore, ItemCatalog)
+through its insert/update/remove methods, so models see only the changed rows.
+"""
+from difflib import SequenceMatcher
+
+# Above this many rows in the changed region a full reload is cheaper
+MAX_DIFF_WINDOW = 50000
+
+
+def diff_rows(old, new, max_window=MAX_DIFF_WINDOW):
+    """Opcodes (tag, i1, i2, j1, j2) turning `old` into `new`, as in
+    SequenceMatcher.get_opcodes() but without 'equal' entries. Returns None when
+    the changed region is larger than `max_window`.
+    """
+    n_old, n_new = len(old), len(new)
+    lo = 0
+    limit = min(n_old, n_new)
+    while lo < limit and old[lo] == new[lo]:
+        lo += 1
+    hi_old, hi_new = n_old, n_new
+    while hi_old > lo and hi_new > lo and old[hi_old - 1] == new[hi_new - 1]:
+        hi_old -= 1
+        hi_new -= 1
+    if hi_old == lo and hi_new == lo:
+        return []
+    if max(hi_old - lo, hi_new - lo) > max_window:
+        return None
+    matcher = SequenceMatcher(None, old[lo:hi_old], new[lo:hi_new])
+    return [(tag, i1 + lo, i2 + lo, j1 + lo, j2 + lo)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+
+def patch_rows(store, old, new, fields, max_window=MAX_DIFF_WINDOW, max_changes=None):
+    """Make `store` (currently holding `old`) hold `new` using row inserts,
+    updates and removals. `fields` names the tuple positions for the store's
+    insert()/update() keywords. Returns (inserted, updated, removed) counts,
+    or None when the caller should reload instead: the changed region is too
+    large, or more than `max_changes` rows (default: a quarter of the rows,
+    at least 200) would be touched.
+    """
+    ops = diff_rows(old, new, max_window)
+    if ops is None:
+        return None
+    if max_changes is None:
+        max_changes = max(200, len(new) // 4)
+    if sum(max(i2 - i1, j2 - j1) for _tag, i1, i2, j1, j2 in ops) > max_changes:
+        return None
+    inserted = updated = removed = 0
+    # Apply from the end so the row numbers of earlier opcodes stay valid
+    for _tag, i1, i2, j1, j2 in reversed(ops):
+        common = min(i2 - i1, j2 - j1)
+        for row in range(i2 - 1, i1 + common - 1, -1):
+            store.remove(row)
+            removed += 1
+        for k in range(common):
+            before, after = old[i1 + k], new[j1 + k]
+            changes = {f: v for f, v, ov in zip(fields, after, before) if v != ov}
+            if changes and store.update(i1 + k, **changes):
+                updated += 1
+        for k in range(common, j2 - j1):
+            store.insert(i1 + k, **dict(zip(fields, new[j1 + k])))
+            inserted += 1
+    return inserted, updated, removed
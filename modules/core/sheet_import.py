@@ -0,0 +1,92 @@
+"""Parsing of fetched Google Sheets grids into store-ready columns.
+
+Runs without Qt so the load threads can do it before handing data to the UI:
+`parse_fetched()` adds a 'parsed' entry to the fetched dict, which
+apply_imported_data() then loads into the stores in one pass each.
+"""
+from array import array
+from dataclasses import dataclass, field
+from typing import List
+
+from modules.core.item_catalog import parse_price
+from modules.core.transaction_store import date_to_day
+
+_INCOME_TYPES = frozenset(("+", "плюс", "plus", "income", "in", "i", "доход", "приход"))
+_EXPENSE_TYPES = frozenset(("-", "минус", "minus", "expense", "out", "o", "расход"))
+
+
+def normalize_type_to_income_flag(type_value, sum_value) -> bool:
+    """Return True for income(+), False for expense(-), handling messy imports."""
+    try:
+        t = str(type_value or "").strip().lower()
+        if t in _INCOME_TYPES:
+            return True
+        if t in _EXPENSE_TYPES:
+            return False
+        # if type is empty/unknown, infer from sum sign
+        s = str(sum_value or "").strip()
+        if s.startswith('+'):
+            return True
+        if s.startswith('-'):
+            return False
+        # if still unknown, default to expense (matches UI default)
+        return False
+    except Exception:
+        return False
+
+
+def _parse_int(value) -> int:
+    if value == "" or value is None:
+        return 0
+    try:
+        return int(float(value))
+    except Exception:
+        return 0
+
+
+@dataclass
+class LedgerColumns:
+    """Parsed 'stats' sheet in TransactionStore column layout."""
+    day: array = field(default_factory=lambda: array('l'))
+    income: array = field(default_factory=lambda: array('b'))
+    items: List[str] = field(default_factory=list)
+    qty: array = field(default_factory=lambda: array('q'))
+    price: array = field(default_factory=lambda: array('q'))
+
+    def __len__(self):
+        return len(self.day)
+
+
+def parse_stats_grid(grid) -> LedgerColumns:
+    """Rows after the header: [#, Date, Type, Item, Qty, Price, Sum]. The sheet's
+    Sum is only used to guess the type; totals are derived from type/qty/price.
+    """
+    rows = grid[1:] if grid and len(grid) > 1 else []
+    days, incomes, items, qtys, prices = [], [], [], [], []
+    for r in rows:
+        n = len(r)
+        days.append(date_to_day(r[1]) if n > 1 else 0)
+        incomes.append(1 if normalize_type_to_income_flag(r[2] if n > 2 else "", r[6] if n > 6 else "0") else 0)
+        items.append(str(r[3]) if n > 3 else "")
+        qtys.append(_parse_int(r[4]) if n > 4 else 0)
+        prices.append(_parse_int(r[5]) if n > 5 else 0)
+    return LedgerColumns(array('l', days), array('b', incomes), items, array('q', qtys), array('q', prices))
+
+
+def parse_objects_grid(grid):
+    """Rows after the header: [Item Name, Base Price] -> [(name, price)]; empty rows are skipped."""
+    rows = grid[1:] if grid and len(grid) > 1 else []
+    return [(str(r[0]), parse_price(r[1]) if len(r) > 1 else 0) for r in rows if r]
+
+
+def parse_fetched(fetched: dict) -> dict:
+    """Attach fetched['parsed'] = {'objects': [...], 'stats': LedgerColumns} for
+    the sheets present. Safe to call from a worker thread; returns `fetched`.
+    """
+    parsed = {}
+    if fetched.get('objects'):
+        parsed['objects'] = parse_objects_grid(fetched['objects'])
+    if fetched.get('stats'):
+        parsed['stats'] = parse_stats_grid(fetched['stats'])
+    fetched['parsed'] = parsed
+    return fetched
@@ -0,0 +1,48 @@
+"""Wall-clock timings of named startup stages.
+
+The governor cabinet records how long each construction stage took and when
+its first paint happened; `summary()` is what it logs, `as_dict()` is what the
+benchmarks store.
+"""
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    def __init__(self):
+        self.start = self._lap = time.perf_counter()
+        self.stages = {}       # stage -> ms spent in it, in completion order
+        self.marks = {}        # event -> ms since start (e.g. first_paint)
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def lap(self, name: str):
+        """Close stage `name`: the time since the previous lap (or the start)."""
+        t = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + (t - self._lap) * 1000
+        self._lap = t
+
+    @contextmanager
+    def stage(self, name: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - t) * 1000
+
+    def mark(self, name: str) -> bool:
+        """Record `name` at the current time since start; only the first call counts."""
+        if name in self.marks:
+            return False
+        self.marks[name] = self.elapsed_ms()
+        return True
+
+    def as_dict(self) -> dict:
+        return {'stages': {k: round(v, 2) for k, v in self.stages.items()},
+                'marks': {k: round(v, 2) for k, v in self.marks.items()}}
+
+    def summary(self) -> str:
+        parts = [f"{k} {v:.1f} ms" for k, v in self.stages.items()]
+        parts += [f"{k} at {v:.1f} ms" for k, v in self.marks.items()]
+        return ", ".join(parts)
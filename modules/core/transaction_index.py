@@ -0,0 +1,227 @@
+"""Derived indexes over a TransactionStore, kept current from store events.
+
+    DayIndex    sorted (day, row id) pairs: period lookups are two bisects
+    ItemStats   per-item expense aggregate (qty, total, count) for one period,
+                keyed by the normalized item name and adjusted by delta
+
+Both register themselves as store listeners. Create the DayIndex before the
+ItemStats that uses it, so on a store reset the index is rebuilt first.
+"""
+from bisect import bisect_left, bisect_right, insort
+
+
+class DayIndex:
+    def __init__(self, store):
+        self.store = store
+        self._keys = []
+        self.rebuild()
+        store.add_listener(self._on_store_event)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def rebuild(self):
+        self._keys = sorted(zip(self.store.day, self.store.ids))
+
+    def _discard(self, day, row_id):
+        i = bisect_left(self._keys, (day, row_id))
+        if i < len(self._keys) and self._keys[i] == (day, row_id):
+            del self._keys[i]
+
+    def _on_store_event(self, event, *args):
+        store = self.store
+        if event == 'reset':
+            self.rebuild()
+        elif event == 'insert':
+            first, last = args[0], args[1]
+            if last - first < 32:
+                for row in range(first, last + 1):
+                    insort(self._keys, (store.day[row], store.ids[row]))
+            else:
+                # bulk insert: one sort merges the two sorted runs in linear time
+                self._keys.extend(sorted(zip(store.day[first:last + 1], store.ids[first:last + 1])))
+                self._keys.sort()
+        elif event == 'before_remove':
+            for row in range(args[0], args[1] + 1):
+                self._discard(store.day[row], store.ids[row])
+        elif event == 'update':
+            row, fields, old = args
+            if 'day' in fields:
+                row_id = store.ids[row]
+                self._discard(old['day'], row_id)
+                insort(self._keys, (store.day[row], row_id))
+
+    def bounds(self, start_day=None, end_day=None, include_undated=True):
+        """Slice bounds of the dated rows within [start_day, end_day] (None =
+        open end), plus the count of undated rows (day 0) at the front when
+        `include_undated` is set.
+        """
+        undated = bisect_left(self._keys, (1,)) if include_undated else 0
+        lo = bisect_left(self._keys, (max(1, start_day or 1),))
+        if end_day is None:
+            hi = len(self._keys)
+        else:
+            hi = bisect_right(self._keys, (end_day, float('inf')))
+        return undated, lo, max(lo, hi)
+
+    def ids_in_range(self, start_day=None, end_day=None, include_undated=True):
+        """Row ids in day order (undated first)."""
+        undated, lo, hi = self.bounds(start_day, end_day, include_undated)
+        keys = self._keys
+        return [k[1] for k in keys[:undated]] + [k[1] for k in keys[lo:hi]]
+
+    def rows_in_range(self, start_day=None, end_day=None, include_undated=True):
+        """Current row numbers in day order (undated first)."""
+        row_of = self.store.row_of
+        return [row_of(rid) for rid in self.ids_in_range(start_day, end_day, include_undated)]
+
+
+class ItemStats:
+    """Expense totals per item for the rows inside the current period.
+
+    `keys` lists the aggregated items in first-seen order and `entries` maps
+    each key to [display name, qty, total, count]. Listeners get:
+
+        reset
+        before_insert(pos) / insert(pos)    a new key is appended at `pos`
+        update(pos)           the values of keys[pos] changed
+        before_remove(pos) / remove(pos)    keys[pos] lost its last row
+    """
+
+    def __init__(self, store, day_index):
+        self.store = store
+        self.day_index = day_index
+        self.start_day = None
+        self.end_day = None
+        self.keys = []
+        self.entries = {}
+        self._pos = {}
+        self._listeners = []
+        self.recompute()
+        store.add_listener(self._on_store_event)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add_listener(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def _notify(self, event, *args):
+        for listener in list(self._listeners):
+            try:
+                listener(event, *args)
+            except Exception as e:
+                print(f"[ItemStats] listener failed on {event}: {e}")
+
+    def entry(self, pos: int):
+        key = self.keys[pos]
+        return key, self.entries[key]
+
+    # --- period --------------------------------------------------------------
+    def in_period(self, day: int) -> bool:
+        # rows without a date are always counted
+        if not day:
+            return True
+        if self.start_day is not None and day < self.start_day:
+            return False
+        if self.end_day is not None and day > self.end_day:
+            return False
+        return True
+
+    def set_period(self, start_day=None, end_day=None) -> bool:
+        if (start_day, end_day) == (self.start_day, self.end_day):
+            return False
+        self.start_day, self.end_day = start_day, end_day
+        self.recompute()
+        return True
+
+    def recompute(self):
+        """Rebuild from the rows of the period, found through the day index."""
+        rows = sorted(r for r in self.day_index.rows_in_range(self.start_day, self.end_day) if r >= 0)
+        entries = {}
+        keys = []
+        for row in rows:
+            c = self._row_contribution(row)
+            if c is None:
+                continue
+            key, name, qty, total = c
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = [name, 0, 0, 0]
+                keys.append(key)
+            entry[1] += qty
+            entry[2] += total
+            entry[3] += 1
+        self.keys = keys
+        self.entries = entries
+        self._pos = {k: i for i, k in enumerate(keys)}
+        self._notify('reset')
+
+    # --- deltas ----------------------------------------------------------------
+    def _contribution(self, inc, day, item_id, qty, total):
+        """(key, name, qty, total) a row adds to the aggregate, or None."""
+        if inc or not self.in_period(day):
+            return None
+        name = self.store.item_names[item_id].strip()
+        key = name.lower()
+        if not key:
+            return None
+        return key, name, abs(qty), abs(total)
+
+    def _row_contribution(self, row):
+        s = self.store
+        return self._contribution(s.income[row], s.day[row], s.item_id[row], s.qty[row], s.total[row])
+
+    def _add(self, c, sign, count=1):
+        if c is None:
+            return
+        key, name, qty, total = c
+        entry = self.entries.get(key)
+        if entry is None:
+            if sign < 0:
+                return
+            pos = len(self.keys)
+            self._notify('before_insert', pos)
+            entry = self.entries[key] = [name, 0, 0, 0]
+            self._pos[key] = pos
+            self.keys.append(key)
+            self._notify('insert', pos)
+        entry[1] += sign * qty
+        entry[2] += sign * total
+        entry[3] += sign * count
+        pos = self._pos[key]
+        if entry[3] <= 0:
+            self._notify('before_remove', pos)
+            del self.keys[pos]
+            del self.entries[key]
+            self._pos = {k: i for i, k in enumerate(self.keys)}
+            self._notify('remove', pos)
+        else:
+            self._notify('update', pos)
+
+    def _on_store_event(self, event, *args):
+        if event == 'reset':
+            self.recompute()
+        elif event == 'insert':
+            for row in range(args[0], args[1] + 1):
+                self._add(self._row_contribution(row), 1)
+        elif event == 'before_remove':
+            for row in range(args[0], args[1] + 1):
+                self._add(self._row_contribution(row), -1)
+        elif event == 'update':
+            row, fields, old = args
+            before = self._contribution(old['is_income'], old['day'], old['item_id'], old['qty'], old['total'])
+            after = self._row_contribution(row)
+            if before is not None and after is not None and before[0] == after[0]:
+                # same item: one in-place delta, the row count is unchanged
+                self._add((after[0], after[1], after[2] - before[2], after[3] - before[3]), 1, count=0)
+            else:
+                self._add(before, -1)
+                self._add(after, 1)
@@ -0,0 +1,365 @@
+"""Columnar in-memory storage for governor cabinet transactions.
+
+Each column is a typed `array`, indexed by row:
+
+    day      julian day number of the date (0 = no date)
+    income   1 for income, 0 for expense
+    item_id  id of the interned item name (0 = empty name)
+    qty      quantity
+    price    unit price (income: the amount)
+    total    signed sum in whole units: income = price, expense = -qty * price
+    ids      stable row id; survives inserts, removals and reorders
+
+Readers (stats, sync, export) iterate the arrays directly. Writers go through
+the methods below, which keep `total` consistent and notify listeners. The
+running sums `income_total` and `expense_total` are adjusted by delta on every
+write; `audit_totals()` checks them against a full rescan.
+Listeners are plain callables `listener(event, *args)`; "before_*" events are
+sent before the arrays change so item models can bracket the change:
+
+    before_reset / reset
+    before_insert(first, last) / insert(first, last)
+    before_remove(first, last) / remove(first, last)
+    update(row, fields, old)         fields: tuple of changed field names,
+                                     old: the row's values before the change
+    before_reorder / reorder(order)  new row i holds old row order[i]
+"""
+import datetime
+from array import array
+from functools import lru_cache
+
+# QDate.toJulianDay() == date.toordinal() + JULIAN_OFFSET
+JULIAN_OFFSET = 1721425
+DATE_FORMAT = '%d.%m.%Y'
+
+FIELDS = ('day', 'is_income', 'item', 'qty', 'price')
+
+
+def transaction_sum(is_income, qty: int, price: int) -> int:
+    """Income sums to its price (quantity is ignored), expense to -qty * price."""
+    if is_income:
+        return int(price)
+    return -int(qty) * int(price)
+
+
+def format_display_amount(value: int, show_sign: bool = True) -> str:
+    """Format integer amount for display with dot thousand separators and trailing $; include sign for income/expense when requested.
+    If show_sign is False, positive values will not receive a leading '+', negative values still show '-'.
+    """
+    sign = ('+' if value > 0 and show_sign else ('-' if value < 0 else ''))
+    abs_val = abs(int(value))
+    s = f"{abs_val:,}".replace(',', '.')
+    if sign:
+        return f"{sign}{s}$"
+    return f"{s}$"
+
+
+def today_day() -> int:
+    return datetime.date.today().toordinal() + JULIAN_OFFSET
+
+
+def date_to_day(text) -> int:
+    """Parse 'dd.MM.yyyy' into a julian day number; 0 when empty or invalid."""
+    text = str(text or '').strip()
+    if not text:
+        return 0
+    return _parse_day(text)
+
+
+@lru_cache(maxsize=8192)
+def _parse_day(text: str) -> int:
+    # A ledger repeats the same few hundred dates, so strptime results are cached
+    try:
+        return datetime.datetime.strptime(text, DATE_FORMAT).date().toordinal() + JULIAN_OFFSET
+    except Exception:
+        return 0
+
+
+@lru_cache(maxsize=8192)
+def day_to_date(day: int) -> str:
+    """Format a julian day number as 'dd.MM.yyyy' ('' for 0)."""
+    if not day:
+        return ''
+    try:
+        return datetime.date.fromordinal(int(day) - JULIAN_OFFSET).strftime(DATE_FORMAT)
+    except Exception:
+        return ''
+
+
+class TransactionStore:
+    def __init__(self):
+        self.day = array('l')
+        self.income = array('b')
+        self.item_id = array('l')
+        self.qty = array('q')
+        self.price = array('q')
+        self.total = array('q')
+        self.ids = array('q')
+        self._next_id = 1
+        # row id -> row, rebuilt on demand after inserts/removals/reorders
+        self._rows_by_id = None
+        # Running sums of `total` over income rows and over expense rows
+        self.income_total = 0
+        self.expense_total = 0
+        # id -> name and name -> id; id 0 is the empty name
+        self.item_names = ['']
+        self._item_ids = {'': 0}
+        self._listeners = []
+
+    def __len__(self):
+        return len(self.day)
+
+    # --- listeners -------------------------------------------------------
+    def add_listener(self, listener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        try:
+            self._listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def _notify(self, event, *args):
+        for listener in list(self._listeners):
+            try:
+                listener(event, *args)
+            except Exception as e:
+                print(f"[TransactionStore] listener failed on {event}: {e}")
+
+    # --- item names --------------------------------------------------------
+    def intern_item(self, name) -> int:
+        name = str(name or '')
+        iid = self._item_ids.get(name)
+        if iid is None:
+            iid = len(self.item_names)
+            self.item_names.append(name)
+            self._item_ids[name] = iid
+        return iid
+
+    def item_name(self, row: int) -> str:
+        return self.item_names[self.item_id[row]]
+
+    # --- totals --------------------------------------------------------------
+    def _account(self, inc, total, sign=1):
+        if inc:
+            self.income_total += sign * total
+        else:
+            self.expense_total += sign * total
+
+    def recompute_totals(self):
+        """Full rescan: (income_total, expense_total)."""
+        income_total = 0
+        expense_total = 0
+        for inc, total in zip(self.income, self.total):
+            if inc:
+                income_total += total
+            else:
+                expense_total += total
+        return income_total, expense_total
+
+    def audit_totals(self) -> bool:
+        """Compare the running sums with a full rescan. On mismatch the sums are
+        replaced by the rescanned values and False is returned.
+        """
+        expected = self.recompute_totals()
+        if expected == (self.income_total, self.expense_total):
+            return True
+        print(f"[TransactionStore] totals drifted: running=({self.income_total}, {self.expense_total}) "
+              f"rescan={expected}")
+        self.income_total, self.expense_total = expected
+        return False
+
+    # --- row ids -------------------------------------------------------------
+    def _new_ids(self, count: int):
+        first = self._next_id
+        self._next_id += count
+        self._rows_by_id = None
+        return range(first, first + count)
+
+    def row_of(self, row_id: int) -> int:
+        """Current row of a stable row id, -1 if the row is gone."""
+        if self._rows_by_id is None:
+            self._rows_by_id = {rid: row for row, rid in enumerate(self.ids)}
+        return self._rows_by_id.get(row_id, -1)
+
+    def row_id(self, row: int) -> int:
+        return self.ids[row]
+
+    # --- reads ---------------------------------------------------------------
+    def snapshot(self, row: int) -> dict:
+        """Raw column values of a row (what 'update' listeners get as `old`)."""
+        return {
+            'day': self.day[row],
+            'is_income': self.income[row],
+            'item_id': self.item_id[row],
+            'qty': self.qty[row],
+            'price': self.price[row],
+            'total': self.total[row],
+        }
+
+    def row_tuples(self):
+        """(day, is_income 0/1, item, qty, price) per row, in FIELDS order."""
+        names = self.item_names
+        return list(zip(self.day, self.income, [names[i] for i in self.item_id], self.qty, self.price))
+
+    def record(self, row: int) -> dict:
+        day = self.day[row]
+        return {
+            'id': self.ids[row],
+            'day': day,
+            'date': day_to_date(day),
+            'is_income': bool(self.income[row]),
+            'item_id': self.item_id[row],
+            'item': self.item_names[self.item_id[row]],
+            'qty': self.qty[row],
+            'price': self.price[row],
+            'sum': self.total[row],
+        }
+
+    # --- writes --------------------------------------------------------------
+    def load(self, rows):
+        """Replace all transactions. `rows` yields (day, is_income, item, qty, price)."""
+        day = array('l')
+        income = array('b')
+        items = []
+        qty = array('q')
+        price = array('q')
+        for d, inc, item, q, p in rows:
+            day.append(int(d or 0))
+            income.append(1 if inc else 0)
+            items.append(item)
+            qty.append(int(q))
+            price.append(int(p))
+        self.load_columns(day, income, items, qty, price)
+
+    def load_columns(self, day, income, items, qty, price):
+        """Bulk fast path: adopt prebuilt columns (day 'l', income 'b' of 0/1,
+        qty/price 'q' arrays and a list of item names) in one pass and one reset.
+        """
+        if not (len(day) == len(income) == len(items) == len(qty) == len(price)):
+            raise ValueError("column lengths differ")
+        self._notify('before_reset')
+        # Start a fresh name table so names typed and abandoned earlier are dropped
+        self.item_names = ['']
+        self._item_ids = {'': 0}
+        intern = self.intern_item
+        item_id = array('l', [intern(name) for name in items])
+        total = array('q', [p if inc else -q * p for inc, q, p in zip(income, qty, price)])
+        income_total = 0
+        expense_total = 0
+        for inc, t in zip(income, total):
+            if inc:
+                income_total += t
+            else:
+                expense_total += t
+        self.day, self.income, self.item_id = array('l', day), array('b', income), item_id
+        self.qty, self.price, self.total = array('q', qty), array('q', price), total
+        self.ids = array('q', self._new_ids(len(day)))
+        self.income_total, self.expense_total = income_total, expense_total
+        self._notify('reset')
+
+    def append_columns(self, day, income, items, qty, price) -> range:
+        """Append a block of rows given as columns (same layout as load_columns)
+        with a single insert notification. Returns the new rows.
+        """
+        if not (len(day) == len(income) == len(items) == len(qty) == len(price)):
+            raise ValueError("column lengths differ")
+        first = len(self.day)
+        count = len(day)
+        if not count:
+            return range(first, first)
+        last = first + count - 1
+        self._notify('before_insert', first, last)
+        intern = self.intern_item
+        self.day.extend(array('l', day))
+        self.income.extend(array('b', income))
+        self.item_id.extend(array('l', [intern(name) for name in items]))
+        self.qty.extend(array('q', qty))
+        self.price.extend(array('q', price))
+        total = array('q', [p if inc else -q * p for inc, q, p in zip(income, qty, price)])
+        self.total.extend(total)
+        self.ids.extend(array('q', self._new_ids(count)))
+        for inc, t in zip(income, total):
+            self._account(inc, t)
+        self._notify('insert', first, last)
+        return range(first, last + 1)
+
+    def clear(self):
+        self.load(())
+
+    def insert(self, row=None, day=0, is_income=False, item='', qty=0, price=0) -> int:
+        n = len(self.day)
+        if row is None or row > n or row < 0:
+            row = n
+        inc = 1 if is_income else 0
+        self._notify('before_insert', row, row)
+        self.day.insert(row, int(day or 0))
+        self.income.insert(row, inc)
+        self.item_id.insert(row, self.intern_item(item))
+        self.qty.insert(row, int(qty))
+        self.price.insert(row, int(price))
+        total = transaction_sum(inc, qty, price)
+        self.total.insert(row, total)
+        self.ids.insert(row, self._new_ids(1)[0])
+        self._account(inc, total)
+        self._notify('insert', row, row)
+        return row
+
+    def append(self, day=0, is_income=False, item='', qty=0, price=0) -> int:
+        return self.insert(None, day, is_income, item, qty, price)
+
+    def remove(self, row: int):
+        if row < 0 or row >= len(self.day):
+            return
+        self._notify('before_remove', row, row)
+        self._account(self.income[row], self.total[row], -1)
+        for col in (self.day, self.income, self.item_id, self.qty, self.price, self.total, self.ids):
+            del col[row]
+        self._rows_by_id = None
+        self._notify('remove', row, row)
+
+    def update(self, row: int, **fields) -> bool:
+        """Set one or more of FIELDS on a row; notifies once if anything changed."""
+        if row < 0 or row >= len(self.day):
+            return False
+        old = self.snapshot(row)
+        changed = []
+        for name, value in fields.items():
+            if name == 'day':
+                value, col = int(value or 0), self.day
+            elif name == 'is_income':
+                value, col = (1 if value else 0), self.income
+            elif name == 'item':
+                value, col = self.intern_item(value), self.item_id
+            elif name == 'qty':
+                value, col = int(value), self.qty
+            elif name == 'price':
+                value, col = int(value), self.price
+            else:
+                raise KeyError(name)
+            if col[row] != value:
+                col[row] = value
+                changed.append(name)
+        if not changed:
+            return False
+        new_total = transaction_sum(self.income[row], self.qty[row], self.price[row])
+        self.total[row] = new_total
+        self._account(old['is_income'], old['total'], -1)
+        self._account(self.income[row], new_total)
+        self._notify('update', row, tuple(changed), old)
+        return True
+
+    def set_field(self, row: int, field: str, value) -> bool:
+        return self.update(row, **{field: value})
+
+    def reorder(self, order):
+        """Permute rows so that new row i holds old row order[i]."""
+        if len(order) != len(self.day):
+            return
+        self._notify('before_reorder')
+        for name in ('day', 'income', 'item_id', 'qty', 'price', 'total', 'ids'):
+            col = getattr(self, name)
+            setattr(self, name, array(col.typecode, [col[i] for i in order]))
+        self._rows_by_id = None
+        self._notify('reorder', list(order))
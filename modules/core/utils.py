@@ -29,4 +29,18 @@ def get_resource_path(relative_path):
         # If user runs 'python c:\path\to\main.py' from elsewhere, CWD is elsewhere.
         # Using __file__ allows us to not depend on CWD.
         
-    return os.path.join(base_path, relative_path)
\ No newline at end of file
+    return os.path.join(base_path, relative_path)
+
+
+def get_data_path(*parts):
+    """ Per-user writable directory for local app state (created if missing).
+    GOVUT_DATA_DIR in the environment overrides the location. """
+    base = os.environ.get('GOVUT_DATA_DIR')
+    if not base:
+        if sys.platform == 'win32':
+            base = os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), 'GovUT')
+        else:
+            base = os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share'), 'gov_ut')
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -1,24 +1,43 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QFrame, QTableWidget,
-                             QTableWidgetItem, QHeaderView, QDateEdit, QComboBox, 
-                             QDoubleSpinBox, QSpinBox, QMessageBox, QGroupBox, QSizePolicy,
-                             QCalendarWidget, QToolButton, QMenu, QAbstractSpinBox, QStyle, QApplication, QStyleOptionComboBox, QStyleOptionSpinBox, QWidgetAction, QLineEdit, QScrollArea, QListWidget, QListWidgetItem)
+                             QLabel, QPushButton, QFrame, QTableView,
+                             QHeaderView, QMessageBox, QGroupBox, QSizePolicy,
+                             QCalendarWidget, QToolButton, QMenu, QStyle, QApplication, QStyleOptionComboBox, QStyleOptionSpinBox, QWidgetAction, QLineEdit, QScrollArea, QListWidget, QListWidgetItem, QTabWidget)
 from PyQt6.QtCore import Qt, QDate, QEvent, QLocale, QRect, QPointF, QPoint, QSize, QTimer, QThread, pyqtSignal, QMutex
-from PyQt6.QtGui import QColor, QFont, QIcon, QPainter, QMouseEvent, QKeyEvent
+from PyQt6.QtGui import QColor, QFont, QIcon, QPainter, QMouseEvent, QKeyEvent, QKeySequence, QShortcut
 import hashlib
 import time
 from modules.core.google_service import GoogleService
-from modules.core.utils import get_resource_path
+from modules.core.config import DEBUG
+from modules.core.utils import get_resource_path, get_data_path
 from modules.core.google_sheet_worker import GoogleSheetLoadThread, GoogleSheetSyncThread
 from modules.ui.loading_overlay import LoadingOverlay
 from modules.ui.scrollbar_styles import get_scrollbar_qss
-from modules.ui.widgets.custom_controls import (CustomCalendarWidget, DateEditClickable, DateRangeEdit, 
-                             NoScrollSpinBox, NoScrollDoubleSpinBox, NoScrollComboBox)
+from modules.ui.widgets.custom_controls import CustomCalendarWidget, DateRangeEdit, NoScrollComboBox
 from modules.ui.widgets.item_picker_popup import ItemPickerPopup
 from modules.ui.widgets.suggestions_popup import SuggestionsPopup
 from modules.ui.widgets.simple_suggestions import SimpleSuggestionsPopup
-from modules.ui.widgets.table_helpers import (create_centered_spinbox, create_delete_button, 
-                             create_date_button, create_plus_button)
+from modules.ui.widgets.transaction_table import (TransactionTableModel, TransactionDelegate, TransactionTableView,
+                             COL_DATE, COL_ITEM,
+                             format_display_amount as _format_display_amount)
+from modules.ui.widgets.items_table import ItemsTableModel, ItemsDelegate, ItemsTableView
+from modules.ui.widgets.item_stats_table import ItemStatsModel, ItemStatsFilterModel, ItemStatsDelegate
+from modules.ui.widgets.period_report import PeriodReportDialog
+from modules.ui.widgets.trends_view import TrendsWidget
+from modules.core.transaction_store import TransactionStore, FIELDS, day_to_date, today_day
+from modules.core.transaction_index import DayIndex, ItemStats
+from modules.core.rollup import LedgerRollup
+from modules.core import analytics
+from modules.core.item_catalog import ItemCatalog, ITEM_FIELDS
+from modules.core.item_suggest import ItemSuggester
+from modules.core.recompute import RecomputeScheduler, TOTALS, STATS, SYNC, TRENDS
+from modules.core.row_diff import patch_rows
+from modules.core.sheet_import import parse_fetched, parse_objects_grid
+from modules.core.ledger_export import LedgerSnapshot, EXPORT_FORMATS, EXPORT_FILTERS, format_for_path
+from modules.core.export_worker import LedgerExportThread
+from modules.core.bulk_import import BULK_FILE_FILTER
+from modules.core.bulk_import_worker import BulkImportThread
+from modules.core.autosave import CabinetAutosave
+from modules.core.stage_timer import StageTimer
 
 class RemoteLoadWorker(QThread):
     error_occurred = pyqtSignal(str)
@@ -38,39 +57,10 @@ class RemoteLoadWorker(QThread):
                 payload['objects'] = objs
             if stats is not None:
                 payload['stats'] = stats
-            self.data_loaded.emit(payload)
+            self.data_loaded.emit(parse_fetched(payload))
         except Exception as e:
             self.error_occurred.emit(str(e))
 
-def _format_display_amount(value: int, show_sign: bool = True) -> str:
-    """Format integer amount for display with dot thousand separators and trailing $; include sign for income/expense when requested.
-    If show_sign is False, positive values will not receive a leading '+', negative values still show '-'.
-    """
-    sign = ('+' if value > 0 and show_sign else ('-' if value < 0 else ''))
-    abs_val = abs(int(value))
-    s = f"{abs_val:,}".replace(',', '.')
-    if sign:
-        return f"{sign}{s}$"
-    return f"{s}$"
-
-
-def _parse_display_amount(text: str) -> int:
-    """Parse displayed amount (which may contain +, -, dots and $) back to integer value for export/compute."""
-    if not text:
-        return 0
-    t = text.replace('$', '').replace(' ', '').replace('+', '')
-    # Keep minus if present, remove dots
-    t = t.replace('.', '')
-    try:
-        return int(t)
-    except Exception:
-        # fallback: extract digits and optional leading -
-        import re
-        m = re.search(r"-?\d+", text)
-        if m:
-            return int(m.group(0))
-        return 0
-
 class SyncWorker(QThread):
     finished = pyqtSignal()
     import_ready = pyqtSignal(object)  # Emits dict with sheet data when import detected
@@ -176,7 +166,8 @@ class SyncWorker(QThread):
                 changed = True
 
         if changed and fetched:
-            self.import_ready.emit(fetched)
+            # Parse here so the UI thread only loads ready columns
+            self.import_ready.emit(parse_fetched(fetched))
 
     def stop(self):
         self._is_running = False
@@ -191,6 +182,10 @@ class SyncWorker(QThread):
 class GovernorCabinetWindow(QMainWindow):
     def __init__(self, user_data, parent_launcher=None):
         super().__init__()
+        # Construction is staged: the frame and the transactions table are built
+        # here, the stats view, suggestions popup and loading overlay on first use
+        # or right after the first paint, the Trends tab when it is first opened.
+        self.startup = StageTimer()
         self.user_data = user_data
         self.parent_launcher = parent_launcher
         self.google_service = GoogleService(target_spreadsheet_id="1E1dzanmyjcGUur8sp4uFsc7cADDhvNp4UEley6VIS6Y")
@@ -220,7 +215,7 @@ class GovernorCabinetWindow(QMainWindow):
                 left: 10px;
                 padding: 0 3px;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #1e1e1e;
                 gridline-color: transparent;
                 color: #ddd;
@@ -229,7 +224,7 @@ class GovernorCabinetWindow(QMainWindow):
                 selection-background-color: transparent;
                 outline: none;
             }
-            QTableWidget::item {
+            QTableView::item {
                 background-color: #333333;
                 margin-top: 0px; 
                 margin-bottom: 8px;
@@ -289,10 +284,26 @@ class GovernorCabinetWindow(QMainWindow):
         self.transaction_data = [] # Left table
         self.item_definitions = [] # Right top table
 
-        # Initialize items_table before accessing it
-        self.items_table = QTableWidget()
-        self.items_table.setColumnCount(3) # Changed to 3 columns: Name, Price, Delete
-        self.items_table.setHorizontalHeaderLabels(["Название предмета", "Базовая цена", "x"])
+        # Edits mark derived views dirty; each is recomputed once per burst of
+        # edits, on the next event-loop pass
+        self.recompute = RecomputeScheduler(lambda: QTimer.singleShot(0, self.recompute.flush))
+        self.recompute.register(TOTALS, self.update_totals)
+        self.recompute.register(STATS, self.update_stats_table)
+        self.recompute.register(TRENDS, self.update_trends)
+        self.recompute.register(SYNC, self.sync_all_data)
+
+        # Initialize items_table before accessing it. Items are plain rows in the
+        # catalog; the table paints them and opens editors only while editing.
+        self.item_catalog = ItemCatalog()
+        self.items_model = ItemsTableModel(self.item_catalog, self)
+        self.items_table = ItemsTableView()
+        self.items_table.setModel(self.items_model)
+        self.items_delegate = ItemsDelegate(self.items_table)
+        self.items_table.setItemDelegate(self.items_delegate)
+        self.items_delegate.add_clicked.connect(self.add_new_item_row)
+        self.items_delegate.delete_clicked.connect(self.delete_item_row)
+        for sig in (self.items_model.dataChanged, self.items_model.rowsInserted, self.items_model.rowsRemoved):
+            sig.connect(self._on_items_changed)
         
         # Configure columns to match trans_table style
         self.items_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
@@ -305,12 +316,6 @@ class GovernorCabinetWindow(QMainWindow):
         
         self.items_table.horizontalHeader().setStretchLastSection(False)
 
-        # Header "x" centered
-        item_del = QTableWidgetItem("x")
-        item_del.setToolTip("Удалить")
-        item_del.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.items_table.setHorizontalHeaderItem(2, item_del)
-
         # Visual styles matching left table
         self.items_table.setShowGrid(False) 
         self.items_table.verticalHeader().setVisible(False) # Hide line numbers
@@ -327,37 +332,29 @@ class GovernorCabinetWindow(QMainWindow):
         except Exception:
             pass
 
-        # Init items table with plus row
+        # Start with an empty catalog (only the '+' row)
         self.init_items_table()
 
-        # Create minimal suggestions popup early so any callbacks during import/worker
-        # that call _show_suggestions_for_editor find the popup initialized.
-        try:
-            # During initialization we still want to suppress showing suggestions until
-            # imports/initialization finish, but create the popup instance early so
-            # any code paths that reference it won't trigger lazy display at (0,0).
-            self._suspend_suggestions = True
-            self._suggestions_popup = SimpleSuggestionsPopup(self)
-            try:
-                self._suggestions_popup.suggestion_selected.connect(self._on_suggestion_selected)
-            except Exception:
-                pass
-            try:
-                self._suggestions_popup.suggestion_closed.connect(self._on_suggestions_closed)
-            except Exception:
-                pass
-            # timestamp until which reopening is suppressed
-            self._suppress_reopen_until = 0
-        except Exception as e:
-            try:
-                print(f"[Governor] Failed to create suggestions popup during init: {e}")
-            except Exception:
-                pass
-            self._suggestions_popup = None
+        # Suggestions stay suppressed until imports/initialization finish. The popup
+        # itself is created by _ensure_suggestions_popup (first use or idle time).
+        self._suspend_suggestions = True
+        self._suggestions_popup = None
+        # timestamp until which reopening is suppressed
+        self._suppress_reopen_until = 0
+        self.startup.lap('window')
 
         # Ensure init_ui is called to initialize all UI components, including trans_table
         self.init_ui()
         self.setup_auto_sync()
+        self.startup.lap('frame')
+
+        # Header totals are kept by delta in the store; debug builds periodically
+        # re-check them against a full rescan.
+        if DEBUG:
+            self._totals_audit_timer = QTimer(self)
+            self._totals_audit_timer.setInterval(30000)
+            self._totals_audit_timer.timeout.connect(self._audit_totals)
+            self._totals_audit_timer.start()
 
         # No automatic import on open. Provide manual import button in header.
         # The button is created in init_ui; connect it here if needed.
@@ -380,23 +377,97 @@ class GovernorCabinetWindow(QMainWindow):
         self._auto_loaded_once = False
         self._load_thread = None
         self._sync_thread = None
-        self._loading_overlay = LoadingOverlay(self, text="Загрузка...")
+        # Created by _get_loading_overlay when an import first needs it
+        self._loading_overlay = None
+        self._load_in_background = False
+        self._load_start_seq = 0
+        self.startup.lap('sync')
+
+        # Local autosave: the last saved cabinet state is shown right away and
+        # edits that never reached the sheets are synced again
+        self.autosave = CabinetAutosave(get_data_path('governor'))
+        self._restored_local = self._restore_autosave()
+        self.startup.lap('autosave')
 
         # Auto-import on first open
         QTimer.singleShot(0, self._auto_import_on_open)
 
-        # suggestions popup was created earlier; log current state
-        try:
-            print("[Governor] suggestions_popup state after init:", getattr(self, '_suggestions_popup', None))
-        except Exception:
-            pass
-
         # Track which row editor triggered the popup
         self._popup_active_editor = None
 
+    # --- staged construction ------------------------------------------------------
+    def paintEvent(self, event):
+        if self.startup.mark('first_paint'):
+            # Build what was deferred once the first frame is on screen
+            QTimer.singleShot(0, self._build_deferred_widgets)
+        return super().paintEvent(event)
+
+    def _build_deferred_widgets(self):
+        """Idle-time stage after the first paint: the widgets not needed for it."""
+        try:
+            self._ensure_stats_view()
+            self._ensure_suggestions_popup()
+            self._get_loading_overlay()
+        except Exception as e:
+            print(f"[Governor] deferred construction failed: {e}")
+        self.startup.mark('deferred_built')
+        print(f"[Governor] startup: {self.startup.summary()}")
+
+    def _ensure_suggestions_popup(self):
+        popup = self._suggestions_popup
+        if popup is not None:
+            return popup
+        with self.startup.stage('suggestions_popup'):
+            try:
+                popup = SimpleSuggestionsPopup(self)
+                popup.suggestion_selected.connect(self._on_suggestion_selected)
+                popup.suggestion_closed.connect(self._on_suggestions_closed)
+                self._suggestions_popup = popup
+            except Exception as e:
+                print(f"[Governor] Failed to create suggestions popup: {e}")
+        return self._suggestions_popup
+
+    def _get_loading_overlay(self):
+        if self._loading_overlay is None:
+            with self.startup.stage('loading_overlay'):
+                self._loading_overlay = LoadingOverlay(self, text="Загрузка...")
+        return self._loading_overlay
+
+    def _restore_autosave(self) -> bool:
+        """Load the autosaved stores (if any) and start logging edits."""
+        restored = False
+        self._importing = True
+        try:
+            restored = self.autosave.restore(self.trans_store, self.item_catalog)
+        except Exception as e:
+            print(f"[Governor] autosave restore failed: {e}")
+        finally:
+            self._importing = False
+        try:
+            self.autosave.attach(self.trans_store, self.item_catalog)
+        except Exception as e:
+            print(f"[Governor] autosave disabled: {e}")
+        if restored:
+            self.recompute.mark(TOTALS, STATS, TRENDS)
+            # Re-derive the remote sync that was pending at exit
+            if self.autosave.pending:
+                self.sync_all_data()
+        return restored
+
     def closeEvent(self, event):
         if self.sync_worker:
             self.sync_worker.stop()
+        # Final local snapshot; waits for the autosave writer
+        try:
+            self.autosave.close()
+        except Exception as e:
+            print(f"[Governor] autosave close failed: {e}")
+        # Cancel a running export; it stops within PROGRESS_EVERY rows and
+        # removes its partial file (export_ledger)
+        th = getattr(self, '_export_thread', None)
+        if th is not None and th.isRunning():
+            th.requestInterruption()
+            th.wait()
         super().closeEvent(event)
 
     def init_ui(self):
@@ -490,7 +561,7 @@ class GovernorCabinetWindow(QMainWindow):
                     pass
                 try:
                     # Update the stats table and re-run transactions sorting/filtering
-                    self.update_stats_table()
+                    self.recompute.mark(STATS, TRENDS)
                     try:
                         self._sort_transactions_by_date()
                     except Exception:
@@ -550,8 +621,16 @@ class GovernorCabinetWindow(QMainWindow):
         buttons_layout.addWidget(btn_back)
         buttons_layout.addWidget(btn_import)
 
+        # Bulk import of transactions from a CSV/TSV/XLSX file (same style as Import)
+        btn_bulk = self.btn_bulk_import = QPushButton("Из файла")
+        btn_bulk.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_bulk.setToolTip("Добавить транзакции из CSV/TSV/XLSX. Таблицу можно и вставить в список транзакций (Ctrl+V).")
+        btn_bulk.setStyleSheet(btn_import.styleSheet())
+        btn_bulk.clicked.connect(lambda: self.import_transactions_file())
+        buttons_layout.addWidget(btn_bulk)
+
         # Export button: same style as Import/launcher buttons, placed under Import
-        btn_export = QPushButton("Экспорт")
+        btn_export = self.btn_export = QPushButton("Экспорт")
         btn_export.setCursor(Qt.CursorShape.PointingHandCursor)
         btn_export.setStyleSheet("""
             QPushButton {
@@ -570,6 +649,13 @@ class GovernorCabinetWindow(QMainWindow):
 
         buttons_layout.addWidget(btn_export)
 
+        # Period report button (same style as Export)
+        btn_report = QPushButton("Отчёт")
+        btn_report.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_report.setStyleSheet(btn_export.styleSheet())
+        btn_report.clicked.connect(lambda: self.show_period_report())
+        buttons_layout.addWidget(btn_report)
+
         header_layout.addLayout(buttons_layout)
 
         main_layout.addLayout(header_layout)
@@ -582,16 +668,26 @@ class GovernorCabinetWindow(QMainWindow):
         grp_trans_layout = QVBoxLayout(grp_trans)
         grp_trans_layout.setContentsMargins(5, 20, 5, 5)
         
-        self.trans_table = QTableWidget()
-        self.trans_table.setColumnCount(8)
-        self.trans_table.setHorizontalHeaderLabels(["№", "Дата", "Тип", "Предмет|Услуга", "Кол-во", "Цена", "Сумма", "x"])
+        # Transactions live in a columnar store; the table is a model view over it.
+        # Cells are painted by the delegate and real editors exist only for the
+        # cell being edited.
+        self.trans_store = TransactionStore()
+        # Derived indexes follow the store: rows sorted by day and the per-item
+        # expense aggregate shown in the stats table
+        self.trans_day_index = DayIndex(self.trans_store)
+        self.item_stats = ItemStats(self.trans_store, self.trans_day_index)
+        # item x day/month/year rollups for the period report
+        self.trans_rollup = LedgerRollup(self.trans_store)
+        # Ranked item-name suggestions for the item editors; the index is rebuilt
+        # only when the catalog's names change, usage counts follow the store
+        self.item_suggester = ItemSuggester(self.item_catalog, self.trans_store)
+        self.trans_model = TransactionTableModel(self.trans_store, self)
+        self.trans_table = TransactionTableView()
+        self.trans_table.setModel(self.trans_model)
+        self.trans_delegate = TransactionDelegate(self.trans_table)
+        self.trans_table.setItemDelegate(self.trans_delegate)
         self.trans_table.horizontalHeader().setStretchLastSection(False)
         
-        item_del = QTableWidgetItem("x")
-        item_del.setToolTip("Удалить")
-        item_del.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.trans_table.setHorizontalHeaderItem(7, item_del)
-        
         self.trans_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)
         self.trans_table.setColumnWidth(0, 50)
         
@@ -641,6 +737,19 @@ class GovernorCabinetWindow(QMainWindow):
         
         self.init_trans_table()
 
+        self.trans_delegate.add_clicked.connect(self.add_new_transaction_row)
+        self.trans_delegate.date_clicked.connect(self.show_calendar_popup)
+        self.trans_delegate.type_clicked.connect(self.toggle_type)
+        self.trans_delegate.delete_clicked.connect(self.delete_transaction_row)
+        self.trans_delegate.item_editor_created.connect(self._wire_item_editor)
+        # Ctrl+V on the table itself (not inside a cell editor) pastes rows in bulk
+        self._paste_shortcut = QShortcut(QKeySequence.StandardKey.Paste, self.trans_table)
+        self._paste_shortcut.setContext(Qt.ShortcutContext.WidgetShortcut)
+        self._paste_shortcut.activated.connect(self.paste_transactions)
+        self.trans_model.dataChanged.connect(self._on_transactions_changed)
+        self.trans_model.rowsInserted.connect(self._on_transactions_changed)
+        self.trans_model.rowsRemoved.connect(self._on_transactions_changed)
+
         left_layout.addWidget(grp_trans)
         
         content_layout.addLayout(left_layout, stretch=3)
@@ -658,63 +767,28 @@ class GovernorCabinetWindow(QMainWindow):
         right_layout.addWidget(grp_items, stretch=1)
         
         grp_stats = QGroupBox("Общая статистика по предметам")
-        grp_stats_layout = QVBoxLayout(grp_stats)
-
-        # Search input above the stats table
-        self.stats_search = QLineEdit()
-        self.stats_search.setPlaceholderText("Поиск по предмету")
-        self.stats_search.setStyleSheet("""
-            QLineEdit { background-color: white; color: black; border: 1px solid #555555; border-radius: 4px; padding: 4px; }
-        """)
-        self.stats_search.setMaximumHeight(30)
-        self.stats_search.textChanged.connect(lambda txt: self.update_stats_table(txt))
-        grp_stats_layout.addWidget(self.stats_search)
-
-        # Stats table: columns - Item, Qty, Avg price per unit, Total sum
-        self.stats_table = QTableWidget()
-        self.stats_table.setColumnCount(4)
-        self.stats_table.setHorizontalHeaderLabels(["Предмет", "Кол-во", "За шт.", "Сумма"]) 
-        # Use Stretch resize mode so columns expand to fill available width and
-        # do not cause horizontal scroll. Set sensible minimum widths so small
-        # windows don't make columns too narrow.
-        for ci in range(4):
-            try:
-                self.stats_table.horizontalHeader().setSectionResizeMode(ci, QHeaderView.ResizeMode.Stretch)
-            except Exception:
-                pass
-        # Minimum widths (smaller to avoid overflow on narrow windows)
-        try:
-            self.stats_table.setColumnWidth(0, 100)  # Предмет
-            self.stats_table.setColumnWidth(1, 60)   # Кол-во
-            self.stats_table.setColumnWidth(2, 90)   # За шт.
-            self.stats_table.setColumnWidth(3, 90)   # Сумма
-        except Exception:
-            pass
-
-        self.stats_table.setShowGrid(False)
-        self.stats_table.verticalHeader().setVisible(False)
-        self.stats_table.verticalHeader().setDefaultSectionSize(40)
-        self.stats_table.horizontalHeader().setDefaultSectionSize(40)
-        self.stats_table.horizontalHeader().setMinimumSectionSize(40)
-        # Avoid horizontal scrollbar and allow table to expand horizontally within the layout
+        # Search box and table are built by _ensure_stats_view (first use or idle time)
+        self._grp_stats_layout = QVBoxLayout(grp_stats)
+        self.stats_search = None
+        self.stats_table = None
+        self._stats_table_width = None
+        # Avoid horizontal scrollbar and allow the items table to expand horizontally within the layout
         try:
-            self.stats_table.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            self.stats_table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-            # also ensure items table doesn't force extra width
             self.items_table.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
             self.items_table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         except Exception:
             pass
 
-        grp_stats_layout.addWidget(self.stats_table)
-
-        # Adjust stats table columns to fill available space proportionally
-        try:
-            self._adjust_stats_table_column_widths()
-        except Exception:
-            pass
-
-        right_layout.addWidget(grp_stats, stretch=1)
+        # Stats and the vectorized trends share the lower right area as tabs
+        self.stats_tabs = QTabWidget()
+        self.stats_tabs.addTab(grp_stats, "Статистика")
+        # The Trends tab is a placeholder until it is first opened
+        self.trends_view = None
+        self._trends_tab = QWidget()
+        QVBoxLayout(self._trends_tab).setContentsMargins(0, 0, 0, 0)
+        self.stats_tabs.addTab(self._trends_tab, "Тренды")
+        self.stats_tabs.currentChanged.connect(self._on_stats_tab_changed)
+        right_layout.addWidget(self.stats_tabs, stretch=1)
         
         # Right pane ~40% (use 2 in the 3:2 stretch ratio)
         content_layout.addLayout(right_layout, stretch=2)
@@ -729,6 +803,71 @@ class GovernorCabinetWindow(QMainWindow):
         except Exception:
             pass
 
+    def _ensure_stats_view(self):
+        """Build the stats search box and table into the stats group (once)."""
+        if self.stats_table is not None:
+            return
+        with self.startup.stage('stats_view'):
+            layout = self._grp_stats_layout
+            # Search input above the stats table
+            self.stats_search = QLineEdit()
+            self.stats_search.setPlaceholderText("Поиск по предмету")
+            self.stats_search.setStyleSheet("""
+                QLineEdit { background-color: white; color: black; border: 1px solid #555555; border-radius: 4px; padding: 4px; }
+            """)
+            self.stats_search.setMaximumHeight(30)
+            self.stats_search.textChanged.connect(lambda txt: self.recompute.mark(STATS))
+            layout.addWidget(self.stats_search)
+
+            # Stats table: columns - Item, Qty, Avg price per unit, Total sum.
+            # A view over the ItemStats aggregate; the search box filters through the proxy.
+            self.stats_model = ItemStatsModel(self.item_stats, self)
+            self.stats_proxy = ItemStatsFilterModel(self)
+            self.stats_proxy.setSourceModel(self.stats_model)
+            self.stats_table = QTableView()
+            self.stats_table.setModel(self.stats_proxy)
+            self.stats_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+            # Cells are painted by the delegate from the model's cached strings
+            self.stats_delegate = ItemStatsDelegate(self.stats_table)
+            self.stats_table.setItemDelegate(self.stats_delegate)
+            # Fixed sections: column widths are set by _adjust_stats_table_column_widths
+            # when the viewport width changes, and rows never ask for a size hint
+            self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            self.stats_table.horizontalHeader().setStretchLastSection(True)
+            self.stats_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+
+            self.stats_table.setShowGrid(False)
+            self.stats_table.verticalHeader().setVisible(False)
+            self.stats_table.verticalHeader().setDefaultSectionSize(40)
+            self.stats_table.horizontalHeader().setDefaultSectionSize(40)
+            self.stats_table.horizontalHeader().setMinimumSectionSize(40)
+            # Avoid horizontal scrollbar and allow table to expand horizontally within the layout
+            try:
+                self.stats_table.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+                self.stats_table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            except Exception:
+                pass
+
+            layout.addWidget(self.stats_table)
+
+            # Adjust stats table columns to fill available space proportionally
+            try:
+                self._adjust_stats_table_column_widths()
+            except Exception:
+                pass
+
+    def _ensure_trends_view(self):
+        if self.trends_view is None:
+            with self.startup.stage('trends_view'):
+                self.trends_view = TrendsWidget()
+                self._trends_tab.layout().addWidget(self.trends_view)
+        return self.trends_view
+
+    def _on_stats_tab_changed(self, index):
+        if self.stats_tabs.widget(index) is self._trends_tab:
+            self._ensure_trends_view()
+        self.recompute.mark(TRENDS)
+
     def return_to_launcher(self):
         if self.sync_worker:
             self.sync_worker.stop()
@@ -750,169 +889,62 @@ class GovernorCabinetWindow(QMainWindow):
         pass
 
     def init_trans_table(self):
-        self.trans_table.setRowCount(0)
-        self.add_plus_row()
-
-    def add_plus_row(self):
-        row_idx = self.trans_table.rowCount()
-        self.trans_table.insertRow(row_idx)
-        self.trans_table.setRowHeight(row_idx, 50) 
-        
-        btn_add = create_plus_button(self.add_new_transaction_row)
-        
-        self.trans_table.setSpan(row_idx, 0, 1, 8)
-        self.trans_table.setCellWidget(row_idx, 0, btn_add)
+        self.trans_store.clear()
 
     def add_new_transaction_row(self):
-        # Prevent intermediate repaints to avoid flicker of qty column when widgets are added
+        """Append an empty expense dated today; the model change triggers totals/sync/stats."""
+        row = self.trans_store.append(day=today_day())
         try:
-            self.trans_table.setUpdatesEnabled(False)
+            self.trans_table.scrollTo(self.trans_model.index(self.trans_model.view_row(row), COL_ITEM))
         except Exception:
             pass
+        return row
 
-        plus_row_index = self.trans_table.rowCount() - 1
-        self.trans_table.insertRow(plus_row_index)
-        row = plus_row_index
-        
-        self.trans_table.setRowHeight(row, 45)
-        
-        num_item = QTableWidgetItem(str(row + 1))
-        num_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        num_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
-        num_item.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        self.trans_table.setItem(row, 0, num_item)
-
-        # Use helper for date button
-        container_date = create_date_button(QDate.currentDate().toString("dd.MM.yyyy"), self.show_calendar_popup)
-        self.trans_table.setCellWidget(row, 1, container_date)
-
-        # Type button (starts as Expense '-')
-        type_btn = QPushButton("-")
-        type_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        type_btn.setProperty("is_income", False)
-        # slightly larger to comfortably show +/-, with bold font
-        type_btn.setFixedSize(28, 28)
-        type_btn.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
-        # Default style for Expense
-        type_btn.setStyleSheet("""
-            QPushButton { 
-                background-color: #ff5555; 
-                color: #ffffff; 
-                border-radius: 4px; 
-                font-weight: bold; 
-                font-size: 16px; 
-                border: none; 
-                padding: 0px; 
-            }
-        """)
-        
-        container_type = QFrame()
-        layout_type = QVBoxLayout(container_type)
-        layout_type.setContentsMargins(0,0,0,0)
-        layout_type.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout_type.addWidget(type_btn)
-        
-        self.trans_table.setCellWidget(row, 2, container_type)
-
-        name_edit = QLineEdit()
-        name_edit.setPlaceholderText("Название предмета")
-        name_edit.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
-        # Make text bold and ensure proper height so it doesn't overflow the cell
-        name_edit.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        name_edit.setStyleSheet("""
-            QLineEdit { background-color: white; color: black; border-radius: 6px; padding: 4px 8px; border: 1px solid #555; }
-            QLineEdit:focus { border: 2px solid #4aa3df; }
-        """)
-        name_edit.setMinimumHeight(30)
-        
-        container_item = QWidget()
-        layout_item = QHBoxLayout(container_item)
-        # Reduce vertical margins to avoid pushing the edit below its cell area
-        layout_item.setContentsMargins(4, 0, 4, 0)
-        layout_item.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
-        name_edit.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        layout_item.addWidget(name_edit)
-        self.trans_table.setCellWidget(row, 3, container_item)
-
-        # Track active editor and ensure popup shows on request
-        try:
-            name_edit.setProperty('trans_row', int(row))
-            self._active_item_editor = name_edit
+    def _wire_item_editor(self, le, row):
+        """Hook an item-name editor opened by the delegate into the suggestions popup."""
+        try:
+            self._active_item_editor = le
         except Exception:
             pass
 
         # Use event filter or signal to trigger popup
+        # The row is looked up through the delegate's editor registry on every
+        # call, so it stays right when rows above are inserted or deleted
+        row_of = self.trans_delegate.editor_row
         try:
-            name_edit.textEdited.connect(lambda txt, r=row, le=name_edit: self._on_item_editor_interaction(r, le))
+            le.textEdited.connect(lambda txt, e=le: self._on_item_editor_interaction(row_of(e), e))
         except Exception:
             pass
-        
+
         # Override focusInEvent on instance
         try:
-            old_focus = name_edit.focusInEvent
+            old_focus = le.focusInEvent
         except Exception:
             old_focus = None
-            
-        def _focus_in_mk2(ev, le=name_edit, r=row):
+
+        def _focus_in_mk2(ev, e=le):
             try:
                 if callable(old_focus): old_focus(ev)
-                self._on_item_editor_interaction(r, le)
+                self._on_item_editor_interaction(row_of(e), e)
             except Exception:
                 pass
-        name_edit.focusInEvent = _focus_in_mk2
-
-        # Removing installation of the Governor as an event filter on the line edit.
-        # The global popup installs its own app-level filter; installing the window
-        # as an event filter on each editor caused focus/key handling oddities
-        # (prevented paste/focus-out in some configurations). Do not install here.
-        # name_edit.installEventFilter(self)
-        name_edit.textChanged.connect(lambda txt, r=row: self.on_item_text_changed(r, txt))
+        le.focusInEvent = _focus_in_mk2
+
+        le.textChanged.connect(lambda txt, e=le: self.on_item_text_changed(row_of(e), txt))
         # Adjust name column width when user types longer names so the name column
         # grows (at expense of price/sum) but keeps a sensible minimum.
         try:
-            name_edit.textChanged.connect(lambda txt, le=name_edit: self._adjust_name_column_for_editor(le))
+            le.textChanged.connect(lambda txt, e=le: self._adjust_name_column_for_editor(e))
         except Exception:
             pass
-        
-        # Use helpers for Qty and Price spinboxes
-        qty_block = create_centered_spinbox(value=0, min_val=-999999, max_val=999999, on_change=lambda: self.recalc_row(row))
-        self.trans_table.setCellWidget(row, 4, qty_block)
-
-        container_price = create_centered_spinbox(value=0, min_val=-1000000000, max_val=1000000000, on_change=lambda: self.recalc_row(row))
-        self.trans_table.setCellWidget(row, 5, container_price)
-
-        sum_item = QTableWidgetItem("0")
-        sum_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        sum_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
-        sum_item.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-        self.trans_table.setItem(row, 6, sum_item)
 
-        type_btn.clicked.connect(lambda checked, r=row, btn=type_btn: self.toggle_type(r, btn))
-
-        # Use helper for delete button
-        container_del = create_delete_button(lambda btn: self.delete_row_by_widget(btn))
-        
-        # Ensure button takes up full space and passes clicks if needed, 
-        # but typically button handles click. We want hover on container.
-        # So we make button transparent and layout stretch.
-        # Delete button container
-        self.trans_table.setCellWidget(row, 7, container_del)
-
-        # Apply initial type state to ensure correct qty visibility
-        self._apply_type_state(row, False)
-
-        self.update_row_numbers()
-        self.recalc_row(row)
-        # Trigger sync on change
-        self.sync_all_data()
-        self.update_stats_table()
-
-        # Re-enable updates
-        try:
-            self.trans_table.setUpdatesEnabled(True)
-            self.trans_table.viewport().update()
-        except Exception:
-            pass
+    def _on_transactions_changed(self, *args):
+        """Any edit/insert/delete in the transactions model: totals and the sync
+        payload are stale. The item stats follow the store on their own (ItemStats).
+        """
+        if getattr(self, '_importing', False):
+            return
+        self.recompute.mark(TOTALS, TRENDS, SYNC)
 
     def _on_item_editor_interaction(self, row, le):
         """Called on focus/click/typing to show suggestions immediately (minimal).
@@ -948,8 +980,14 @@ class GovernorCabinetWindow(QMainWindow):
             except Exception:
                 pass
 
-            # Remember active editor so selection callback can reference it
+            # Remember active editor (and its stable row id, which outlives the
+            # editor and survives row inserts/deletes) so the selection callback
+            # can reference it
             self._popup_active_editor = le
+            rid = self.trans_delegate.editor_row_id(le)
+            if rid is None and row is not None and 0 <= row < len(self.trans_store):
+                rid = self.trans_store.ids[row]
+            self._popup_active_row_id = rid
 
             # Store pending parameters for debounced processing
             try:
@@ -1050,13 +1088,13 @@ class GovernorCabinetWindow(QMainWindow):
                 pass
 
             # Acquire (or lazily create) the popup instance
-            popup_obj = getattr(self, '_suggestions_popup', None)
+            popup_obj = self._ensure_suggestions_popup()
             try:
                 print(f"[Governor] popup_obj repr={repr(popup_obj)} type={type(popup_obj)} id={(id(popup_obj) if popup_obj is not None else None)}")
             except Exception:
                 pass
 
-            # If popup not yet created, abort (do not attempt lazy creation here)
+            # If the popup could not be created, abort
             if popup_obj is None:
                 try:
                     print('[Governor] suggestions popup not initialized -> abort show')
@@ -1106,16 +1144,15 @@ class GovernorCabinetWindow(QMainWindow):
             except Exception:
                 pass
 
-            # Source suggestions from items_table (right-hand table)
+            # Ranked matches from the item catalog (right-hand table)
+            query = (text or '').strip().lower()
             try:
-                items_map = self._items_map()
-                items = list(items_map.keys())
-                print(f"[Governor] items_map read, total items={len(items)}")
+                filtered = self.item_suggester.suggest(query)
             except Exception as e:
-                print(f"[Governor] Failed to read items_map: {e}")
-                items = []
+                print(f"[Governor] Failed to read item suggestions: {e}")
+                filtered = []
 
-            if not items:
+            if not filtered and not query:
                 try:
                     print("[Governor] No items available -> hiding popup")
                 except Exception:
@@ -1126,12 +1163,6 @@ class GovernorCabinetWindow(QMainWindow):
                     pass
                 return
 
-            query = (text or '').strip().lower()
-            if not query:
-                filtered = items.copy()
-            else:
-                filtered = [it for it in items if query in it.lower()]
-
             try:
                 print(f"[Governor] filter query='{query}' -> {len(filtered)} matches")
             except Exception:
@@ -1214,29 +1245,30 @@ class GovernorCabinetWindow(QMainWindow):
             except Exception:
                 pass
 
+            rid = getattr(self, '_popup_active_row_id', None)
+            row = self.trans_store.row_of(rid) if rid is not None else -1
             if isinstance(le, QLineEdit):
+                # The delegate may already have closed (deleted) the editor
                 try:
                     le.setText(text)
                     print("[Governor] Set editor text from suggestion")
                 except Exception as e:
                     print(f"[Governor] Failed to set editor text: {e}")
+                editor_row = self.trans_delegate.editor_row(le)
+                if editor_row >= 0:
+                    row = editor_row
+                print(f"[Governor] Editor row={row}")
+
+            if row >= 0:
                 try:
-                    row_prop = le.property('trans_row')
-                    row = int(row_prop) if row_prop is not None else None
-                    print(f"[Governor] Editor trans_row property={row}")
+                    self.trans_store.set_field(row, 'item', text)
+                    self.on_item_selected(row, text)
+                    print("[Governor] on_item_selected called after suggestion pick")
                 except Exception as e:
-                    print(f"[Governor] Failed to get trans_row: {e}")
-                    row = None
-
-                if row is not None:
-                    try:
-                        self.on_item_selected(row, text)
-                        print("[Governor] on_item_selected called after suggestion pick")
-                    except Exception as e:
-                        print(f"[Governor] on_item_selected raised: {e}")
+                    print(f"[Governor] on_item_selected raised: {e}")
             else:
                 try:
-                    print("[Governor] Active editor is not a QLineEdit - cannot apply suggestion")
+                    print("[Governor] No active transaction row - cannot apply suggestion")
                 except Exception:
                     pass
         except Exception as e:
@@ -1292,291 +1324,45 @@ class GovernorCabinetWindow(QMainWindow):
         except Exception:
             pass
 
-    def toggle_type(self, row, btn):
-        # Toggle type state and reuse _apply_type_state to keep visuals consistent
-        try:
-            is_income = bool(btn.property("is_income"))
-        except Exception:
-            is_income = False
-
-        new_state = not is_income
-        try:
-            btn.setProperty("is_income", bool(new_state))
-        except Exception:
-            pass
-
-        self._apply_type_state(row, new_state, force_update=True)
-        self.recalc_row(row)
-        self.sync_all_data()
-        self.update_stats_table()
-
-    def _ensure_type_button(self, row, is_income=False):
-        """Ensure the type QPushButton exists for given row. Create and wire toggle handler if missing."""
-        try:
-            container = self.trans_table.cellWidget(row, 2)
-            if container:
-                btn = container.findChild(QPushButton)
-                if btn:
-                    btn.setProperty('is_income', bool(is_income))
-                    # rewire click handler to guarantee toggling works after import
-                    try:
-                        btn.clicked.disconnect()
-                    except Exception:
-                        pass
-                    btn.clicked.connect(lambda checked=False, r=row, b=btn: self.toggle_type(r, b))
-                    self._apply_type_state(row, bool(is_income), force_update=True)
-                    return
-        except Exception:
-            pass
-
-        type_btn = QPushButton('+' if is_income else '-')
-        type_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        type_btn.setProperty('is_income', bool(is_income))
-        type_btn.setFixedSize(30, 30)
-        type_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
-        type_btn.clicked.connect(lambda checked=False, r=row, b=type_btn: self.toggle_type(r, b))
-
-        container_type = QFrame()
-        layout_type = QVBoxLayout(container_type)
-        layout_type.setContentsMargins(0,0,0,0)
-        layout_type.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout_type.addWidget(type_btn)
-
-        self.trans_table.setCellWidget(row, 2, container_type)
-        self._apply_type_state(row, bool(is_income), force_update=True)
-
-    def update_row_numbers(self):
-        try:
-            # Re-number visible transaction rows (exclude the trailing add-row)
-            for r in range(self.trans_table.rowCount() - 1):
-                try:
-                    it = self.trans_table.item(r, 0)
-                    txt = str(r + 1)
-                    if it is None:
-                        it = QTableWidgetItem(txt)
-                        it.setFlags(Qt.ItemFlag.ItemIsEnabled)
-                        it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                        self.trans_table.setItem(r, 0, it)
-                    else:
-                        it.setText(txt)
-
-                    # Re-apply type state to ensure correct qty visibility for income rows
-                    # IMPORTANT: do NOT force recreation here — forcing would recreate
-                    # the qty widget and reset its value to 0. Use a non-forcing
-                    # update so existing Qty values are preserved.
-                    cont_type = self.trans_table.cellWidget(r, 2)
-                    is_income = False
-                    if cont_type:
-                        btn = cont_type.findChild(QPushButton)
-                        if btn:
-                            is_income = bool(btn.property('is_income'))
-                    try:
-                        self._apply_type_state(r, is_income, force_update=False)
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-    def delete_row_by_widget(self, sender_widget):
-        row_to_delete = -1
-        for r in range(self.trans_table.rowCount()):
-            container = self.trans_table.cellWidget(r, 7)
-            if container:
-                if sender_widget in container.findChildren(QPushButton):
-                    row_to_delete = r
-                    break
-
-        if row_to_delete != -1:
-            try:
-                self.trans_table.setUpdatesEnabled(False)
-            except Exception:
-                pass
-
-            self.trans_table.removeRow(row_to_delete)
-            self.update_row_numbers()
-            self.sync_all_data() # Sync on delete transaction
-            self.update_stats_table()
-
-            try:
-                self.trans_table.setUpdatesEnabled(True)
-                self.trans_table.viewport().update()
-            except Exception:
-                pass
-
-    def recalc_row(self, row):
-        try:
-            if not hasattr(self, 'trans_table'):
-                return
-
-            # If called by signal, find the row - use object sender to be safe
-            target_row = row
-            sender = self.sender()
-            
-            # If recalculating from signal
-            if sender and isinstance(sender, QAbstractSpinBox):
-                 # Find which row this sender belongs to robustly
-                found_sender = False
-                for r in range(self.trans_table.rowCount()):
-                    # Check columns 4 (Qty) and 5 (Price)
-                    # The cell widget is a container, look inside it
-                    container_qty = self.trans_table.cellWidget(r, 4)
-                    container_price = self.trans_table.cellWidget(r, 5)
-                    
-                    if container_qty and sender in container_qty.findChildren(QAbstractSpinBox):
-                        target_row = r
-                        found_sender = True
-                        break
-                    if container_price and sender in container_price.findChildren(QAbstractSpinBox):
-                        target_row = r
-                        found_sender = True
-                        break
-                
-                if found_sender:
-                     target_row = r 
-            
-            # Check logic based on Type
-            container_type = self.trans_table.cellWidget(target_row, 2)
-            is_income = False
-            if container_type:
-                 btn = container_type.findChild(QPushButton)
-                 if btn:
-                     try:
-                        is_income = bool(btn.property("is_income"))
-                     except Exception:
-                        pass
-
-            container_qty = self.trans_table.cellWidget(target_row, 4)
-            container_price = self.trans_table.cellWidget(target_row, 5)
-            sum_item = self.trans_table.item(target_row, 6) 
-            
-            price = 0
-            if container_price:
-                price_widgets = container_price.findChildren(QAbstractSpinBox)
-                # Look for spinning box inside container
-                if price_widgets:
-                    price = price_widgets[0].value()
-
-            if is_income:
-                # Income: Sum = Price (Quantity ignored/hidden); show plus sign
-                total = int(price)
-            else:
-                # Expense: Sum = Price * Qty and should be negative
-                qty = 0
-                if container_qty:
-                    qty_widgets = container_qty.findChildren(QAbstractSpinBox)
-                    if qty_widgets:
-                        qty = qty_widgets[0].value()
-                total = int(qty * price) * -1
-
-            if sum_item:
-                sum_item.setText(_format_display_amount(total))
-        except Exception:
-            pass
-
-        # Update header totals
+    def toggle_type(self, row):
         try:
-            self.update_totals()
+            new_state = not self.trans_store.income[row]
         except Exception:
-            pass
+            return
+        if new_state:
+            self.trans_store.update(row, is_income=True)
+        else:
+            # Quantity is not used by income rows; an expense starts again from 0
+            self.trans_store.update(row, is_income=False, qty=0)
 
-        # Trigger sync on change
-        self.sync_all_data()
-        self.update_stats_table()
+    def delete_transaction_row(self, row):
+        self.trans_store.remove(row)
 
     def delete_transaction(self):
         pass
 
     def init_items_table(self):
-        self.items_table.setRowCount(0)
-        self.add_item_plus_row()
-
-    def add_item_plus_row(self):
-        row_idx = self.items_table.rowCount()
-        self.items_table.insertRow(row_idx)
-        self.items_table.setRowHeight(row_idx, 50) 
-        
-        btn_add = create_plus_button(self.add_new_item_row)
-        
-        self.items_table.setSpan(row_idx, 0, 1, 3) # Span all 3 columns
-        self.items_table.setCellWidget(row_idx, 0, btn_add)
+        self.item_catalog.clear()
 
     def add_new_item_row(self):
-        plus_row_index = self.items_table.rowCount() - 1 
-        try:
-            self.items_table.setUpdatesEnabled(False)
-        except Exception:
-            pass
-        self.items_table.insertRow(plus_row_index)
-        row = plus_row_index 
-        self.items_table.setRowHeight(row, 45)
-        
-        # 0. Item Name (Styled QLineEdit)
-        name_edit = QLineEdit()
-        name_edit.setPlaceholderText("Название")
-        name_edit.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        # Apply style to match QSpinBox (dark background, white text, etc.)
-        name_edit.setStyleSheet("""
-            QLineEdit {
-                background-color: white;
-                color: black;
-                border: 1px solid #555555;
-                border-radius: 4px; /* Common QSpinBox radius */
-                font-weight: bold; /* Often spinboxes are bold in this theme */
-                padding: 2px;
-            }
-        """)
-        
-        container_name = QWidget()
-        layout_name = QHBoxLayout(container_name)
-        layout_name.setContentsMargins(5, 5, 5, 5)
-        layout_name.addWidget(name_edit)
-        self.items_table.setCellWidget(row, 0, container_name)
-
-        # 1. Base Price (Integer SpinBox)
-        # Use helper for centered spinbox
-        container_price = create_centered_spinbox(value=0, prefix="$", min_val=0, max_val=1000000000, 
-                                                  on_change=lambda: (self.sync_all_data(), self.update_stats_table()))
-        self.items_table.setCellWidget(row, 1, container_price)
-
-        # 2. Delete Button
-        # Use helper for delete button
-        container_del = create_delete_button(lambda btn: self.delete_item_row_by_widget(btn))
-        
-        self.items_table.setCellWidget(row, 2, container_del)
-        
-        # Connect signals for immediate sync and stats refresh
-        name_edit.textChanged.connect(lambda txt: (self.sync_all_data(), self.update_stats_table()))
-        
-        self.sync_all_data() # Sync on adding new item row
-        # Also ensure stats reflect the new empty row
+        """Append an empty item; the model change triggers sync."""
+        row = self.item_catalog.append()
         try:
-            self.update_stats_table()
+            self.items_table.scrollTo(self.items_model.index(row, 0))
         except Exception:
             pass
+        return row
 
-    def delete_item_row_by_widget(self, widget):
-        # find parent row
-        pos = widget.mapToGlobal(QPoint(0,0))
-        index = self.items_table.indexAt(self.items_table.viewport().mapFromGlobal(pos))
-        if index.isValid():
-            try:
-                self.items_table.setUpdatesEnabled(False)
-            except Exception:
-                pass
-            self.items_table.removeRow(index.row())
-            self.sync_all_data() # Sync on delete item row
-            try:
-                self.update_stats_table()
-            except Exception:
-                pass
-            try:
-                self.items_table.setUpdatesEnabled(True)
-                self.items_table.viewport().update()
-            except Exception:
-                pass
+    def delete_item_row(self, row):
+        self.item_catalog.remove(row)
+
+    def _on_items_changed(self, *args):
+        """Any edit/insert/delete in the items model: the objects sheet payload is
+        stale. Item editors query the catalog through item_suggester directly.
+        """
+        if getattr(self, '_importing', False):
+            return
+        self.recompute.mark(SYNC)
 
     def setup_auto_sync(self):
         """Previously this enqueued a full sync every 10 seconds.
@@ -1588,30 +1374,32 @@ class GovernorCabinetWindow(QMainWindow):
         return
 
     def sync_all_data(self):
-        """Called on local changes. Enqueue export using a background thread."""
+        """Called on local changes. Enqueue export using a background thread.
+        The payload is collected from the stores when the batch timer fires, so
+        a burst of edits scrapes them once.
+        """
         # Do not export while applying/importing remote data
         if getattr(self, '_importing', False):
             return
 
-        try:
-            stats_data = self.collect_stats_data()
-            objects_data = self.collect_objects_data()
+        self._sync_payload_stale = True
+        self._start_sync_timer()
 
-            payload = {'stats': stats_data, 'objects': objects_data}
-            # Enqueue payload to be flushed in a single batched request to reduce API calls
-            self._enqueue_sync_payload(payload)
-        except Exception as e:
-            print(f"Failed to enqueue export: {e}")
+    def _collect_sync_payload(self) -> dict:
+        return {'stats': self.collect_stats_data(), 'objects': self.collect_objects_data()}
 
-    def _enqueue_sync_payload(self, payload: dict):
+    def _enqueue_sync_payload(self, payload: dict, seq=None):
         """Merge/queue payload and (re)start a short timer to batch multiple rapid changes.
         Uses self._sync_interval_ms (ms) default 3000ms. On quota errors the payload
         will be retried with exponential backoff.
         """
-        try:
-            # store latest payload (overwrite to avoid excessive history)
-            self._pending_payload = payload
+        # store latest payload (overwrite to avoid excessive history)
+        self._pending_payload = payload
+        self._pending_payload_seq = seq
+        self._start_sync_timer()
 
+    def _start_sync_timer(self):
+        try:
             # init timer if needed
             if not hasattr(self, '_sync_timer') or self._sync_timer is None:
                 self._sync_timer = QTimer(self)
@@ -1626,24 +1414,32 @@ class GovernorCabinetWindow(QMainWindow):
     def _flush_sync_queue(self):
         """Send the accumulated payload in one background thread."""
         try:
+            # Local edits since the last flush supersede a payload queued for retry
+            if getattr(self, '_sync_payload_stale', False):
+                self._sync_payload_stale = False
+                self._pending_payload = self._collect_sync_payload()
+                self._pending_payload_seq = self.autosave.seq
             payload = getattr(self, '_pending_payload', None)
             if not payload:
                 return
+            seq = getattr(self, '_pending_payload_seq', None)
             # clear pending to allow new enqueues
             self._pending_payload = None
 
             # Start sync thread for the combined payload
             th = GoogleSheetSyncThread(self.google_service, self.spreadsheet_id, payload, parent=self)
             # handle errors: detect 429/quota and requeue with backoff
-            th.error.connect(lambda m, p=payload: self._on_sync_error(m, p))
-            # on success clear backoff counter
-            th.finished.connect(lambda: setattr(self, '_sync_backoff_seconds', 0))
+            th.error.connect(lambda m, p=payload, q=seq: self._on_sync_error(m, p, q))
+            # on success clear backoff counter (`finished` also fires after an error)
+            th.finished_ok.connect(lambda: setattr(self, '_sync_backoff_seconds', 0))
+            # the local log no longer counts these edits as pending
+            th.finished_ok.connect(lambda q=seq: self.autosave.mark_synced(q))
             th.start()
             self._last_sync_thread = th
         except Exception as e:
             print(f"Failed to flush sync queue: {e}")
 
-    def _on_sync_error(self, msg, payload):
+    def _on_sync_error(self, msg, payload, seq=None):
         """Handle sync errors from the background thread. Retries on quota errors with exponential backoff."""
         try:
             text = str(msg)
@@ -1657,184 +1453,38 @@ class GovernorCabinetWindow(QMainWindow):
                 backoff = min(backoff, 600)
                 self._sync_backoff_seconds = backoff
                 print(f"Quota hit: retrying in {backoff}s")
-                QTimer.singleShot(int(backoff * 1000), lambda p=payload: self._enqueue_sync_payload(p))
+                QTimer.singleShot(int(backoff * 1000), lambda p=payload, q=seq: self._enqueue_sync_payload(p, q))
             else:
                 # non-quota error: try short retry once
                 print(f"Sync error, retrying in 3s: {text}")
-                QTimer.singleShot(3000, lambda p=payload: self._enqueue_sync_payload(p))
+                QTimer.singleShot(3000, lambda p=payload, q=seq: self._enqueue_sync_payload(p, q))
         except Exception as e:
             print(f"Error handling sync error: {e}")
 
     def collect_stats_data(self):
-        """Scrapes data from trans_table (stats)."""
+        """Builds the stats sheet rows from the transaction store arrays."""
         data = []
         # Headers (matches your column structure roughly or define new)
         headers = ["#", "Date", "Type", "Item", "Qty", "Price", "Sum"]
         data.append(headers)
-        
-        for r in range(self.trans_table.rowCount() - 1): # Last row is + button
-            row_data = [] 
-
-            # 0. Num
-            num_item = self.trans_table.item(r, 0)
-            row_data.append(num_item.text() if num_item else str(r + 1))
-            
-            # 1. Date
-            w_date_container = self.trans_table.cellWidget(r, 1)
-            date_text = ""
-            if w_date_container:
-                # Look for any QPushButton (date button) inside the container
-                btns = w_date_container.findChildren(QPushButton)
-                if btns:
-                    date_text = btns[0].text()
-                else:
-                    # Maybe a DateEditClickable exists
-                    de = w_date_container.findChild(DateEditClickable)
-                    if de:
-                        date_text = de.date().toString("dd.MM.yyyy")
-            row_data.append(date_text)
-
-            # 2. Type (Income/Expense)
-            container_type = self.trans_table.cellWidget(r, 2)
-            type_text = ""
-            is_income = False
-            if container_type:
-                btn = container_type.findChild(QPushButton)
-                if btn:
-                    is_income = bool(btn.property("is_income"))
-                    # Export standardized values to avoid locale mismatch
-                    type_text = "Income" if is_income else "Expense"
-            row_data.append(type_text)
-
-            # 3. Item Name (Service/Good) - be robust: look for combo, editable lineedit inside combo, or a plain QLineEdit
-            w_item_container = self.trans_table.cellWidget(r, 3)
-            item_text = ""
-            if w_item_container:
-                # Prefer any QLineEdit found first (editable combos expose lineEdit)
-                le = w_item_container.findChild(QLineEdit)
-                if le and le.text():
-                    item_text = le.text()
-                else:
-                    # Look for any combo box and use currentText
-                    combo = w_item_container.findChild(QComboBox)
-                    if combo:
-                        # If editable, prefer its lineEdit
-                        try:
-                            if combo.isEditable():
-                                cle = combo.lineEdit()
-                                if cle and cle.text():
-                                    item_text = cle.text()
-                                else:
-                                    item_text = combo.currentText()
-                            else:
-                                item_text = combo.currentText()
-                        except Exception:
-                            item_text = combo.currentText()
-            row_data.append(item_text)
 
-            # 4. Qty
-            w_qty = self.trans_table.cellWidget(r, 4)
-            # If QTY widget is hidden (Income), we treat it as 1 for export stats
-            
-            qty = 0
-            if is_income:
-                qty = 1
-            else:
-                if isinstance(w_qty, QWidget): 
-                    spin = w_qty.findChild(QSpinBox) or w_qty.findChild(QDoubleSpinBox) or w_qty.findChild(NoScrollSpinBox)
-                    if spin: qty = spin.value()
-                
-            w_sum = self.trans_table.item(r, 6)
-            # Parse displayed sum to plain number for export
-            sum_val = 0
-            if w_sum:
-                sum_val = _parse_display_amount(w_sum.text())
-
-            row_data.append(qty)
-
-            # 5. Price
-            w_price_container = self.trans_table.cellWidget(r, 5)
-            price_val = 0
-            if w_price_container:
-                 spin = w_price_container.findChild(QSpinBox)
-                 if spin:
-                     price_val = spin.value()
-            row_data.append(price_val)
-
-            # 6. Sum
-            row_data.append(str(sum_val))
-            
-            data.append(row_data)
+        s = self.trans_store
+        names = s.item_names
+        rows = zip(s.day, s.income, s.item_id, s.qty, s.price, s.total)
+        for r, (day, inc, iid, qty, price, total) in enumerate(rows, 1):
+            # Export standardized type values to avoid locale mismatch.
+            # Income has no quantity; it is exported as 1.
+            data.append([str(r), day_to_date(day), "Income" if inc else "Expense", names[iid],
+                         1 if inc else qty, price, str(total)])
         return data
 
     def collect_objects_data(self):
-        """Scrapes data from items_table (objects)."""
+        """Builds the objects sheet rows from the item catalog."""
         data = []
         # Headers should match sheet expectation
         headers = ["Item Name", "Base Price"]
         data.append(headers)
-        
-        # Iterating up to rowCount() - 1 because the last row is the "+" button
-        for r in range(self.items_table.rowCount() - 1): 
-            row_data = [] 
-            
-            # 0. Name
-            w_name_container = self.items_table.cellWidget(r, 0)
-            name_text = ""
-            if w_name_container:
-                # Prefer direct QLineEdit
-                le = w_name_container.findChild(QLineEdit)
-                if le:
-                    name_text = le.text()
-                else:
-                    # Fallback: any widget with text() like QPushButton
-                    btns = w_name_container.findChildren(QPushButton)
-                    if btns:
-                        name_text = btns[0].text()
-            row_data.append(name_text)
-                
-            # 1. Price
-            w_price_container = self.items_table.cellWidget(r, 1)
-            price_val = 0
-            if w_price_container:
-                # Prefer NoScrollSpinBox or any QSpinBox/QDoubleSpinBox
-                spin = w_price_container.findChild(NoScrollSpinBox)
-                if not spin:
-                    spin = w_price_container.findChild(QSpinBox)
-                if not spin:
-                    spin = w_price_container.findChild(QDoubleSpinBox)
-                if not spin:
-                    spin = w_price_container.findChild(NoScrollDoubleSpinBox)
-                if spin:
-                    try:
-                        price_val = spin.value()
-                    except Exception:
-                        price_val = 0
-                else:
-                    # Fallback: check any child with value() or text()
-                    for child in w_price_container.findChildren(QWidget):
-                        try:
-                            val_fn = getattr(child, 'value', None)
-                            if callable(val_fn):
-                                v = val_fn()
-                                try:
-                                    price_val = int(v)
-                                    break
-                                except Exception:
-                                    continue
-                            txt_fn = getattr(child, 'text', None)
-                            if callable(txt_fn):
-                                s = txt_fn()
-                                if isinstance(s, str):
-                                    s = s.replace('$', '').strip()
-                                    if s:
-                                        price_val = int(float(s))
-                                        break
-                        except Exception:
-                            continue
-                 
-            row_data.append(price_val)
-            data.append(row_data)
+        data.extend(self.item_catalog.rows())
         return data
 
     def handle_imported_data(self, fetched):
@@ -1844,20 +1494,7 @@ class GovernorCabinetWindow(QMainWindow):
 
             # Apply objects sheet to items_table
             if 'objects' in fetched:
-                self.items_table.setRowCount(0)  # Clear existing rows
-                for row in fetched['objects'][1:]:  # Skip header row
-                    self.add_new_item_row()
-                    last_row = self.items_table.rowCount() - 2  # Last data row (before + row)
-                    w_name_container = self.items_table.cellWidget(last_row, 0)
-                    w_price_container = self.items_table.cellWidget(last_row, 1)
-                    if w_name_container:
-                        le = w_name_container.findChild(QLineEdit)
-                        if le:
-                            le.setText(row[0])
-                    if w_price_container:
-                        spin = w_price_container.findChild(QSpinBox)
-                        if spin:
-                            spin.setValue(int(row[1]))
+                self._apply_imported_items(parse_objects_grid(fetched['objects']))
 
             # Apply stats sheet to trans_table (if needed)
             # Example: self.apply_stats_data(fetched['stats'])
@@ -1881,170 +1518,31 @@ class GovernorCabinetWindow(QMainWindow):
             except Exception:
                 pass
 
-            # Apply objects sheet to items_table (replace content)
-            objs = fetched.get('objects')
-            if objs:
-                # First row may be headers
-                rows = objs[1:] if len(objs) > 1 else []
-                # Clear items_table and ensure '+' row exists
-                self.items_table.setRowCount(0)
-                self.add_item_plus_row()
-                # Recreate rows (each add_new_item_row inserts before the + row)
-                for r in rows:
-                    if not r: continue # Skip empty rows
-                    # Expecting [Item Name, Base Price]
-                    name = r[0] if len(r) > 0 else ""
-                    price = 0
-                    if len(r) > 1:
-                        try:
-                            price = int(float(r[1]))
-                        except Exception:
-                            price = 0
-                    # Add a new item row and populate
-                    self.add_new_item_row()
-                    # The newly added row is before the + row
-                    idx = self.items_table.rowCount() - 2
-                    c_name = self.items_table.cellWidget(idx, 0)
-                    if c_name:
-                        le = c_name.findChild(QLineEdit)
-                        if le:
-                            le.setText(name)
-                    c_price = self.items_table.cellWidget(idx, 1)
-                    if c_price:
-                        sp = c_price.findChild(QSpinBox)
-                        if sp:
-                            sp.setValue(price)
-
-            stats = fetched.get('stats')
-            if stats:
-                # Rows after header
-                rows = stats[1:] if len(stats) > 1 else []
-                # Use a looser check or just log to debug why it's skipping
+            # Grids are normally parsed by the load thread (parse_fetched);
+            # parse here only when they arrive raw
+            parsed = fetched.get('parsed')
+            if parsed is None:
+                parsed = parse_fetched(dict(fetched))['parsed']
+
+            # Apply objects sheet to items_table (only the rows that differ)
+            objs = parsed.get('objects')
+            if objs is not None:
+                self._apply_imported_items(objs)
+
+            ledger = parsed.get('stats')
+            if ledger is not None:
                 try:
-                     print(f"DEBUG: Processing stats with {len(rows)} rows from import.")
+                     print(f"DEBUG: Processing stats with {len(ledger)} rows from import.")
                 except Exception:
                      pass
 
-                # Clear transactions and add + row
-                self.trans_table.setRowCount(0)
-                self.add_plus_row()
-
-                def _normalize_type_to_income_flag(type_value: str, sum_value: str) -> bool:
-                    """Return True for income(+), False for expense(-), handling messy imports."""
-                    try:
-                        t = str(type_value or "").strip().lower()
-                        # common variants
-                        if t in ("+", "плюс", "plus", "income", "in", "i", "доход", "приход"):
-                            return True
-                        if t in ("-", "минус", "minus", "expense", "out", "o", "расход"):
-                            return False
-                        # if type is empty/unknown, infer from sum sign
-                        s = str(sum_value or "").strip()
-                        if s.startswith('+'):
-                            return True
-                        if s.startswith('-'):
-                            return False
-                        # if still unknown, default to expense (matches UI default)
-                        return False
-                    except Exception:
-                        return False
-
-                for r in rows:
-                    # Expecting header: [#, Date, Type, Item, Qty, Price, Sum]
-                    date_txt = r[1] if len(r) > 1 else ""
-                    type_txt = r[2] if len(r) > 2 else ""
-                    item_txt = r[3] if len(r) > 3 else ""
-                    try:
-                        qty_val = int(float(r[4])) if len(r) > 4 and r[4] != "" else 0
-                    except Exception:
-                        qty_val = 0
-                    try:
-                        price_val = int(float(r[5])) if len(r) > 5 and r[5] != "" else 0
-                    except Exception:
-                        price_val = 0
-                    sum_txt = r[6] if len(r) > 6 else "0"
-
-                    # Robust income detection
-                    is_income_flag = _normalize_type_to_income_flag(type_txt, sum_txt)
-
-                    self.add_new_transaction_row()
-                    idx = self.trans_table.rowCount() - 2
-
-                    # Ensure type button exists and is styled (fix missing +/-)
-                    self._ensure_type_button(idx, is_income_flag)
-                    self._apply_type_state(idx, is_income_flag, force_update=True)
-
-                    # Date button
-                    c_date = self.trans_table.cellWidget(idx, 1)
-                    if c_date:
-                        btns = c_date.findChildren(QPushButton)
-                        if btns:
-                            btns[0].setText(date_txt)
-
-                    # Item
-                    c_item = self.trans_table.cellWidget(idx, 3)
-                    if c_item:
-                        le = c_item.findChild(QLineEdit)
-                        if le:
-                            le.setText(item_txt)
-
-                    # Qty/Price - delegation to _apply_type_state handles visibility
-                    c_qty = self.trans_table.cellWidget(idx, 4)
-                    if c_qty:
-                        try:
-                            sp = c_qty.findChild(QAbstractSpinBox)
-                            if sp:
-                                sp.setValue(qty_val)
-                        except Exception:
-                            pass
+                self._apply_imported_ledger(ledger)
 
-                    c_price = self.trans_table.cellWidget(idx, 5)
-                    if c_price:
-                        try:
-                            sp = c_price.findChild(QAbstractSpinBox)
-                            if sp:
-                                sp.setValue(price_val)
-                        except Exception:
-                            pass
-
-                    # Sum
-                    item_sum = self.trans_table.item(idx, 6)
-                    if item_sum:
-                        try:
-                            parsed = _parse_display_amount(str(sum_txt))
-                        except Exception:
-                            parsed = 0
-                        if parsed == 0:
-                            parsed = int(price_val) if is_income_flag else (-int(qty_val) * int(price_val))
-                        item_sum.setText(_format_display_amount(parsed))
-                        item_sum.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-                        item_sum.setFlags(Qt.ItemFlag.ItemIsEnabled)
-
-                    self._ensure_delete_widget_for_row(idx)
-
-                # Force update all row type states to be safe
-                for r in range(self.trans_table.rowCount() - 1):
-                    # Re-apply state to ensure correct visibility
-                    c_type = self.trans_table.cellWidget(r, 2)
-                    is_inc = False
-                    if c_type:
-                        btn = c_type.findChild(QPushButton)
-                        if btn:
-                            is_inc = bool(btn.property("is_income"))
-                    # Do NOT force recreation here; preserve existing qty/spinbox values
-                    self._apply_type_state(r, is_inc, force_update=False)
-
-                # Recalculate sums and refresh combos after import
-                try:
-                    for r in range(self.trans_table.rowCount() - 1):
-                        try:
-                            self.recalc_row(r)
-                        except Exception:
-                            pass
-                    self.update_row_numbers()
-                    self.refresh_item_combos()
-                except Exception:
-                    pass
+            # The stores now match the sheets
+            try:
+                self.autosave.mark_synced()
+            except Exception:
+                pass
 
         except Exception as e:
             print(f"Failed to apply imported data: {e}")
@@ -2060,7 +1558,41 @@ class GovernorCabinetWindow(QMainWindow):
             except Exception:
                 pass
             self._importing = False
+            try:
+                self.update_totals()
+            except Exception:
+                pass
             self.update_stats_table()
+            self.recompute.mark(TRENDS)
+
+    def _apply_imported_items(self, objs):
+        """Patch the item catalog to the fetched (name, price) rows; reload on large changes."""
+        catalog = self.item_catalog
+        new_rows = [(str(name), int(price)) for name, price in objs]
+        result = None
+        if len(catalog):
+            result = patch_rows(catalog, catalog.row_tuples(), new_rows, ITEM_FIELDS)
+        if result is None:
+            catalog.load(new_rows)
+        elif any(result):
+            print(f"[Governor] items import patched: +{result[0]} ~{result[1]} -{result[2]}")
+
+    def _apply_imported_ledger(self, ledger):
+        """Patch the transaction store to the fetched ledger so only changed rows are
+        touched (scroll position, view order and open editors survive); a first
+        load or a large change replaces everything in one reset instead.
+        """
+        store = self.trans_store
+        result = None
+        if len(store):
+            new_rows = list(zip(ledger.day, ledger.income, ledger.items, ledger.qty, ledger.price))
+            # Income quantity is exported as 1 (collect_stats_data), so compare it that way
+            old_rows = [(d, inc, item, 1 if inc else q, p) for d, inc, item, q, p in store.row_tuples()]
+            result = patch_rows(store, old_rows, new_rows, FIELDS)
+        if result is None:
+            store.load_columns(ledger.day, ledger.income, ledger.items, ledger.qty, ledger.price)
+        elif any(result):
+            print(f"[Governor] stats import patched: +{result[0]} ~{result[1]} -{result[2]}")
 
     def load_remote_sheets(self):
         """Fetch 'objects' and 'stats' sheets once and apply them to the UI on open.
@@ -2083,109 +1615,6 @@ class GovernorCabinetWindow(QMainWindow):
 
         return
 
-    def _apply_type_state(self, row, is_income, force_update=False):
-        """Ensure the visual state for the given row's Type and Qty cells.
-        For expense rows (is_income=False) ensure a Qty spinbox exists and is visible.
-        For income rows (is_income=True) ensure the Qty cell is removed (or hidden).
-        Reconnects the type button handler so it always toggles the correct row.
-        """
-        try:
-            # Basic validation
-            if not hasattr(self, 'trans_table'):
-                return
-            if row is None:
-                return
-            if row < 0 or row >= self.trans_table.rowCount():
-                return
-
-            # Get/create type button container
-            try:
-                container = self.trans_table.cellWidget(row, 2)
-                if container is None:
-                    # Nothing to do if there's no type container (row not initialized)
-                    return
-                btn = container.findChild(QPushButton)
-            except Exception:
-                btn = None
-
-            # Update button property/text/style and ensure click handler references this row
-            try:
-                if btn:
-                    try:
-                        btn.setProperty('is_income', bool(is_income))
-                    except Exception:
-                        pass
-                    btn.setText('+' if is_income else '-')
-                    if is_income:
-                        btn.setStyleSheet("""
-                            QPushButton { background-color: #55aa55; color: white; border-radius: 4px; font-weight: bold; font-size: 16px; border: none; padding: 0px; }
-                        """)
-                    else:
-                        btn.setStyleSheet("""
-                            QPushButton { background-color: #ff5555; color: #ffffff; border-radius: 4px; font-weight: bold; font-size: 16px; border: none; padding: 0px; }
-                        """)
-                    # Reconnect clicked handler so it toggles this specific row
-                    try:
-                        btn.clicked.disconnect()
-                    except Exception:
-                        pass
-                    try:
-                        btn.clicked.connect(lambda checked=False, r=row, b=btn: self.toggle_type(r, b))
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
-            # Manage Qty cell (column 4)
-            try:
-                w_qty = self.trans_table.cellWidget(row, 4)
-                if is_income:
-                    # For income rows remove the qty widget so it cannot be used
-                    if w_qty is not None:
-                        try:
-                            # Remove widget from cell. Keep the widget object for GC by detaching.
-                            self.trans_table.setCellWidget(row, 4, None)
-                        except Exception:
-                            try:
-                                w_qty.setVisible(False)
-                            except Exception:
-                                pass
-                else:
-                    # For expense rows ensure a qty widget exists and is visible
-                    if w_qty is None or force_update:
-                        try:
-                            qty_widget = create_centered_spinbox(value=0, min_val=-999999, max_val=999999,
-                                                                 on_change=lambda r=row: self.recalc_row(r))
-                            self.trans_table.setCellWidget(row, 4, qty_widget)
-                            try:
-                                qty_widget.setVisible(True)
-                            except Exception:
-                                pass
-                        except Exception as e:
-                            try:
-                                print(f"[Governor] _apply_type_state: failed to create qty widget: {e}")
-                            except Exception:
-                                pass
-                    else:
-                        try:
-                            w_qty.setVisible(True)
-                        except Exception:
-                            pass
-
-            except Exception:
-                pass
-
-            # Refresh viewport so changes reflect immediately
-            try:
-                self.trans_table.viewport().update()
-            except Exception:
-                pass
-        except Exception as e:
-            try:
-                print(f"[Governor] _apply_type_state error: {e}")
-            except Exception:
-                pass
-
     def on_manual_import_click(self):
         """Handle manual import button click with queue check and delay."""
         btn = self.sender()
@@ -2225,19 +1654,24 @@ class GovernorCabinetWindow(QMainWindow):
         self._start_import_with_overlay()
         # reset flags when overlay finishes (apply_imported_data sets _importing False)
 
-    def _start_import_with_overlay(self):
-        # show overlay and disable interactions
-        try:
-            self._loading_overlay.showOverlay("Загрузка...")
-        except Exception:
-            pass
-        try:
-            self.trans_table.setEnabled(False)
-            self.items_table.setEnabled(False)
-            self.trans_table.setUpdatesEnabled(False)
-            self.items_table.setUpdatesEnabled(False)
-        except Exception:
-            pass
+    def _start_import_with_overlay(self, overlay=True):
+        # Without the overlay (refresh after an autosave restore) the tables stay usable
+        self._load_in_background = not overlay
+        # Edits logged after this point are newer than what the load returns
+        self._load_start_seq = self.autosave.seq
+        if overlay:
+            # show overlay and disable interactions
+            try:
+                self._get_loading_overlay().showOverlay("Загрузка...")
+            except Exception:
+                pass
+            try:
+                self.trans_table.setEnabled(False)
+                self.items_table.setEnabled(False)
+                self.trans_table.setUpdatesEnabled(False)
+                self.items_table.setUpdatesEnabled(False)
+            except Exception:
+                pass
 
         self._load_thread = GoogleSheetLoadThread(self.google_service, self.spreadsheet_id, parent=self)
         self._load_thread.loaded.connect(self._on_initial_loaded)
@@ -2246,7 +1680,12 @@ class GovernorCabinetWindow(QMainWindow):
 
     def _on_initial_loaded(self, fetched: dict):
         try:
-            self.apply_imported_data(fetched)
+            # A background refresh must not drop local edits made while it loaded,
+            # including ones already synced (the grid may predate that sync)
+            if self._load_in_background and (self.autosave.pending or self.autosave.seq != self._load_start_seq):
+                print("[Governor] remote load skipped: local edits were made while it loaded")
+            else:
+                self.apply_imported_data(fetched)
         finally:
             self._finish_overlay()
 
@@ -2268,7 +1707,8 @@ class GovernorCabinetWindow(QMainWindow):
         except Exception:
             pass
         try:
-            self._loading_overlay.hideOverlay()
+            if self._loading_overlay is not None:
+                self._loading_overlay.hideOverlay()
         except Exception:
             pass
         self.setCursor(Qt.CursorShape.ArrowCursor)
@@ -2279,24 +1719,9 @@ class GovernorCabinetWindow(QMainWindow):
             pass
 
     def update_totals(self):
-        """Recompute totals for header labels: income, expense, balance."""
-        income_total = 0
-        expense_total = 0
-        for r in range(self.trans_table.rowCount() - 1):
-            cont_type = self.trans_table.cellWidget(r, 2)
-            is_inc = False
-            if cont_type:
-                btn = cont_type.findChild(QPushButton)
-                if btn:
-                    is_inc = bool(btn.property("is_income"))
-            sum_item = self.trans_table.item(r, 6)
-            if not sum_item:
-                continue
-            val = _parse_display_amount(sum_item.text())
-            if is_inc:
-                income_total += val
-            else:
-                expense_total += val  # expense values are negative by design
+        """Refresh header labels (income, expense, balance) from the store's running totals."""
+        income_total = self.trans_store.income_total
+        expense_total = self.trans_store.expense_total  # expense values are negative by design
 
         # expense_total is negative; for display we keep negative
         balance = income_total + expense_total
@@ -2306,85 +1731,29 @@ class GovernorCabinetWindow(QMainWindow):
         self.lbl_expense.setText(f"Расходы: {_format_display_amount(expense_total)}")
         self.lbl_balance.setText(f"Баланс: {_format_display_amount(balance)}")
 
-    def _items_map(self):
-        """Return ordered dict of item name -> base price from items_table."""
-        from collections import OrderedDict
-        m = OrderedDict()
-        for r in range(self.items_table.rowCount() - 1):
-            c_name = self.items_table.cellWidget(r, 0)
-            name = ""
-            if c_name:
-                le = c_name.findChild(QLineEdit)
-                if le:
-                    name = le.text().strip()
-            if not name:
-                continue
-            c_price = self.items_table.cellWidget(r, 1)
-            price_val = 0
-            if c_price:
-                spin = c_price.findChild((NoScrollSpinBox, QSpinBox, QDoubleSpinBox))
-                if spin:
-                    try:
-                        price_val = int(spin.value())
-                    except Exception:
-                        price_val = 0
-            m[name] = price_val
-        return m
-
-    def refresh_item_combos(self):
-        """Refresh all item combo lists in transactions to reflect current items_table.
-        Also update the shared completer model so QLineEdit suggestions work.
-        """
-        items = list(self._items_map().keys())
-        # update completer model
+    def _audit_totals(self):
+        """Debug check: compare running totals with a full rescan and fix the labels on drift."""
         try:
-            if getattr(self, '_items_completer_model', None):
-                self._items_completer_model.setStringList(items)
-        except Exception:
-            pass
+            if not self.trans_store.audit_totals():
+                print("[Governor] totals audit found drift; labels refreshed")
+                self.update_totals()
+        except Exception as e:
+            print(f"[Governor] totals audit failed: {e}")
 
-        for r in range(self.trans_table.rowCount() - 1):
-            w_item = self.trans_table.cellWidget(r, 3)
-            if not w_item:
-                continue
-            combo = w_item.findChild(QComboBox)
-            if not combo:
-                # If there is a plain QLineEdit, ensure its completer reflects items
-                le = w_item.findChild(QLineEdit)
-                if le and getattr(self, '_items_completer', None):
-                    try:
-                        le.setCompleter(self._items_completer)
-                    except Exception:
-                        pass
-                continue
-            cur = combo.currentText()
-            combo.blockSignals(True)
-            combo.clear()
-            combo.addItems(items)
-            combo.setCurrentText(cur)
-            combo.blockSignals(False)
+    def _items_map(self):
+        """Return ordered dict of item name -> base price from the item catalog."""
+        return self.item_catalog.items()
 
     def on_item_selected(self, row, text):
         """Handle selection from item list: set base price into price field."""
-        # ensure row exists
         try:
             # If this row is income, ignore
-            cont_type = self.trans_table.cellWidget(row, 2)
-            if cont_type:
-                btn = cont_type.findChild(QPushButton)
-                if btn and btn.property("is_income"):
-                    return
+            if self.trans_store.income[row]:
+                return
 
-            items = self._items_map()
-            if text in items:
-                price = items[text]
-                c_price = self.trans_table.cellWidget(row, 5)
-                if c_price:
-                    spin = c_price.findChild((QSpinBox, NoScrollSpinBox, QDoubleSpinBox))
-                    if spin:
-                        spin.setValue(int(price))
-                # recalc row after setting price
-                self.recalc_row(row)
+            price = self.item_catalog.price_of(text)
+            if price is not None:
+                self.trans_store.set_field(row, 'price', int(price))
         except Exception:
             pass
 
@@ -2411,8 +1780,6 @@ class GovernorCabinetWindow(QMainWindow):
         except Exception:
              pass
 
-        self.sync_all_data()
-
     def _on_popup_pick(self, row, widget_container, text):
         le = widget_container.findChild(QLineEdit)
         if le:
@@ -2432,25 +1799,6 @@ class GovernorCabinetWindow(QMainWindow):
                 pass
             self._item_popup = None
 
-    def _ensure_delete_widget_for_row(self, row):
-        """Ensure the delete (red square) widget exists for transaction row `row`.
-        This is used after import to recreate any missing delete controls.
-        """
-        try:
-            cont = self.trans_table.cellWidget(row, 7)
-            if cont is not None:
-                return
-        except Exception:
-            cont = None
-
-        # Create delete button container using helper
-        container_del = create_delete_button(lambda btn: self.delete_row_by_widget(btn))
-        
-        try:
-            self.trans_table.setCellWidget(row, 7, container_del)
-        except Exception:
-            pass
-
     def resizeEvent(self, event):
         try:
             if getattr(self, '_loading_overlay', None):
@@ -2469,6 +1817,13 @@ class GovernorCabinetWindow(QMainWindow):
         if self._auto_loaded_once:
             return
         self._auto_loaded_once = True
+        if self._restored_local:
+            # The saved state is already on screen. Edits that did not reach the
+            # sheets win over them; otherwise refresh from the sheets in the background.
+            self._suspend_suggestions = False
+            if not self.autosave.pending:
+                self._start_import_with_overlay(overlay=False)
+            return
         # Set importing flag before starting import to prevent suggestion popups
         try:
             self._importing = True
@@ -2476,21 +1831,20 @@ class GovernorCabinetWindow(QMainWindow):
             pass
         self._start_import_with_overlay()
 
-    def show_calendar_popup(self, sender_widget):
-        """Standard calendar popup for the date button. Position under the button and clamp to screen.
+    def show_calendar_popup(self, row):
+        """Standard calendar popup for the date cell of `row`. Position under the cell and clamp to screen.
         """
-        # Diagnostic log to help debug positioning issues
         try:
-            print(f"[Governor] show_calendar_popup called. sender={repr(sender_widget)}, sender.rect={getattr(sender_widget, 'rect', None)}")
+            print(f"[Governor] show_calendar_popup called. row={row}")
         except Exception:
             pass
         cal_widget = CustomCalendarWidget(parent=None)
         cal_widget.setWindowFlags(Qt.WindowType.Popup | Qt.WindowType.FramelessWindowHint)
 
-        # Try to parse current date from button or default to current
+        # Try to parse current date from the row or default to current
         try:
-            current_date_str = sender_widget.text()
-            current_date = QDate.fromString(current_date_str, "dd.MM.yyyy")
+            day = self.trans_store.day[row]
+            current_date = QDate.fromJulianDay(day) if day else QDate()
             if current_date.isValid():
                 cal_widget.setSelectedDate(current_date)
             else:
@@ -2499,36 +1853,32 @@ class GovernorCabinetWindow(QMainWindow):
             cal_widget.setSelectedDate(QDate.currentDate())
 
         def on_date_selected(qdate):
-            sender_widget.setText(qdate.toString("dd.MM.yyyy"))
+            # Model change triggers sync
+            self.trans_store.set_field(row, 'day', qdate.toJulianDay())
             cal_widget.close()
-            # Trigger sync if needed
-            self.sync_all_data()
 
         cal_widget.date_selected.connect(on_date_selected)
 
-        # Position: compute global bottom-left of the sender and clamp to screen
+        # Position: compute global bottom-left of the date cell and clamp to screen
         try:
             cal_widget.adjustSize()
-            btn_rect = sender_widget.rect()
-            bottom_left = sender_widget.mapToGlobal(btn_rect.bottomLeft())
+            viewport = self.trans_table.viewport()
+            cell_rect = self.trans_table.visualRect(self.trans_model.index(self.trans_model.view_row(row), COL_DATE))
+            bottom_left = viewport.mapToGlobal(cell_rect.bottomLeft())
             x = bottom_left.x()
             y = bottom_left.y()
 
             try:
-                screen = sender_widget.screen()
+                screen = self.trans_table.screen()
                 if screen is None:
                     screen = QApplication.primaryScreen()
                 geom = screen.availableGeometry()
-                try:
-                    print(f"[Governor] computed bottom_left=({x},{y}), popup_size=({cal_widget.width()},{cal_widget.height()}), screen_geom=({geom.left()},{geom.top()},{geom.right()},{geom.bottom()})")
-                except Exception:
-                    pass
                 # clamp right edge
                 if x + cal_widget.width() > geom.right():
                     x = max(geom.left(), geom.right() - cal_widget.width())
                 # if it doesn't fit below, show above
                 if y + cal_widget.height() > geom.bottom():
-                    top_left = sender_widget.mapToGlobal(btn_rect.topLeft())
+                    top_left = viewport.mapToGlobal(cell_rect.topLeft())
                     y = top_left.y() - cal_widget.height()
                     if y < geom.top():
                         y = geom.top()
@@ -2542,24 +1892,17 @@ class GovernorCabinetWindow(QMainWindow):
 
             cal_widget.move(QPoint(x, y))
         except Exception:
-            try:
-                # fallback: position at sender global pos
-                pos = sender_widget.mapToGlobal(QPoint(0, sender_widget.height()))
-                try:
-                    print(f"[Governor] fallback position used: {pos}")
-                except Exception:
-                    pass
-                cal_widget.move(pos)
-            except Exception:
-                pass
+            pass
 
         cal_widget.show()
+        # keep a reference so the popup is not garbage collected while open
+        self._calendar_popup = cal_widget
 
     def _sort_transactions_by_date(self, descending=False):
-        """Sort visible transactions by date without removing rows.
-        Rows outside the selected range are hidden (not deleted). Visible rows
-        are sorted in-place by updating values/widgets rather than reparenting
-        widgets/items to avoid losing data that is later exported.
+        """Show the transactions of the selected period sorted by date.
+        The ordered ids come from the day index (two bisects); the table shows
+        them as a view permutation, so the store and its sync order are untouched.
+        Rows without a date always stay visible.
         """
         try:
             # Read selected range (if any)
@@ -2571,237 +1914,26 @@ class GovernorCabinetWindow(QMainWindow):
             except Exception:
                 start = None
                 end = None
+            start_day = start.toJulianDay() if start is not None and start.isValid() else None
+            end_day = end.toJulianDay() if end is not None and end.isValid() else None
 
-            total_rows = self.trans_table.rowCount()
-            data_rows = max(0, total_rows - 1)  # exclude trailing plus row
-
-            # Hide rows outside the selected period (do not delete)
-            for r in range(data_rows):
-                try:
-                    visible = True
-                    if start or end:
-                        c_date = self.trans_table.cellWidget(r, 1)
-                        date_text = ''
-                        if c_date:
-                            btns = c_date.findChildren(QPushButton)
-                            date_text = btns[0].text() if btns else ''
-                        qd = QDate.fromString(date_text, 'dd.MM.yyyy') if date_text else None
-                        if qd:
-                            if start and qd < start:
-                                visible = False
-                            if end and qd > end:
-                                visible = False
-                    try:
-                        self.trans_table.setRowHidden(r, not visible)
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
-
-            # Collect primitives for visible rows
-            rows = []
-            visible_positions = []
-            for r in range(data_rows):
-                try:
-                    if self.trans_table.isRowHidden(r):
-                        continue
-                    visible_positions.append(r)
-                    # Read primitives
-                    # Date
-                    date_text = ''
-                    qd = None
-                    c_date = self.trans_table.cellWidget(r, 1)
-                    if c_date:
-                        btns = c_date.findChildren(QPushButton)
-                        if btns:
-                            date_text = btns[0].text()
-                        else:
-                            try:
-                                de = c_date.findChild(DateEditClickable)
-                                if de:
-                                    qd = de.date()
-                                    date_text = qd.toString('dd.MM.yyyy')
-                            except Exception:
-                                pass
-                        if date_text and not qd:
-                            try:
-                                qd = QDate.fromString(date_text, 'dd.MM.yyyy')
-                            except Exception:
-                                qd = None
-
-                    # Type
-                    is_income = False
-                    c_type = self.trans_table.cellWidget(r, 2)
-                    if c_type:
-                        btn = c_type.findChild(QPushButton)
-                        if btn:
-                            try:
-                                is_income = bool(btn.property('is_income'))
-                            except Exception:
-                                is_income = False
-
-                    # Item
-                    item_name = ''
-                    c_item = self.trans_table.cellWidget(r, 3)
-                    if c_item:
-                        le = c_item.findChild(QLineEdit)
-                        if le:
-                            item_name = le.text().strip()
-
-                    # Qty
-                    qty = 0
-                    w_qty = self.trans_table.cellWidget(r, 4)
-                    if w_qty:
-                        try:
-                            sp = w_qty.findChild((NoScrollSpinBox, QSpinBox, QDoubleSpinBox))
-                            if sp:
-                                qty = int(sp.value())
-                        except Exception:
-                            qty = 0
-
-                    # Price
-                    price = 0
-                    w_price = self.trans_table.cellWidget(r, 5)
-                    if w_price:
-                        try:
-                            sp = w_price.findChild((QSpinBox, QDoubleSpinBox, NoScrollSpinBox))
-                            if sp:
-                                price = int(sp.value())
-                        except Exception:
-                            price = 0
-
-                    # Sum
-                    sum_val = 0
-                    w_sum = self.trans_table.item(r, 6)
-                    if w_sum:
-                        try:
-                            sum_val = _parse_display_amount(w_sum.text())
-                        except Exception:
-                            sum_val = 0
-
-                    rows.append({'date_text': date_text, 'qdate': qd, 'is_income': is_income,
-                                 'item': item_name, 'qty': qty, 'price': price, 'sum': sum_val,
-                                 'height': self.trans_table.rowHeight(r)})
-                except Exception:
-                    pass
-
-            if not rows:
-                return
-
-            # Sort by qdate (None as very old)
-            def _sort_key(x):
-                return (x['qdate'].toJulianDay() if x.get('qdate') else -999999)
-
-            rows.sort(key=_sort_key, reverse=descending)
-
-            # Write sorted values back into the visible positions (preserve widgets)
-            for pos, rowdata in zip(visible_positions, rows):
-                try:
-                    # Date
-                    c_date = self.trans_table.cellWidget(pos, 1)
-                    if c_date:
-                        btns = c_date.findChildren(QPushButton)
-                        if btns and rowdata.get('date_text') is not None:
-                            try:
-                                btns[0].setText(rowdata.get('date_text') or "")
-                            except Exception:
-                                pass
-                        else:
-                            try:
-                                de = c_date.findChild(DateEditClickable)
-                                if de and rowdata.get('qdate'):
-                                    de.setDate(rowdata.get('qdate'))
-                            except Exception:
-                                pass
-
-                    # Type and qty visibility
-                    try:
-                        self._ensure_type_button(pos, rowdata.get('is_income', False))
-                        self._apply_type_state(pos, rowdata.get('is_income', False), force_update=False)
-                    except Exception:
-                        pass
-
-                    # Item
-                    c_item = self.trans_table.cellWidget(pos, 3)
-                    if c_item:
-                        le = c_item.findChild(QLineEdit)
-                        if le:
-                            le.setText(rowdata.get('item', ''))
-
-                    # Qty
-                    c_qty = self.trans_table.cellWidget(pos, 4)
-                    if c_qty:
-                        try:
-                            sp = c_qty.findChild((NoScrollSpinBox, QSpinBox, QDoubleSpinBox))
-                            if sp:
-                                sp.setValue(rowdata.get('qty', 0))
-                        except Exception:
-                            pass
-
-                    # Price
-                    c_price = self.trans_table.cellWidget(pos, 5)
-                    if c_price:
-                        try:
-                            sp = c_price.findChild((QSpinBox, QDoubleSpinBox, NoScrollSpinBox))
-                            if sp:
-                                sp.setValue(rowdata.get('price', 0))
-                        except Exception:
-                            pass
-
-                    # Sum
-                    item_sum = self.trans_table.item(pos, 6)
-                    if item_sum:
-                        try:
-                            item_sum.setText(_format_display_amount(rowdata.get('sum', 0)))
-                        except Exception:
-                            pass
-
-                    # Ensure delete button exists
-                    try:
-                        self._ensure_delete_widget_for_row(pos)
-                    except Exception:
-                        pass
-
-                    try:
-                        self.trans_table.setRowHeight(pos, rowdata.get('height', 45))
-                    except Exception:
-                        pass
-                except Exception:
-                    pass
-
-            # Update numbering and recalc visible rows
-            try:
-                self.update_row_numbers()
-            except Exception:
-                pass
-            try:
-                for r in visible_positions:
-                    try:
-                        self.recalc_row(r)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
-            try:
-                self.refresh_item_combos()
-            except Exception:
-                pass
-
+            ids = self.trans_day_index.ids_in_range(start_day, end_day)
+            if descending:
+                ids.reverse()
+            self.trans_model.set_view(ids)
         except Exception as e:
             try:
                 print(f"[Governor] _sort_transactions_by_date error: {e}")
             except Exception:
                 pass
 
-    def update_stats_table(self, filter_text: str = ''):
-        """Aggregate expense rows from trans_table into stats_table.
-        Case-insensitive aggregation. Respects selected period in `period_range`.
+    def update_stats_table(self, filter_text=None):
+        """Point the item stats at the period selected in `period_range` and apply
+        the search filter. The aggregate itself follows transaction edits by delta
+        (ItemStats), so this only does work when the period or filter changed.
         """
         try:
-            f = (filter_text or '').strip().lower()
-            stats = {}
-            # read period from single DateRangeEdit (period_range)
+            self._ensure_stats_view()
             start = None
             end = None
             try:
@@ -2811,105 +1943,41 @@ class GovernorCabinetWindow(QMainWindow):
                 start = None
                 end = None
 
-            for r in range(self.trans_table.rowCount() - 1):
-                # read type
-                c_type = self.trans_table.cellWidget(r, 2)
-                is_inc = False
-                if c_type:
-                    btn = c_type.findChild(QPushButton)
-                    if btn:
-                        is_inc = bool(btn.property('is_income'))
-                # ignore income rows
-                if is_inc:
-                    continue
-
-                # read date and check period
-                c_date = self.trans_table.cellWidget(r, 1)
-                date_ok = True
-                if c_date and (start is not None or end is not None):
-                    btns = c_date.findChildren(QPushButton)
-                    date_text = btns[0].text() if btns else ''
-                    qd = QDate.fromString(date_text, 'dd.MM.yyyy') if date_text else None
-                    if qd:
-                        if start and qd < start:
-                            date_ok = False
-                        if end and qd > end:
-                            date_ok = False
-                if not date_ok:
-                    continue
-
-                # item name
-                c_item = self.trans_table.cellWidget(r, 3)
-                name = ''
-                if c_item:
-                    le = c_item.findChild(QLineEdit)
-                    if le:
-                        name = le.text().strip()
-                if not name:
-                    continue
-                if f and f not in name.lower():
-                    continue
-
-                # qty and sum
-                qty = 0
-                w_qty = self.trans_table.cellWidget(r, 4)
-                if w_qty:
-                    sp = w_qty.findChild((NoScrollSpinBox, QSpinBox, QDoubleSpinBox))
-                    if sp:
-                        try:
-                            qty = int(sp.value())
-                        except Exception:
-                            qty = 0
-                # sum
-                w_sum = self.trans_table.item(r, 6)
-                total = 0
-                if w_sum:
-                    try:
-                        total = _parse_display_amount(w_sum.text())
-                    except Exception:
-                        total = 0
-
-                key = name.lower()
-                if key not in stats:
-                    stats[key] = {'display': name, 'qty': 0, 'total': 0}
-                stats[key]['qty'] += abs(int(qty))
-                stats[key]['total'] += abs(int(total))
-
-            # Populate stats_table
-            self.stats_table.setRowCount(0)
-            for k, v in stats.items():
-                row_idx = self.stats_table.rowCount()
-                self.stats_table.insertRow(row_idx)
-                # Name (make bold)
-                it_name = QTableWidgetItem(v['display'])
-                it_name.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-                self.stats_table.setItem(row_idx, 0, it_name)
-                # Qty (make bold)
-                it_qty = QTableWidgetItem(str(v['qty']))
-                it_qty.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                it_qty.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-                self.stats_table.setItem(row_idx, 1, it_qty)
-                # avg per unit
-                avg = 0
-                try:
-                    avg = int(v['total'] / v['qty']) if v['qty'] else 0
-                except Exception:
-                    avg = 0
-                it_avg = QTableWidgetItem(_format_display_amount(avg, show_sign=False))
-                it_avg.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                it_avg.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-                self.stats_table.setItem(row_idx, 2, it_avg)
-                it_sum = QTableWidgetItem(_format_display_amount(v['total'], show_sign=False))
-                it_sum.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                it_sum.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
-                self.stats_table.setItem(row_idx, 3, it_sum)
+            start_day = start.toJulianDay() if start is not None and start.isValid() else None
+            end_day = end.toJulianDay() if end is not None and end.isValid() else None
+            self.item_stats.set_period(start_day, end_day)
 
+            if filter_text is None:
+                filter_text = self.stats_search.text() if getattr(self, 'stats_search', None) else ''
+            self.stats_proxy.set_filter_text(filter_text)
         except Exception as e:
             try:
                 print(f"[Governor] update_stats_table error: {e}")
             except Exception:
                 pass
 
+
+    def update_trends(self):
+        """Recompute the Trends tab for the selected period (only while it is shown)."""
+        view = self.trends_view
+        if view is None or self.stats_tabs.currentWidget() is not self._trends_tab:
+            return
+        if not analytics.available():
+            view.set_unavailable("Для вкладки «Тренды» нужен пакет numpy")
+            return
+        try:
+            start_day = end_day = None
+            try:
+                start, end = self.period_range.dateRange()
+                start_day = start.toJulianDay() if start is not None and start.isValid() else None
+                end_day = end.toJulianDay() if end is not None and end.isValid() else None
+            except Exception:
+                pass
+            ledger = analytics.LedgerArrays.capture(self.trans_store)
+            view.set_trends(analytics.ledger_trends(ledger, start_day, end_day))
+        except Exception as e:
+            print(f"[Governor] update_trends error: {e}")
+
     def _adjust_name_column_for_editor(self, le: QLineEdit):
         """Ensure the 'Предмет' column (index 3) is at least 150px and expand it
         when the editor content requires more space, reducing Price(5)/Sum(6)
@@ -2971,29 +2039,22 @@ class GovernorCabinetWindow(QMainWindow):
 
     def _adjust_stats_table_column_widths(self):
         """Distribute available width of stats_table across columns proportionally
-        while respecting minimum column widths configured earlier.
+        to their minimum widths. Does nothing while the viewport width is unchanged.
         """
         try:
             tbl = getattr(self, 'stats_table', None)
             if tbl is None:
                 return
 
-            # Ensure header is in Stretch mode so columns fill available space
-            try:
-                for ci in range(tbl.columnCount()):
-                    tbl.horizontalHeader().setSectionResizeMode(ci, QHeaderView.ResizeMode.Stretch)
-                tbl.horizontalHeader().setStretchLastSection(True)
-            except Exception:
-                pass
-
             # base minimal widths (reduced to avoid forcing overflow)
             mins = [80, 50, 70, 70]
             total_min = sum(mins)
 
             # available content width in the viewport (reduce a bit for paddings)
             avail = max(0, (tbl.viewport().width() or tbl.width()) - 10)
-            if avail <= 0:
+            if avail <= 0 or avail == self._stats_table_width:
                 return
+            self._stats_table_width = avail
 
             # If there's extra space beyond total_min, distribute proportionally
             extra = max(0, avail - total_min)
@@ -3003,7 +2064,6 @@ class GovernorCabinetWindow(QMainWindow):
             for i, m in enumerate(mins):
                 w = m + int(extra * props[i]) if extra > 0 else m
                 try:
-                    # In Stretch mode setColumnWidth is advisory; still set minimal via resize
                     tbl.setColumnWidth(i, max(40, int(w)))
                 except Exception:
                     pass
@@ -3022,154 +2082,56 @@ class GovernorCabinetWindow(QMainWindow):
             return
 
     def export_transactions(self):
-        """Export visible transaction rows to a .txt file with totals appended.
-        Writes a human-friendly aligned table where each column starts at the same position.
+        """Export the transaction rows in display order to TXT (aligned table with
+        totals), CSV, JSON lines or XLSX. The store columns are copied here and the
+        file is written by LedgerExportThread, so large ledgers don't block the window.
         """
-        from PyQt6.QtWidgets import QFileDialog, QMessageBox
-        import os
-
-        sep = ' | '
-
-        # Gather visible rows first so we can compute column widths
-        rows = []
-        headers = ["№", "Дата", "Тип", "Предмет|Услуга", "Кол-во", "Цена", "Сумма"]
-
-        # Build rows array
-        for r in range(self.trans_table.rowCount() - 1):
-            if self.trans_table.isRowHidden(r):
-                continue
-
-            row_cells = []
-            for c in range(7):
-                text_val = ''
-                item = self.trans_table.item(r, c)
-                if item and item.text():
-                    text_val = item.text()
-                else:
-                    widget = self.trans_table.cellWidget(r, c)
-                    if widget:
-                        try:
-                            btn = widget.findChild(QPushButton)
-                            if btn and btn.text():
-                                text_val = btn.text()
-                            else:
-                                le = widget.findChild(QLineEdit)
-                                if le and le.text():
-                                    text_val = le.text()
-                                else:
-                                    sp = widget.findChild(QAbstractSpinBox)
-                                    if sp is not None:
-                                        try:
-                                            text_val = str(sp.value())
-                                        except Exception:
-                                            text_val = ''
-                                    else:
-                                        combo = widget.findChild(QComboBox)
-                                        if combo and combo.currentText():
-                                            text_val = combo.currentText()
-                                        else:
-                                            date_w = widget.findChild(QDateEdit)
-                                            if date_w:
-                                                try:
-                                                    text_val = date_w.date().toString("dd.MM.yyyy")
-                                                except Exception:
-                                                    text_val = ''
-                                            else:
-                                                text_val = ''
-                        except Exception:
-                            text_val = ''
-                    else:
-                        text_val = ''
+        from PyQt6.QtWidgets import QFileDialog
 
-                # Clean unwanted whitespace characters
-                if isinstance(text_val, str):
-                    text_val = text_val.replace('\t', ' ').replace('\n', ' ').strip()
-                else:
-                    text_val = str(text_val)
-
-                row_cells.append(text_val)
-
-            rows.append(row_cells)
-
-        # Compute column widths based on headers and data
-        col_count = len(headers)
-        widths = [0] * col_count
-        for ci in range(col_count):
-            maxw = len(headers[ci])
-            for r in rows:
-                try:
-                    maxw = max(maxw, len(r[ci]))
-                except Exception:
-                    pass
-            widths[ci] = maxw
-
-        # Use alignment per column: right for numeric-ish, center for type, left for text
-        aligns = ['>' , '<', '^', '<', '>', '>', '>']
+        running = getattr(self, '_export_thread', None)
+        if running is not None and running.isRunning():
+            return
 
         # Open Save As dialog
-        file_path, _ = QFileDialog.getSaveFileName(self, "Сохранить транзакции", "", "Text Files (*.txt);;All Files (*)")
+        filters = ";;".join(EXPORT_FILTERS + ("All Files (*)",))
+        file_path, selected = QFileDialog.getSaveFileName(self, "Сохранить транзакции", "", filters)
         if not file_path:
             return
-        if not file_path.lower().endswith('.txt'):
-            file_path += '.txt'
-
-        try:
-            with open(file_path, 'w', encoding='utf-8') as file:
-                # Write header line with padding
-                hdr_parts = []
-                for i, h in enumerate(headers):
-                    align = aligns[i] if i < len(aligns) else '<'
-                    fmt = f"{{:{align}{widths[i]}}}"
-                    hdr_parts.append(fmt.format(h))
-                file.write(sep.join(hdr_parts) + '\n')
-
-                # Underline header
-                underline = []
-                for w in widths:
-                    underline.append('-' * w)
-                file.write(sep.join(underline) + '\n')
-
-                # Write rows with same padding
-                for rdata in rows:
-                    parts = []
-                    for i, cell in enumerate(rdata):
-                        align = aligns[i] if i < len(aligns) else '<'
-                        fmt = f"{{:{align}{widths[i]}}}"
-                        parts.append(fmt.format(cell))
-                    file.write(sep.join(parts) + '\n')
-
-                # Totals (strip duplicate prefixes if any)
-                def _strip_label_prefix(lbl_text, prefix):
-                    if not lbl_text:
-                        return ''
-                    t = lbl_text
-                    if t.lower().startswith(prefix.lower()):
-                        return t.split(':', 1)[1].strip()
-                    return t
+        fmt = format_for_path(file_path, default='')
+        if not fmt:
+            # No known extension typed: take the format of the chosen filter
+            fmt = EXPORT_FORMATS[EXPORT_FILTERS.index(selected)] if selected in EXPORT_FILTERS else 'txt'
+            file_path += '.' + fmt
+
+        snapshot = LedgerSnapshot.capture(self.trans_store, self.trans_model.store_rows())
+        th = LedgerExportThread(snapshot, file_path, fmt, parent=self)
+        th.progress.connect(self._on_export_progress)
+        th.exported.connect(lambda path, _count: self._on_export_finished(path))
+        th.error.connect(lambda msg: self._on_export_finished(file_path, msg))
+        self._export_thread = th
+        try:
+            self.btn_export.setEnabled(False)
+        except Exception:
+            pass
+        th.start()
 
-                try:
-                    income_label = getattr(self, 'lbl_income', None)
-                    expense_label = getattr(self, 'lbl_expense', None)
-                    balance_label = getattr(self, 'lbl_balance', None)
-
-                    income_text = _strip_label_prefix(income_label.text() if income_label else '', 'Доходы:')
-                    expense_text = _strip_label_prefix(expense_label.text() if expense_label else '', 'Расходы:')
-                    balance_text = _strip_label_prefix(balance_label.text() if balance_label else '', 'Баланс:')
-
-                    file.write('\n')
-                    file.write(f"Доходы: {income_text}\n")
-                    file.write(f"Расходы: {expense_text}\n")
-                    file.write(f"Баланс: {balance_text}\n")
-                except Exception:
-                    try:
-                        self.update_totals()
-                        file.write('\n')
-                        file.write(f"Доходы: {getattr(self, 'lbl_income', QTableWidgetItem()).text()}\n")
-                        file.write(f"Расходы: {getattr(self, 'lbl_expense', QTableWidgetItem()).text()}\n")
-                        file.write(f"Баланс: {getattr(self, 'lbl_balance', QTableWidgetItem()).text()}\n")
-                    except Exception:
-                        pass
+    def _on_export_progress(self, done, total):
+        try:
+            pct = int(done * 100 / total) if total else 100
+            self.btn_export.setText(f"Экспорт {pct}%")
+        except Exception:
+            pass
 
+    def _on_export_finished(self, file_path, error=None):
+        from PyQt6.QtWidgets import QMessageBox
+        import os
+
+        try:
+            self.btn_export.setText("Экспорт")
+            self.btn_export.setEnabled(True)
+        except Exception:
+            pass
+        if error is None:
             # Styled success message
             try:
                 msg = QMessageBox(self)
@@ -3183,16 +2145,101 @@ class GovernorCabinetWindow(QMainWindow):
                     QMessageBox.information(self, "Экспорт завершен", f"Транзакции успешно экспортированы в файл:\n{os.path.basename(file_path)}")
                 except Exception:
                     pass
-        except Exception as e:
+        else:
             try:
                 err = QMessageBox(self)
                 err.setWindowTitle("Ошибка экспорта")
-                err.setText(f"Не удалось экспортировать транзакции:\n{str(e)}")
+                err.setText(f"Не удалось экспортировать транзакции:\n{str(error)}")
                 err.setIcon(QMessageBox.Icon.Critical)
                 err.setStyleSheet("QMessageBox { background-color: #1f1f1f; color: #ffffff; } QPushButton { background-color: #2a82da; color: white; padding: 6px 12px; border-radius: 4px; }")
                 err.exec()
             except Exception:
                 try:
-                    QMessageBox.critical(self, "Ошибка экспорта", f"Не удалось экспортировать транзакции:\n{str(e)}")
+                    QMessageBox.critical(self, "Ошибка экспорта", f"Не удалось экспортировать транзакции:\n{str(error)}")
                 except Exception:
-                    pass
\ No newline at end of file
+                    pass
+
+    def show_period_report(self):
+        """Open (or raise) the period comparison report over the transaction rollups."""
+        try:
+            dlg = getattr(self, '_report_dialog', None)
+            if dlg is None:
+                dlg = self._report_dialog = PeriodReportDialog(self.trans_rollup, self)
+                dlg.finished.connect(lambda _r: setattr(self, '_report_dialog', None))
+            dlg.show()
+            dlg.raise_()
+            dlg.activateWindow()
+        except Exception as e:
+            print(f"[Governor] Failed to open period report: {e}")
+
+    # --- bulk import ---------------------------------------------------------------
+    def paste_transactions(self):
+        """Add the rows of tab/CSV text on the clipboard (e.g. copied from a spreadsheet)."""
+        try:
+            text = QApplication.clipboard().text()
+        except Exception:
+            text = ''
+        if text and text.strip():
+            self._start_bulk_import(text)
+
+    def import_transactions_file(self):
+        from PyQt6.QtWidgets import QFileDialog
+
+        file_path, _ = QFileDialog.getOpenFileName(self, "Добавить транзакции из файла", "", BULK_FILE_FILTER)
+        if file_path:
+            self._start_bulk_import(('file', file_path))
+
+    def _start_bulk_import(self, source):
+        """Read and validate on BulkImportThread; the rows are added in _apply_bulk_import."""
+        running = getattr(self, '_bulk_import_thread', None)
+        if running is not None and running.isRunning():
+            return
+        th = BulkImportThread(source, self.item_catalog.price_map(), parent=self)
+        th.parsed.connect(self._apply_bulk_import)
+        th.error.connect(lambda msg: self._show_bulk_import_result(0, [(0, msg)]))
+        self._bulk_import_thread = th
+        try:
+            self.btn_bulk_import.setEnabled(False)
+        except Exception:
+            pass
+        th.start()
+
+    def _apply_bulk_import(self, result):
+        """Append the validated rows with one store insert (one model insert, one sync)."""
+        added = 0
+        try:
+            cols = result.columns
+            if len(cols):
+                rows = self.trans_store.append_columns(cols.day, cols.income, cols.items, cols.qty, cols.price)
+                added = len(rows)
+                try:
+                    self.trans_table.scrollToBottom()
+                except Exception:
+                    pass
+            print(f"[Governor] bulk import: {added} rows added, {len(result.errors)} skipped, "
+                  f"{result.filled_prices} prices from catalog")
+        except Exception as e:
+            result.errors.append((0, str(e)))
+        self._show_bulk_import_result(added, result.errors)
+
+    def _show_bulk_import_result(self, added, errors):
+        try:
+            self.btn_bulk_import.setEnabled(True)
+        except Exception:
+            pass
+        lines = [f"Добавлено транзакций: {added}"]
+        if errors:
+            lines.append(f"Пропущено строк: {len(errors)}")
+            for line, message in errors[:10]:
+                lines.append(f"  строка {line}: {message}" if line else f"  {message}")
+            if len(errors) > 10:
+                lines.append("  …")
+        try:
+            msg = QMessageBox(self)
+            msg.setWindowTitle("Импорт транзакций")
+            msg.setText("\n".join(lines))
+            msg.setIcon(QMessageBox.Icon.Information if added else QMessageBox.Icon.Warning)
+            msg.setStyleSheet("QMessageBox { background-color: #1f1f1f; color: #ffffff; } QPushButton { background-color: #2a82da; color: white; padding: 6px 12px; border-radius: 4px; }")
+            msg.exec()
+        except Exception:
+            pass
@@ -7,7 +7,7 @@ from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QStringListModel, QPropertyAnim
 from PyQt6.QtGui import QFont, QPalette, QColor, QIcon
 from PyQt6.QtWidgets import QCompleter
 
-from modules.core.firebase_service import get_usernames, get_user, list_users, can_assign_role, save_user_roles, resolve_user_permissions, DEPT_DEFAULT_PERMS, can_manage_user, can_assign_departments, create_user, delete_user
+from modules.core.firebase_service import get_usernames, get_user, list_users, USER_DIRECTORY_FIELDS, can_assign_role, save_user_roles, resolve_user_permissions, DEPT_DEFAULT_PERMS, can_manage_user, can_assign_departments, create_user, delete_user
 
 
 class ModernSelectionPopup(QDialog):
@@ -726,7 +726,7 @@ class RoleSettingsDialog(QDialog):
         if not txt:
             if self._all_user_docs is None:
                 try:
-                    self._all_user_docs = list_users() or []
+                    self._all_user_docs = list_users(fields=USER_DIRECTORY_FIELDS) or []
                 except Exception:
                     self._all_user_docs = []
             suggestions = []
@@ -753,7 +753,7 @@ class RoleSettingsDialog(QDialog):
         
         if self._all_user_docs is None:
             try:
-                self._all_user_docs = list_users() or []
+                self._all_user_docs = list_users(fields=USER_DIRECTORY_FIELDS) or []
             except Exception:
                 self._all_user_docs = []
         
@@ -5,13 +5,15 @@ class ItemPickerPopup(QFrame):
     """Lightweight suggestion popup implemented with QListWidget.
     Styled dark, rounded, larger and closes when focus/window deactivates.
     """
-    def __init__(self, items, parent=None, on_select=None):
+    def __init__(self, items, parent=None, on_select=None, suggester=None):
         # Create as top-level popup (no parent) so it floats above main window reliably
         super().__init__(None, Qt.WindowType.Popup | Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         self._owner = parent
         self.on_select = on_select
         self._items = list(items)
+        # optional ItemSuggester; filter() ranks through it instead of scanning _items
+        self.suggester = suggester
 
         # Dark, rounded, larger styling
         self.setStyleSheet('''
@@ -75,9 +77,12 @@ class ItemPickerPopup(QFrame):
     def filter(self, text):
         txt = (text or '').lower().strip()
         self.list.clear()
-        for it in self._items:
-            if not txt or txt in it.lower():
-                self.list.addItem(QListWidgetItem(it))
+        if self.suggester is not None:
+            matches = self.suggester.suggest(txt)
+        else:
+            matches = [it for it in self._items if not txt or txt in it.lower()]
+        for it in matches:
+            self.list.addItem(QListWidgetItem(it))
         self._clamp_height()
 
     def show_at_widget(self, widget):
@@ -0,0 +1,174 @@
+from PyQt6.QtWidgets import QStyledItemDelegate
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, QRectF, QSize
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPen
+from .transaction_table import format_display_amount, TransactionDelegate
+
+STATS_HEADERS = ["Предмет", "Кол-во", "За шт.", "Сумма"]
+STAT_NAME, STAT_QTY, STAT_AVG, STAT_SUM = range(4)
+
+_stats_font = None
+
+
+def stats_font() -> QFont:
+    """The one font the stats model and delegate share (created after QApplication)."""
+    global _stats_font
+    if _stats_font is None:
+        _stats_font = QFont("Segoe UI", 10, QFont.Weight.Bold)
+    return _stats_font
+
+
+class ItemStatsModel(QAbstractTableModel):
+    """Table model over an ItemStats aggregate (modules/core/transaction_index.py).
+    Aggregate notifications map to row inserts/removals and single-row
+    dataChanged, so an edit repaints only the item it touched. The display
+    strings of an item are formatted once and reused until its values change.
+    """
+
+    def __init__(self, stats, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self.stats.add_listener(self._on_stats_event)
+        self._bold_font = stats_font()
+        self._texts = {}    # item key -> (name, qty, total, cell strings)
+
+    def _on_stats_event(self, event, *args):
+        if event == 'reset':
+            self.beginResetModel()
+            # Entries that survive a period change keep their strings
+            if len(self._texts) > 2 * len(self.stats) + 64:
+                entries = self.stats.entries
+                self._texts = {k: v for k, v in self._texts.items() if k in entries}
+            self.endResetModel()
+        elif event == 'before_insert':
+            self.beginInsertRows(QModelIndex(), args[0], args[0])
+        elif event == 'insert':
+            self.endInsertRows()
+        elif event == 'before_remove':
+            self.beginRemoveRows(QModelIndex(), args[0], args[0])
+        elif event == 'remove':
+            self.endRemoveRows()
+        elif event == 'update':
+            pos = args[0]
+            self.dataChanged.emit(self.index(pos, STAT_QTY), self.index(pos, STAT_SUM))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.stats)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(STATS_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(STATS_HEADERS):
+                return STATS_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def row_texts(self, row: int):
+        """(name, qty, avg, sum) display strings of a row."""
+        key, (name, qty, total, _count) = self.stats.entry(row)
+        cached = self._texts.get(key)
+        if cached is not None and cached[1] == qty and cached[2] == total and cached[0] == name:
+            return cached[3]
+        texts = (name, str(qty), format_display_amount(int(total / qty) if qty else 0, show_sign=False),
+                 format_display_amount(total, show_sign=False))
+        self._texts[key] = (name, qty, total, texts)
+        return texts
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.stats):
+            return None
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.row_texts(index.row())[col]
+        if role == Qt.ItemDataRole.FontRole:
+            return self._bold_font
+        if role == Qt.ItemDataRole.TextAlignmentRole and col != STAT_NAME:
+            return int(Qt.AlignmentFlag.AlignCenter)
+        return None
+
+
+class ItemStatsFilterModel(QSortFilterProxyModel):
+    """Case-insensitive substring filter on the item name column."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFilterKeyColumn(STAT_NAME)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self._filter_text = ''
+
+    def set_filter_text(self, text):
+        text = (text or '').strip()
+        if text != self._filter_text:
+            self._filter_text = text
+            self.setFilterFixedString(text)
+
+
+class ItemStatsDelegate(QStyledItemDelegate):
+    """Paints the stats cells directly: the rounded cell box of the table
+    stylesheet and the bold text, without going through the style. Text widths
+    and elided strings are cached, so a repaint costs the visible cells only.
+    """
+
+    CELL_COLOR = QColor("#333333")
+    BORDER_COLOR = QColor("#404040")
+    TEXT_COLOR = QColor("#dddddd")
+    CACHE_LIMIT = 4096
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font = stats_font()
+        self._metrics = QFontMetrics(self._font)
+        self._border_pen = QPen(self.BORDER_COLOR, 1)
+        self._widths = {}    # text -> advance width
+        self._elided = {}    # (text, width) -> elided text
+
+    def _width(self, text: str) -> int:
+        w = self._widths.get(text)
+        if w is None:
+            if len(self._widths) >= self.CACHE_LIMIT:
+                self._widths.clear()
+            w = self._widths[text] = self._metrics.horizontalAdvance(text)
+        return w
+
+    def _fit(self, text: str, width: int) -> str:
+        if self._width(text) <= width:
+            return text
+        key = (text, width)
+        elided = self._elided.get(key)
+        if elided is None:
+            if len(self._elided) >= self.CACHE_LIMIT:
+                self._elided.clear()
+            elided = self._elided[key] = self._metrics.elidedText(text, Qt.TextElideMode.ElideRight, width)
+        return elided
+
+    def paint(self, painter, option, index):
+        text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        box = TransactionDelegate.cell_box(option.rect)
+        painter.save()
+        try:
+            painter.setRenderHint(painter.RenderHint.Antialiasing, True)
+            painter.setPen(self._border_pen)
+            painter.setBrush(self.CELL_COLOR)
+            painter.drawRoundedRect(QRectF(box).adjusted(0.5, 0.5, -0.5, -0.5), 6, 6)
+            painter.setFont(self._font)
+            painter.setPen(self.TEXT_COLOR)
+            if index.column() == STAT_NAME:
+                r = box.adjusted(8, 0, -6, 0)
+                painter.drawText(r, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, self._fit(text, r.width()))
+            else:
+                r = box.adjusted(3, 0, -3, 0)
+                painter.drawText(r, Qt.AlignmentFlag.AlignCenter, self._fit(text, r.width()))
+        finally:
+            painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(self._width(index.data(Qt.ItemDataRole.DisplayRole) or "") + 22, 40)
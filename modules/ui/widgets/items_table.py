@@ -0,0 +1,228 @@
+from PyQt6.QtWidgets import QStyleOptionViewItem, QStyle, QLineEdit, QAbstractSpinBox, QApplication
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QRectF
+from PyQt6.QtGui import QColor, QFont, QPen
+from modules.core.item_catalog import ItemCatalog, PRICE_RANGE
+from .custom_controls import NoScrollSpinBox
+from .transaction_table import TransactionDelegate, TransactionTableView
+
+# Column layout of the governor items table
+ITEM_COL_NAME, ITEM_COL_PRICE, ITEM_COL_DELETE = range(3)
+ITEM_HEADERS = ["Название предмета", "Базовая цена", "x"]
+
+
+class ItemsTableModel(QAbstractTableModel):
+    """Table model over an ItemCatalog (modules/core/item_catalog.py), with a
+    trailing '+' row like TransactionTableModel. Model row == catalog row.
+    """
+    _FIELD_COLUMNS = {'name': ITEM_COL_NAME, 'price': ITEM_COL_PRICE}
+
+    def __init__(self, catalog=None, parent=None):
+        super().__init__(parent)
+        self.store = catalog if catalog is not None else ItemCatalog()
+        self.store.add_listener(self._on_catalog_event)
+        self._bold_font = QFont("Segoe UI", 10, QFont.Weight.Bold)
+
+    def _on_catalog_event(self, event, *args):
+        if event == 'before_reset':
+            self.beginResetModel()
+        elif event == 'reset':
+            self.endResetModel()
+        elif event == 'before_insert':
+            self.beginInsertRows(QModelIndex(), args[0], args[1])
+        elif event == 'insert':
+            self.endInsertRows()
+        elif event == 'before_remove':
+            self.beginRemoveRows(QModelIndex(), args[0], args[1])
+        elif event == 'remove':
+            self.endRemoveRows()
+        elif event == 'update':
+            row, fields = args[0], args[1]
+            cols = [self._FIELD_COLUMNS[f] for f in fields if f in self._FIELD_COLUMNS]
+            if cols:
+                self.dataChanged.emit(self.index(row, min(cols)), self.index(row, max(cols)))
+
+    def transaction_count(self) -> int:
+        return len(self.store)
+
+    def is_add_row(self, row: int) -> bool:
+        return row == len(self.store)
+
+    def store_row(self, row: int) -> int:
+        return row if 0 <= row < len(self.store) else -1
+
+    # --- QAbstractTableModel -------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store) + 1
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(ITEM_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return ITEM_HEADERS[section] if 0 <= section < len(ITEM_HEADERS) else None
+        if role == Qt.ItemDataRole.ToolTipRole and section == ITEM_COL_DELETE:
+            return "Удалить"
+        if role == Qt.ItemDataRole.TextAlignmentRole and section == ITEM_COL_DELETE:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled
+        if not self.is_add_row(index.row()) and index.column() in (ITEM_COL_NAME, ITEM_COL_PRICE):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if self.is_add_row(row):
+            return "+" if role == Qt.ItemDataRole.DisplayRole and col == ITEM_COL_NAME else None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if col == ITEM_COL_NAME:
+                return self.store.names[row]
+            if col == ITEM_COL_PRICE:
+                price = self.store.prices[row]
+                return price if role == Qt.ItemDataRole.EditRole else f"${price}"
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.FontRole:
+            return self._bold_font
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or self.is_add_row(index.row()):
+            return False
+        field = {ITEM_COL_NAME: 'name', ITEM_COL_PRICE: 'price'}.get(index.column())
+        if field is None:
+            return False
+        try:
+            self.store.set_field(index.row(), field, value)
+        except Exception:
+            return False
+        return True
+
+
+class ItemsDelegate(TransactionDelegate):
+    """Paints the items table (white name box, '$' price box, delete square and the
+    dashed '+' row) and opens a real editor only for the cell being edited.
+    Uses delete_clicked(row) and add_clicked() from TransactionDelegate.
+    """
+
+    @classmethod
+    def name_box(cls, rect: QRect) -> QRect:
+        return cls.cell_box(rect).adjusted(5, 5, -5, -5)
+
+    def paint(self, painter, option, index):
+        model = index.model()
+        row, col = index.row(), index.column()
+        if model.is_add_row(row):
+            self._paint_add_row(painter, option)
+            return
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.state &= ~(QStyle.StateFlag.State_Selected | QStyle.StateFlag.State_HasFocus)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+        painter.save()
+        try:
+            painter.setRenderHint(painter.RenderHint.Antialiasing, True)
+            hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+            text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+            if col == ITEM_COL_NAME:
+                r = self.name_box(option.rect)
+                painter.setPen(QPen(QColor("#555555"), 1))
+                painter.setBrush(QColor("#ffffff"))
+                painter.drawRoundedRect(QRectF(r).adjusted(0.5, 0.5, -0.5, -0.5), 4, 4)
+                painter.setFont(self._font)
+                text_rect = r.adjusted(4, 0, -4, 0)
+                if text:
+                    painter.setPen(QColor("#000000"))
+                    elided = painter.fontMetrics().elidedText(text, Qt.TextElideMode.ElideRight, text_rect.width())
+                    painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, elided)
+                else:
+                    painter.setPen(QColor("#8a8a8a"))
+                    painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "Название")
+            elif col == ITEM_COL_PRICE:
+                r = self.number_box(option.rect)
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor("#f0f0f0") if hovered else QColor("#ffffff"))
+                painter.drawRoundedRect(QRectF(r), 4, 4)
+                painter.setPen(QColor("#000000"))
+                painter.setFont(self._font)
+                painter.drawText(r, Qt.AlignmentFlag.AlignCenter, text)
+            elif col == ITEM_COL_DELETE:
+                self.paint_delete_box(painter, self.cell_box(option.rect), hovered)
+        finally:
+            painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        try:
+            if (event.type() == QEvent.Type.MouseButtonRelease
+                    and event.button() == Qt.MouseButton.LeftButton):
+                if model.is_add_row(index.row()):
+                    self.add_clicked.emit()
+                    return True
+                if (index.column() == ITEM_COL_DELETE
+                        and self.cell_box(option.rect).contains(event.position().toPoint())):
+                    self.delete_clicked.emit(index.row())
+                    return True
+        except Exception:
+            pass
+        return super(TransactionDelegate, self).editorEvent(event, model, option, index)
+
+    def createEditor(self, parent, option, index):
+        col = index.column()
+        if col == ITEM_COL_NAME:
+            le = QLineEdit(parent)
+            le.setPlaceholderText("Название")
+            le.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            le.setStyleSheet("""
+                QLineEdit {
+                    background-color: white;
+                    color: black;
+                    border: 1px solid #555555;
+                    border-radius: 4px;
+                    font-weight: bold;
+                    padding: 2px;
+                }
+            """)
+            # Commit on every keystroke so the catalog (and sync) follow the typed name
+            le.textChanged.connect(lambda _txt, e=le: self.commitData.emit(e))
+            self._register_editor(le, index)
+            return le
+        if col == ITEM_COL_PRICE:
+            spin = NoScrollSpinBox(parent)
+            spin.setRange(*PRICE_RANGE)
+            spin.setPrefix("$")
+            spin.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            try:
+                spin.setButtonSymbols(QAbstractSpinBox.ButtonSymbols.NoButtons)
+            except Exception:
+                pass
+            spin.valueChanged.connect(lambda _v, e=spin: self.commitData.emit(e))
+            self._register_editor(spin, index)
+            return spin
+        return None
+
+    def updateEditorGeometry(self, editor, option, index):
+        if index.column() == ITEM_COL_NAME:
+            editor.setGeometry(self.name_box(option.rect))
+        else:
+            editor.setGeometry(self.cell_box(option.rect))
+
+
+class ItemsTableView(TransactionTableView):
+    CLICKABLE_COLUMNS = (ITEM_COL_DELETE,)
@@ -0,0 +1,182 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QTableView,
+                             QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt6.QtGui import QFont
+
+from modules.core.rollup import (INCOME, EXPENSE, QTY, MONTH_NAMES, day_buckets, month_range, year_range,
+                                 bucket_label)
+from modules.core.transaction_store import today_day
+from .transaction_table import format_display_amount
+
+# (mode, combo label)
+REPORT_MODES = (
+    ('month', "Этот месяц / прошлый месяц"),
+    ('year', "Этот год / прошлый год"),
+    ('trend', "Тренд по месяцам: год к году"),
+)
+
+
+def _delta_pct(new, old) -> str:
+    if not old:
+        return "—"
+    return f"{(new - old) * 100 / abs(old):+.0f}%"
+
+
+class ReportTableModel(QAbstractTableModel):
+    """Read-only table of preformatted report cells; row 0 is the bold total row."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = []
+        self.rows = []
+        self._bold_font = QFont("Segoe UI", 10, QFont.Weight.Bold)
+
+    def set_table(self, headers, rows):
+        self.beginResetModel()
+        self.headers = list(headers)
+        self.rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self.headers):
+                return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.FontRole and index.row() == 0:
+            return self._bold_font
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if index.column() == 0:
+                return Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+
+class PeriodReportDialog(QDialog):
+    """Period comparisons answered from a LedgerRollup (modules/core/rollup.py).
+    Refreshes itself, at most once per event-loop pass, when the rollup changes.
+    """
+
+    def __init__(self, rollup, parent=None):
+        super().__init__(parent)
+        self.rollup = rollup
+        self.setWindowTitle("Отчёт по периодам")
+        self.resize(760, 520)
+        self.setStyleSheet("""
+            QDialog { background-color: #1f1f1f; color: #ffffff; }
+            QLabel { color: #ffffff; }
+            QComboBox { background-color: #2d2d2d; color: white; border: 1px solid #555555; border-radius: 4px; padding: 4px 8px; }
+            QTableView { background-color: #2d2d2d; color: white; border: none; }
+            QHeaderView::section { background-color: #333333; color: white; border: none; padding: 6px; }
+        """)
+
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Сравнение:"))
+        self.mode_combo = QComboBox()
+        for _mode, label in REPORT_MODES:
+            self.mode_combo.addItem(label)
+        self.mode_combo.currentIndexChanged.connect(lambda _i: self.refresh())
+        top.addWidget(self.mode_combo, stretch=1)
+        layout.addLayout(top)
+
+        self.caption = QLabel("")
+        layout.addWidget(self.caption)
+
+        self.model = ReportTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setShowGrid(False)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self._refresh_pending = False
+        self.rollup.add_listener(self._on_rollup_event)
+        self.refresh()
+
+    def _on_rollup_event(self, event, *args):
+        if self._refresh_pending or not self.isVisible():
+            return
+        self._refresh_pending = True
+        QTimer.singleShot(0, self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        return super().showEvent(event)
+
+    def done(self, result):
+        self.rollup.remove_listener(self._on_rollup_event)
+        return super().done(result)
+
+    def refresh(self):
+        self._refresh_pending = False
+        mode = REPORT_MODES[max(0, self.mode_combo.currentIndex())][0]
+        month, year = day_buckets(today_day())
+        try:
+            if mode == 'month':
+                self._show_compare(month_range(month), month_range(month - 1),
+                                   bucket_label('month', month), bucket_label('month', month - 1))
+            elif mode == 'year':
+                self._show_compare(year_range(year), year_range(year - 1), str(year), str(year - 1))
+            else:
+                self._show_trend(year)
+        except Exception as e:
+            print(f"[PeriodReport] refresh failed: {e}")
+
+    def _show_compare(self, current, previous, cur_label, prev_label):
+        rollup = self.rollup
+        cur_items = rollup.item_totals(*current)
+        prev_items = rollup.item_totals(*previous)
+        cur_total = rollup.range_totals(*current)
+        prev_total = rollup.range_totals(*previous)
+
+        def row(name, cur, prev):
+            cur_net = cur[INCOME] + cur[EXPENSE]
+            prev_net = prev[INCOME] + prev[EXPENSE]
+            return [name, str(cur[QTY]), format_display_amount(cur_net), str(prev[QTY]),
+                    format_display_amount(prev_net), format_display_amount(cur_net - prev_net),
+                    _delta_pct(cur_net, prev_net)]
+
+        empty = (0, 0, 0, 0)
+        keys = sorted(set(cur_items) | set(prev_items),
+                      key=lambda k: -abs(sum(cur_items.get(k, empty)[:2])) - abs(sum(prev_items.get(k, empty)[:2])))
+        rows = [row("Итого", cur_total, prev_total)]
+        rows.extend(row(rollup.names.get(k, k) or "(без названия)", cur_items.get(k, empty), prev_items.get(k, empty))
+                    for k in keys)
+        headers = ["Предмет", f"Кол-во {cur_label}", f"Сумма {cur_label}", f"Кол-во {prev_label}",
+                   f"Сумма {prev_label}", "Разница", "%"]
+        self.caption.setText(f"{cur_label} по сравнению с {prev_label}: сумма доходов и расходов по предметам")
+        self.model.set_table(headers, rows)
+
+    def _show_trend(self, year):
+        rollup = self.rollup
+        first = year * 12
+        cur = rollup.series('month', first, first + 11)
+        prev = rollup.series('month', first - 12, first - 1)
+        cur_total = rollup.range_totals(*year_range(year))
+        prev_total = rollup.range_totals(*year_range(year - 1))
+
+        def row(name, c, p):
+            return [name, format_display_amount(p[EXPENSE]), format_display_amount(c[EXPENSE]),
+                    _delta_pct(-c[EXPENSE], -p[EXPENSE]), format_display_amount(p[INCOME]),
+                    format_display_amount(c[INCOME]), _delta_pct(c[INCOME], p[INCOME])]
+
+        rows = [row("Итого", cur_total, prev_total)]
+        rows.extend(row(MONTH_NAMES[m], cur[m][1], prev[m][1]) for m in range(12))
+        headers = ["Месяц", f"Расходы {year - 1}", f"Расходы {year}", "%",
+                   f"Доходы {year - 1}", f"Доходы {year}", "%"]
+        self.caption.setText(f"Помесячно: {year} по сравнению с {year - 1}")
+        self.model.set_table(headers, rows)
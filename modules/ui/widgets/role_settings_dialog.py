@@ -7,7 +7,7 @@ from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QStringListModel, QPropertyAnim
 from PyQt6.QtGui import QFont, QPalette, QColor, QIcon
 from PyQt6.QtWidgets import QCompleter
 
-from modules.core.firebase_service import get_usernames, get_user, list_users, can_assign_role, save_user_roles, resolve_user_permissions, DEPT_DEFAULT_PERMS, can_manage_user, can_assign_departments, create_user, delete_user
+from modules.core.firebase_service import get_usernames, get_user, list_users, USER_DIRECTORY_FIELDS, can_assign_role, save_user_roles, resolve_user_permissions, DEPT_DEFAULT_PERMS, can_manage_user, can_assign_departments, can_assign_permission, create_user, delete_user, bulk_update_user_roles, get_department_index
 
 # Reusable style for completer popup dropdowns
 COMPLETER_POPUP_STYLE = """
@@ -51,6 +51,17 @@ QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
 }
 """
 
+# Human-readable names of permission keys
+PERM_TRANSLATIONS = {
+    'admin.full': 'Полный доступ (Админ)',
+    'governor.access': 'Доступ губернатора',
+    'ut.view': 'Просмотр УТ',
+    'ut.edit': 'Редактирование УТ',
+    'ut.upload': 'Загрузка УТ',
+    'ut.sync': 'Синхронизация УТ',
+    'ut.access': 'Доступ к УТ'
+}
+
 # Custom list widget to distinguish clicks on the checkbox indicator vs the row
 class ModernListWidget(QListWidget):
     def mousePressEvent(self, event):
@@ -332,6 +343,10 @@ class RoleSettingsDialog(QDialog):
         self.mode_delete_btn.setCheckable(True)
         self.mode_delete_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         
+        self.mode_bulk_btn = QPushButton("👥 Массовое назначение")
+        self.mode_bulk_btn.setCheckable(True)
+        self.mode_bulk_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        
         # Проверка прав
         try:
             res = resolve_user_permissions(self.current_user) if self.current_user else {}
@@ -367,14 +382,17 @@ class RoleSettingsDialog(QDialog):
         self.mode_roles_btn.setStyleSheet(mode_button_style)
         self.mode_add_btn.setStyleSheet(mode_button_style)
         self.mode_delete_btn.setStyleSheet(mode_button_style)
+        self.mode_bulk_btn.setStyleSheet(mode_button_style)
         
         self.mode_roles_btn.clicked.connect(lambda: self.set_mode('roles'))
         self.mode_add_btn.clicked.connect(lambda: self.set_mode('add'))
         self.mode_delete_btn.clicked.connect(lambda: self.set_mode('delete'))
+        self.mode_bulk_btn.clicked.connect(lambda: self.set_mode('bulk'))
         
         mode_layout.addWidget(self.mode_roles_btn)
         mode_layout.addWidget(self.mode_add_btn)
         mode_layout.addWidget(self.mode_delete_btn)
+        mode_layout.addWidget(self.mode_bulk_btn)
         mode_layout.addStretch()
         
         layout.addWidget(mode_panel)
@@ -460,9 +478,11 @@ class RoleSettingsDialog(QDialog):
         # Панели для добавления/удаления
         self.add_panel = self.create_add_panel()
         self.delete_panel = self.create_delete_panel()
+        self.bulk_panel = self.create_bulk_panel()
         
         content_layout.addWidget(self.add_panel)
         content_layout.addWidget(self.delete_panel)
+        content_layout.addWidget(self.bulk_panel)
         
         # Информационная панель
         self.info_group = QGroupBox("Информация о пользователе")
@@ -623,6 +643,12 @@ class RoleSettingsDialog(QDialog):
         self.selected_depts = []
         self.selected_perms = []
         self._all_user_docs = None
+        # The shared index only follows this process's writes; reload it so the
+        # dialog sees users added or changed by other clients
+        try:
+            get_department_index(refresh=True)
+        except Exception:
+            pass
         
         # Подключение сигналов
         self.input_username.textChanged.connect(self.on_username_typed)
@@ -728,70 +754,52 @@ class RoleSettingsDialog(QDialog):
 
     def _is_doc_manageable(self, d):
         """Return True if the current_user may manage the user document d.
-        Updated rule: for users with restricted roles (Minister/Head/Deputy) the
-        assigner may manage the target only when they share at least one
-        department. Targets without departments are NOT manageable by these
-        restricted assigners. Global roles (Admin/Governor) keep backend ACL.
+        Same rule as the department index (can_manage_user on resolved
+        permissions): restricted assigners (Minister/Head/Deputy) manage only
+        targets sharing a department with them, counting role-implied departments.
         """
         try:
-            # Basic backend ACL first
-            if not can_manage_user(self.current_user, d):
-                return False
-        except Exception:
-            return False
-
-        try:
-            assigner_res = resolve_user_permissions(self.current_user) if self.current_user else {}
-            assigner_roles = set(assigner_res.get('roles', []))
-            assigner_depts = set(assigner_res.get('departments', []))
-            # Roles that are limited to managing only same-department users
-            restricted_roles = {'Minister', 'Head', 'Deputy'}
-
-            # If assigner has a restricted role, enforce department intersection
-            if assigner_roles & restricted_roles:
-                target_depts = set(d.get('departments') or [])
-                # Require target to have departments and share at least one
-                if not target_depts:
-                    return False
-                if not (assigner_depts & target_depts):
-                    return False
+            return bool(self.current_user) and can_manage_user(self.current_user, d)
         except Exception:
             # On error resolving permissions, deny management
             return False
 
-        return True
-
     def _can_manage_doc(self, d):
-        # Delegate to the stricter _is_doc_manageable implementation to keep
-        # listing and editing checks consistent (restrict Heads/Ministers/Deputies
-        # to same-department targets).
+        # Delegate to _is_doc_manageable so listing and editing checks agree with
+        # the department index the suggestion lists come from.
         try:
             return self._is_doc_manageable(d)
         except Exception:
             return False
 
-    def _refresh_user_suggestions(self):
-        # Load all manageable users and update completer models
+    def _manageable_usernames(self):
+        """Return the set of usernames the current user may manage.
+        Answered from the shared department index; falls back to checking each
+        directory document when the index cannot be loaded.
+        """
+        try:
+            return get_department_index().manageable_by(self.current_user or {})
+        except Exception:
+            pass
         if self._all_user_docs is None:
             try:
-                self._all_user_docs = list_users() or []
+                self._all_user_docs = list_users(fields=USER_DIRECTORY_FIELDS) or []
             except Exception:
                 self._all_user_docs = []
-        suggestions = []
+        names = set()
         for d in self._all_user_docs:
             try:
                 name = d.get('username') or d.get('login') or ''
-                if not name:
-                    continue
-                try:
-                    # Use unified manageability check that includes department rules
-                    if not self._can_manage_doc(d):
-                        continue
-                except Exception:
-                    continue
-                suggestions.append(name)
+                # Use unified manageability check that includes department rules
+                if name and self._can_manage_doc(d):
+                    names.add(name)
             except Exception:
                 continue
+        return names
+
+    def _refresh_user_suggestions(self):
+        # Load all manageable users and update completer models
+        suggestions = list(self._manageable_usernames())
         suggestions = sorted(suggestions)
         try:
             self.completer_model.setStringList(suggestions)
@@ -970,6 +978,256 @@ class RoleSettingsDialog(QDialog):
         except Exception:
             pass
 
+    def create_bulk_panel(self):
+        panel = QWidget()
+        panel.setStyleSheet("""
+            QWidget {
+                background-color: #363636;
+                border-radius: 16px;
+            }
+        """)
+        layout = QVBoxLayout(panel)
+        layout.setContentsMargins(18, 18, 18, 18)
+        layout.setSpacing(12)
+        
+        self.bulk_filter = QLineEdit()
+        self.bulk_filter.setPlaceholderText("Фильтр пользователей...")
+        self.bulk_filter.setStyleSheet("""
+            QLineEdit {
+                background-color: #404040;
+                color: white;
+                border: 1px solid #505050;
+                border-radius: 12px;
+                padding: 10px 16px;
+                font-size: 15px;
+            }
+            QLineEdit:focus {
+                border-color: #2a82da;
+            }
+        """)
+        self.bulk_filter.textChanged.connect(self._filter_bulk_users)
+        layout.addWidget(self.bulk_filter)
+        
+        # Checkable directory of users the current user may manage
+        self.bulk_users_list = ModernListWidget()
+        try:
+            self.bulk_users_list.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+            self.bulk_users_list.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        except Exception:
+            pass
+        self.bulk_users_list.setStyleSheet("""
+            QListWidget {
+                background-color: #2d2d2d;
+                border: 1px solid #404040;
+                border-radius: 12px;
+                padding: 6px;
+                outline: none;
+                color: white;
+            }
+            QListWidget::item {
+                padding: 6px 10px;
+                border-radius: 8px;
+                font-size: 14px;
+            }
+            QListWidget::item:hover {
+                background-color: #4a4a4a;
+            }
+            QListWidget::item:selected {
+                background-color: transparent;
+                color: #ffffff;
+            }
+        """)
+        self.bulk_users_list.setMinimumHeight(160)
+        layout.addWidget(self.bulk_users_list)
+        
+        select_layout = QHBoxLayout()
+        btn_all = self.create_action_button("Выбрать всех", "#2a82da")
+        btn_all.clicked.connect(lambda: self._set_bulk_checked(True))
+        btn_none = self.create_action_button("Снять выбор", "#2a82da")
+        btn_none.clicked.connect(lambda: self._set_bulk_checked(False))
+        select_layout.addWidget(btn_all)
+        select_layout.addWidget(btn_none)
+        select_layout.addStretch()
+        layout.addLayout(select_layout)
+        
+        # Delta: what to add and what to remove for every selected user
+        delta_layout = QHBoxLayout()
+        self.bulk_add_btn = self.create_action_button("➕ Добавить…", "#27ae60")
+        self.bulk_add_btn.clicked.connect(lambda: self._open_bulk_delta_menu('add'))
+        self.bulk_remove_btn = self.create_action_button("➖ Убрать…", "#e67e22")
+        self.bulk_remove_btn.clicked.connect(lambda: self._open_bulk_delta_menu('remove'))
+        delta_layout.addWidget(self.bulk_add_btn)
+        delta_layout.addWidget(self.bulk_remove_btn)
+        delta_layout.addStretch()
+        self.bulk_apply_btn = QPushButton("💾 Применить")
+        self.bulk_apply_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #27ae60;
+                color: white;
+                border: none;
+                border-radius: 12px;
+                padding: 12px 25px;
+                font-weight: 600;
+                font-size: 15px;
+            }
+            QPushButton:hover {
+                background-color: #2ecc71;
+            }
+        """)
+        self.bulk_apply_btn.clicked.connect(self._on_bulk_apply)
+        delta_layout.addWidget(self.bulk_apply_btn)
+        layout.addLayout(delta_layout)
+        
+        self.bulk_summary = QLabel("")
+        self.bulk_summary.setWordWrap(True)
+        self.bulk_summary.setStyleSheet("color: #b0b0b0; font-size: 14px; background: none;")
+        layout.addWidget(self.bulk_summary)
+        
+        self.bulk_delta = {
+            'add': {'roles': [], 'departments': [], 'permissions': []},
+            'remove': {'roles': [], 'departments': [], 'permissions': []},
+        }
+        return panel
+    
+    def _reset_bulk_delta(self):
+        self.bulk_delta = {
+            'add': {'roles': [], 'departments': [], 'permissions': []},
+            'remove': {'roles': [], 'departments': [], 'permissions': []},
+        }
+        self._update_bulk_summary()
+    
+    def _refresh_bulk_users(self):
+        # Same directory and ACL filter as the single-user completer
+        self.bulk_users_list.clear()
+        for name in sorted(self._manageable_usernames()):
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            self.bulk_users_list.addItem(item)
+        self._filter_bulk_users(self.bulk_filter.text())
+    
+    def _filter_bulk_users(self, text):
+        txt = (text or '').strip().lower()
+        for i in range(self.bulk_users_list.count()):
+            item = self.bulk_users_list.item(i)
+            item.setHidden(bool(txt) and txt not in item.text().lower())
+    
+    def _set_bulk_checked(self, checked):
+        # Applies only to users matching the current filter
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        for i in range(self.bulk_users_list.count()):
+            item = self.bulk_users_list.item(i)
+            if not item.isHidden():
+                item.setCheckState(state)
+    
+    def _bulk_selected_users(self):
+        return [self.bulk_users_list.item(i).text() for i in range(self.bulk_users_list.count())
+                if self.bulk_users_list.item(i).checkState() == Qt.CheckState.Checked]
+    
+    def _open_bulk_delta_menu(self, op):
+        menu = QMenu(self)
+        menu.addAction("🎭 Роли", lambda: self._pick_bulk_delta(op, 'roles'))
+        menu.addAction("🏢 Отделы", lambda: self._pick_bulk_delta(op, 'departments'))
+        menu.addAction("🔑 Разрешения", lambda: self._pick_bulk_delta(op, 'permissions'))
+        btn = self.bulk_add_btn if op == 'add' else self.bulk_remove_btn
+        menu.exec(btn.mapToGlobal(QPoint(0, btn.height())))
+    
+    def _pick_bulk_delta(self, op, kind):
+        key_to_label = {v: k for k, v in self.label_to_key.items()}
+        if kind == 'roles':
+            options = {lbl: key for lbl, key in self.label_to_key.items()
+                       if can_assign_role(self.current_user, key)}
+        elif kind == 'departments':
+            depts = set()
+            for lst in self.role_to_depts.values():
+                depts.update(lst)
+            options = {d: d for d in sorted(depts)
+                       if can_assign_departments(self.current_user, [d])}
+        else:
+            perms = set()
+            for lst in DEPT_DEFAULT_PERMS.values():
+                perms.update(lst)
+            perms.update(p for p in PERM_TRANSLATIONS if p not in ('ut.sync', 'ut.access'))
+            options = {PERM_TRANSLATIONS.get(p, p): p for p in sorted(perms)
+                       if can_assign_permission(self.current_user, p)}
+        
+        if not options:
+            QMessageBox.information(self, "Нет доступных значений",
+                                  "У вас нет прав назначать эти значения.")
+            return
+        
+        current = self.bulk_delta[op][kind]
+        if kind == 'roles':
+            pre = [key_to_label.get(k, k) for k in current]
+        else:
+            pre = [lbl for lbl, key in options.items() if key in current]
+        title = ("Добавить: " if op == 'add' else "Убрать: ") + {
+            'roles': 'роли', 'departments': 'отделы', 'permissions': 'разрешения'}[kind]
+        popup = ModernSelectionPopup(self, title=title, items=list(options.keys()), preselected=pre)
+        center = self.mapToGlobal(self.rect().center())
+        popup.move(int(center.x() - popup.width()/2), int(center.y() - popup.height()/2))
+        if popup.exec() == QDialog.DialogCode.Accepted:
+            chosen = [options[lbl] for lbl in popup.selected() if lbl in options]
+            self.bulk_delta[op][kind] = chosen
+            # A value cannot be added and removed at the same time
+            other = 'remove' if op == 'add' else 'add'
+            self.bulk_delta[other][kind] = [v for v in self.bulk_delta[other][kind] if v not in chosen]
+            self._update_bulk_summary()
+    
+    def _update_bulk_summary(self):
+        key_to_label = {v: k for k, v in self.label_to_key.items()}
+        lines = []
+        for op, title in (('add', 'Добавить'), ('remove', 'Убрать')):
+            delta = self.bulk_delta[op]
+            parts = []
+            if delta['roles']:
+                parts.append('роли: ' + ', '.join(key_to_label.get(r, r) for r in delta['roles']))
+            if delta['departments']:
+                parts.append('отделы: ' + ', '.join(delta['departments']))
+            if delta['permissions']:
+                parts.append('разрешения: ' + ', '.join(PERM_TRANSLATIONS.get(p, p) for p in delta['permissions']))
+            if parts:
+                lines.append(f"{title} — " + '; '.join(parts))
+        self.bulk_summary.setText('\n'.join(lines) if lines else 'Изменения не выбраны')
+    
+    def _on_bulk_apply(self):
+        users = self._bulk_selected_users()
+        if not users:
+            QMessageBox.warning(self, "Ошибка", "Выберите хотя бы одного пользователя.")
+            return
+        add, remove = self.bulk_delta['add'], self.bulk_delta['remove']
+        if not any(add.values()) and not any(remove.values()):
+            QMessageBox.warning(self, "Ошибка", "Выберите роли, отделы или разрешения для изменения.")
+            return
+        
+        try:
+            results = bulk_update_user_roles(
+                self.current_user or {}, users,
+                add_roles=add['roles'], remove_roles=remove['roles'],
+                add_departments=add['departments'], remove_departments=remove['departments'],
+                add_permissions=add['permissions'], remove_permissions=remove['permissions'])
+        except Exception as e:
+            QMessageBox.critical(self, "Ошибка при сохранении", str(e))
+            return
+        
+        ok = [r['username'] for r in results if r.get('ok')]
+        failed = [f"{r['username']}: {r.get('error') or 'ошибка'}" for r in results if not r.get('ok')]
+        report = f"Обновлено пользователей: {len(ok)} из {len(results)}"
+        if failed:
+            report += "\n\nНе обновлены:\n" + '\n'.join(failed[:30])
+            if len(failed) > 30:
+                report += f"\n… и ещё {len(failed) - 30}"
+        if failed:
+            QMessageBox.warning(self, "Результат", report)
+        else:
+            QMessageBox.information(self, "Готово", report)
+        
+        # Directory changed (the department index is updated by the batch
+        # itself); drop the fallback cache so it is reloaded too
+        self._all_user_docs = None
+        self._reset_bulk_delta()
+        self._refresh_bulk_users()
+    
     def create_action_button(self, text, color):
         btn = QPushButton(text)
         btn.setStyleSheet(f"""
@@ -1008,11 +1266,14 @@ class RoleSettingsDialog(QDialog):
         self.mode_roles_btn.setChecked(mode == 'roles')
         self.mode_add_btn.setChecked(mode == 'add')
         self.mode_delete_btn.setChecked(mode == 'delete')
+        self.mode_bulk_btn.setChecked(mode == 'bulk')
         
         # Видимость панелей
         self.roles_input_widget.setVisible(mode == 'roles')
         self.add_panel.setVisible(mode == 'add')
         self.delete_panel.setVisible(mode == 'delete')
+        self.bulk_panel.setVisible(mode == 'bulk')
+        self.btn_save.setVisible(mode != 'bulk')
         
         # Видимость элементов управления ролями
         is_roles = (mode == 'roles')
@@ -1064,31 +1325,15 @@ class RoleSettingsDialog(QDialog):
         if mode == 'roles':
             # Do not autofocus; require user click to activate input to avoid immediate focus when dialog opens
             pass
+        elif mode == 'bulk':
+            self._reset_bulk_delta()
+            self._refresh_bulk_users()
     
     def on_username_typed(self, text):
         # ... (сохраняем логику из оригинального кода)
         txt = text.strip()
         if not txt:
-            if self._all_user_docs is None:
-                try:
-                    self._all_user_docs = list_users() or []
-                except Exception:
-                    self._all_user_docs = []
-            suggestions = []
-            for d in self._all_user_docs:
-                try:
-                    name = d.get('username') or d.get('login') or ''
-                    if not name:
-                        continue
-                    try:
-                        if not self._can_manage_doc(d):
-                            continue
-                    except Exception:
-                        continue
-                    suggestions.append(name)
-                except Exception:
-                    continue
-            self.completer_model.setStringList(sorted(suggestions))
+            self.completer_model.setStringList(sorted(self._manageable_usernames()))
             self.loaded_user = None
             self.btn_roles.setVisible(False)
             self.btn_depts.setVisible(False)
@@ -1096,33 +1341,9 @@ class RoleSettingsDialog(QDialog):
             self.info_group.setVisible(False)
             return
         
-        if self._all_user_docs is None:
-            try:
-                self._all_user_docs = list_users() or []
-            except Exception:
-                self._all_user_docs = []
-        
-        suggestions = []
         ltxt = txt.lower()
-        for d in self._all_user_docs:
-            try:
-                name = d.get('username') or d.get('login') or ''
-                if not name:
-                    continue
-                if ltxt not in name.lower():
-                    continue
-                try:
-                    if not self._can_manage_doc(d):
-                        continue
-                except Exception:
-                    continue
-                suggestions.append(name)
-                if len(suggestions) >= 200:
-                    break
-            except Exception:
-                continue
-        
-        self.completer_model.setStringList(sorted(suggestions))
+        suggestions = sorted(n for n in self._manageable_usernames() if ltxt in n.lower())
+        self.completer_model.setStringList(suggestions[:200])
         
     def on_username_selected(self, name):
         self.input_username.setText(name)
@@ -1302,16 +1523,7 @@ class RoleSettingsDialog(QDialog):
         except Exception:
             perms_list = []
             
-        # Словарь для перевода разрешений на человеческий язык
-        perm_translations = {
-            'admin.full': 'Полный доступ (Админ)',
-            'governor.access': 'Доступ губернатора',
-            'ut.view': 'Просмотр УТ',
-            'ut.edit': 'Редактирование УТ',
-            'ut.upload': 'Загрузка УТ',
-            'ut.sync': 'Синхронизация УТ',
-            'ut.access': 'Доступ к УТ'
-        }
+        perm_translations = PERM_TRANSLATIONS
         
         # Переводим список разрешений для отображения
         display_items = [perm_translations.get(p, p) for p in perms_list]
@@ -1342,16 +1554,7 @@ class RoleSettingsDialog(QDialog):
         
         perms = self.selected_perms if self.selected_perms else (self.loaded_user.get('permissions') if self.loaded_user else [])
         
-        # Словарь для перевода разрешений на человеческий язык
-        perm_translations = {
-            'admin.full': 'Полный доступ (Админ)',
-            'governor.access': 'Доступ губернатора',
-            'ut.view': 'Просмотр УТ',
-            'ut.edit': 'Редактирование УТ',
-            'ut.upload': 'Загрузка УТ',
-            'ut.sync': 'Синхронизация УТ',
-            'ut.access': 'Доступ к УТ'
-        }
+        perm_translations = PERM_TRANSLATIONS
         
         translated_perms = [perm_translations.get(p, p) for p in perms]
         
@@ -0,0 +1,569 @@
+from PyQt6.QtWidgets import (QTableView, QStyledItemDelegate, QStyleOptionViewItem, QStyle,
+                             QLineEdit, QAbstractSpinBox, QAbstractItemView, QApplication)
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QRectF,
+                          pyqtSignal)
+from PyQt6.QtGui import QColor, QFont, QPen, QBrush
+from modules.core.transaction_store import TransactionStore, day_to_date, date_to_day, format_display_amount
+from .custom_controls import NoScrollSpinBox
+
+# Column layout of the governor transactions table
+COL_NUM, COL_DATE, COL_TYPE, COL_ITEM, COL_QTY, COL_PRICE, COL_SUM, COL_DELETE = range(8)
+HEADERS = ["№", "Дата", "Тип", "Предмет|Услуга", "Кол-во", "Цена", "Сумма", "x"]
+
+QTY_RANGE = (-999999, 999999)
+PRICE_RANGE = (-1000000000, 1000000000)
+
+
+class TransactionTableModel(QAbstractTableModel):
+    """Table model viewing a TransactionStore (modules/core/transaction_store.py).
+    Cells are read straight from the store's arrays and store notifications are
+    translated into model signals. The model exposes one extra trailing row used
+    as the '+' (add) row.
+
+    By default model row == store row. `set_view(ids)` switches to showing only
+    the given row ids in that order (period filter / date sort) without touching
+    the store; rows added afterwards are appended to the end of the view.
+    Delegate signals and `store_row()` / `view_row()` translate between the two.
+    """
+    # store field -> (first, last) affected columns
+    _FIELD_COLUMNS = {
+        'day': (COL_DATE, COL_DATE),
+        'item': (COL_ITEM, COL_ITEM),
+        'is_income': (COL_TYPE, COL_SUM),
+        'qty': (COL_QTY, COL_SUM),
+        'price': (COL_PRICE, COL_SUM),
+    }
+    _COLUMN_FIELDS = {COL_TYPE: 'is_income', COL_ITEM: 'item', COL_QTY: 'qty', COL_PRICE: 'price'}
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else TransactionStore()
+        self.store.add_listener(self._on_store_event)
+        self._bold_font = QFont("Segoe UI", 10, QFont.Weight.Bold)
+        # None = all store rows in store order; otherwise a list of row ids
+        self._view = None
+        self._view_pos = {}
+        self._pending_remove = -1
+
+    # --- view permutation ------------------------------------------------------
+    def set_view(self, ids=None):
+        """Show the given row ids in this order (None = every row in store order)."""
+        self.beginResetModel()
+        if ids is None:
+            self._view = None
+            self._view_pos = {}
+        else:
+            self._view = list(ids)
+            self._view_pos = {rid: pos for pos, rid in enumerate(self._view)}
+        self.endResetModel()
+
+    def has_view(self) -> bool:
+        return self._view is not None
+
+    def store_row(self, row: int) -> int:
+        """Store row shown at model row `row` (-1 for the '+' row)."""
+        if self._view is None:
+            return row if 0 <= row < len(self.store) else -1
+        if 0 <= row < len(self._view):
+            return self.store.row_of(self._view[row])
+        return -1
+
+    def view_row(self, store_row: int) -> int:
+        """Model row showing a store row, -1 when it is outside the view."""
+        if store_row < 0 or store_row >= len(self.store):
+            return -1
+        if self._view is None:
+            return store_row
+        return self._view_pos.get(self.store.ids[store_row], -1)
+
+    def store_rows(self):
+        """Store rows in display order."""
+        if self._view is None:
+            return range(len(self.store))
+        row_of = self.store.row_of
+        return [row_of(rid) for rid in self._view]
+
+    def _on_store_event(self, event, *args):
+        if event == 'before_reset':
+            self.beginResetModel()
+        elif event == 'reset':
+            # A new data set starts unfiltered
+            self._view = None
+            self._view_pos = {}
+            self.endResetModel()
+        elif event == 'before_insert':
+            if self._view is None:
+                self.beginInsertRows(QModelIndex(), args[0], args[1])
+            else:
+                n = len(self._view)
+                self.beginInsertRows(QModelIndex(), n, n + args[1] - args[0])
+        elif event == 'insert':
+            if self._view is not None:
+                for row in range(args[0], args[1] + 1):
+                    rid = self.store.ids[row]
+                    self._view_pos[rid] = len(self._view)
+                    self._view.append(rid)
+            self.endInsertRows()
+        elif event == 'before_remove':
+            # The store removes one row at a time
+            pos = self.view_row(args[0])
+            self._pending_remove = pos
+            if pos >= 0:
+                self.beginRemoveRows(QModelIndex(), pos, pos)
+        elif event == 'remove':
+            pos, self._pending_remove = self._pending_remove, -1
+            if pos < 0:
+                return
+            if self._view is not None:
+                del self._view[pos]
+                self._view_pos = {rid: i for i, rid in enumerate(self._view)}
+            self.endRemoveRows()
+        elif event == 'update':
+            row, fields = self.view_row(args[0]), args[1]
+            cols = [c for f in fields for c in self._FIELD_COLUMNS.get(f, ())]
+            if cols and row >= 0:
+                self.dataChanged.emit(self.index(row, min(cols)), self.index(row, max(cols)))
+        elif event == 'before_reorder':
+            if self._view is None:
+                self.layoutAboutToBeChanged.emit()
+        elif event == 'reorder':
+            # A view holds row ids, so only the unfiltered layout moves
+            if self._view is not None:
+                return
+            order = args[0]
+            old_to_new = [0] * len(order)
+            for new_pos, old_pos in enumerate(order):
+                old_to_new[old_pos] = new_pos
+            old_persistent = self.persistentIndexList()
+            new_persistent = []
+            for idx in old_persistent:
+                r = idx.row()
+                if 0 <= r < len(old_to_new):
+                    new_persistent.append(self.index(old_to_new[r], idx.column()))
+                else:
+                    new_persistent.append(idx)
+            self.changePersistentIndexList(old_persistent, new_persistent)
+            self.layoutChanged.emit()
+
+    def transaction_count(self) -> int:
+        """Number of transaction rows shown (excluding the '+' row)."""
+        return len(self.store) if self._view is None else len(self._view)
+
+    def is_add_row(self, row: int) -> bool:
+        return row == self.transaction_count()
+
+    # --- QAbstractTableModel -------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.transaction_count() + 1
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section] if 0 <= section < len(HEADERS) else None
+        if role == Qt.ItemDataRole.ToolTipRole and section == COL_DELETE:
+            return "Удалить"
+        if role == Qt.ItemDataRole.TextAlignmentRole and section == COL_DELETE:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled
+        row, col = self.store_row(index.row()), index.column()
+        if row < 0:
+            return flags
+        if col in (COL_ITEM, COL_PRICE):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        elif col == COL_QTY and not self.store.income[row]:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = self.store_row(index.row()), index.column()
+        if row < 0:
+            return "+" if role == Qt.ItemDataRole.DisplayRole and col == COL_NUM else None
+        s = self.store
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if col == COL_NUM:
+                return str(index.row() + 1)
+            if col == COL_DATE:
+                return day_to_date(s.day[row])
+            if col == COL_TYPE:
+                return '+' if s.income[row] else '-'
+            if col == COL_ITEM:
+                return s.item_names[s.item_id[row]]
+            if col == COL_QTY:
+                if s.income[row]:
+                    return '' if role == Qt.ItemDataRole.DisplayRole else 0
+                return s.qty[row] if role == Qt.ItemDataRole.EditRole else str(s.qty[row])
+            if col == COL_PRICE:
+                return s.price[row] if role == Qt.ItemDataRole.EditRole else str(s.price[row])
+            if col == COL_SUM:
+                return format_display_amount(s.total[row])
+            return None
+        if role == Qt.ItemDataRole.UserRole:
+            if col == COL_TYPE:
+                return bool(s.income[row])
+            if col == COL_SUM:
+                return s.total[row]
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if col == COL_ITEM:
+                return Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.FontRole:
+            return self._bold_font
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        row = self.store_row(index.row()) if index.isValid() else -1
+        if row < 0 or role != Qt.ItemDataRole.EditRole:
+            return False
+        if index.column() == COL_DATE:
+            field, value = 'day', date_to_day(value)
+        else:
+            field = self._COLUMN_FIELDS.get(index.column())
+        if field is None:
+            return False
+        try:
+            self.store.set_field(row, field, value)
+        except Exception:
+            return False
+        return True
+
+
+class TransactionDelegate(QStyledItemDelegate):
+    """Paints the transaction cells (date link, +/- type square, white item/number boxes,
+    delete square, dashed '+' row) and creates a real editor only for the cell being edited.
+    Clicks on date/type/delete/add cells are reported through signals.
+    """
+    # Row arguments are store rows (TransactionTableModel.store_row)
+    date_clicked = pyqtSignal(int)
+    type_clicked = pyqtSignal(int)
+    delete_clicked = pyqtSignal(int)
+    add_clicked = pyqtSignal()
+    # (editor widget, row) emitted each time an item-name editor is opened
+    item_editor_created = pyqtSignal(object, int)
+
+    INCOME_COLOR = QColor("#55aa55")
+    EXPENSE_COLOR = QColor("#ff5555")
+    DELETE_COLOR = QColor("#ff5555")
+    DELETE_HOVER_COLOR = QColor("#ff7777")
+    ACCENT_COLOR = QColor("#4aa3df")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # open editor widget -> stable row id of the transaction it edits
+        self._editor_ids = {}
+        self._store = None
+        self._font = QFont("Segoe UI", 10, QFont.Weight.Bold)
+        self._sign_font = QFont("Segoe UI", 12, QFont.Weight.Bold)
+        self._plus_font = QFont("Segoe UI", 18, QFont.Weight.Bold)
+        self._delete_font = QFont()
+        self._delete_font.setPointSize(12)
+
+    # --- geometry helpers (mirror the ::item margins of the table stylesheet) ---
+    @staticmethod
+    def cell_box(rect: QRect) -> QRect:
+        return rect.adjusted(2, 0, -4, -8)
+
+    @classmethod
+    def item_box(cls, rect: QRect) -> QRect:
+        box = cls.cell_box(rect)
+        h = min(30, box.height())
+        return QRect(box.left() + 4, box.center().y() - h // 2, box.width() - 8, h)
+
+    @classmethod
+    def number_box(cls, rect: QRect) -> QRect:
+        box = cls.cell_box(rect)
+        h = min(25, box.height())
+        return QRect(box.left() + 5, box.center().y() - h // 2, box.width() - 10, h)
+
+    @classmethod
+    def type_box(cls, rect: QRect) -> QRect:
+        box = cls.cell_box(rect)
+        return QRect(box.center().x() - 14, box.center().y() - 14, 28, 28)
+
+    # --- painting ---------------------------------------------------------
+    def paint(self, painter, option, index):
+        model = index.model()
+        row, col = index.row(), index.column()
+        if model.is_add_row(row):
+            self._paint_add_row(painter, option)
+            return
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        # Never paint selection/focus; the row contents are drawn below
+        opt.state &= ~(QStyle.StateFlag.State_Selected | QStyle.StateFlag.State_HasFocus)
+        if col not in (COL_NUM, COL_SUM):
+            opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+        painter.save()
+        try:
+            painter.setRenderHint(painter.RenderHint.Antialiasing, True)
+            hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+            text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+            if col == COL_DATE:
+                painter.setFont(self._font)
+                painter.setPen(self.ACCENT_COLOR if hovered else QColor("#dddddd"))
+                painter.drawText(self.cell_box(option.rect), Qt.AlignmentFlag.AlignCenter, text)
+            elif col == COL_TYPE:
+                is_income = bool(index.data(Qt.ItemDataRole.UserRole))
+                r = self.type_box(option.rect)
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(self.INCOME_COLOR if is_income else self.EXPENSE_COLOR)
+                painter.drawRoundedRect(QRectF(r), 4, 4)
+                painter.setPen(QColor("#ffffff"))
+                painter.setFont(self._sign_font)
+                painter.drawText(r, Qt.AlignmentFlag.AlignCenter, text)
+            elif col == COL_ITEM:
+                r = self.item_box(option.rect)
+                painter.setPen(QPen(QColor("#555555"), 1))
+                painter.setBrush(QColor("#ffffff"))
+                painter.drawRoundedRect(QRectF(r).adjusted(0.5, 0.5, -0.5, -0.5), 6, 6)
+                painter.setFont(self._font)
+                text_rect = r.adjusted(9, 0, -9, 0)
+                if text:
+                    painter.setPen(QColor("#000000"))
+                    elided = painter.fontMetrics().elidedText(text, Qt.TextElideMode.ElideRight, text_rect.width())
+                    painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, elided)
+                else:
+                    painter.setPen(QColor("#8a8a8a"))
+                    painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft,
+                                     "Название предмета")
+            elif col in (COL_QTY, COL_PRICE):
+                if text != "":
+                    r = self.number_box(option.rect)
+                    painter.setPen(Qt.PenStyle.NoPen)
+                    painter.setBrush(QColor("#f0f0f0") if hovered else QColor("#ffffff"))
+                    painter.drawRoundedRect(QRectF(r), 4, 4)
+                    painter.setPen(QColor("#000000"))
+                    painter.setFont(self._font)
+                    painter.drawText(r, Qt.AlignmentFlag.AlignCenter, text)
+            elif col == COL_DELETE:
+                self.paint_delete_box(painter, self.cell_box(option.rect), hovered)
+        finally:
+            painter.restore()
+
+    def paint_delete_box(self, painter, r: QRect, hovered: bool):
+        """Red rounded square with the broom glyph (painter state is the caller's)."""
+        color = self.DELETE_HOVER_COLOR if hovered else self.DELETE_COLOR
+        painter.setPen(QPen(color, 2))
+        painter.setBrush(color)
+        painter.drawRoundedRect(QRectF(r).adjusted(1, 1, -1, -1), 4, 4)
+        painter.setPen(QColor("#ffffff"))
+        painter.setFont(self._delete_font)
+        painter.drawText(r, Qt.AlignmentFlag.AlignCenter, "🧹")
+
+    def _paint_add_row(self, painter, option):
+        painter.save()
+        try:
+            painter.setRenderHint(painter.RenderHint.Antialiasing, True)
+            r = QRectF(option.rect).adjusted(2.5, 2.5, -4.5, -2.5)
+            hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+            painter.setBrush(QColor("#252525") if hovered else QBrush(Qt.BrushStyle.NoBrush))
+            painter.setPen(QPen(QColor("#404040"), 1, Qt.PenStyle.DashLine))
+            painter.drawRoundedRect(r, 8, 8)
+            painter.setPen(self.ACCENT_COLOR)
+            painter.setFont(self._plus_font)
+            painter.drawText(r, Qt.AlignmentFlag.AlignCenter, "+")
+        finally:
+            painter.restore()
+
+    # --- clicks on non-editable cells --------------------------------------
+    def editorEvent(self, event, model, option, index):
+        try:
+            if (event.type() == QEvent.Type.MouseButtonRelease
+                    and event.button() == Qt.MouseButton.LeftButton):
+                row, col = index.row(), index.column()
+                pos = event.position().toPoint()
+                if model.is_add_row(row):
+                    self.add_clicked.emit()
+                    return True
+                row = model.store_row(row)
+                if col == COL_DATE and self.cell_box(option.rect).contains(pos):
+                    self.date_clicked.emit(row)
+                    return True
+                if col == COL_TYPE and self.type_box(option.rect).contains(pos):
+                    self.type_clicked.emit(row)
+                    return True
+                if col == COL_DELETE and self.cell_box(option.rect).contains(pos):
+                    self.delete_clicked.emit(row)
+                    return True
+        except Exception:
+            pass
+        return super().editorEvent(event, model, option, index)
+
+    # --- editor registry ------------------------------------------------------
+    def _register_editor(self, editor, index):
+        model = index.model()
+        row = model.store_row(index.row())
+        if row >= 0:
+            self._store = model.store
+            self._editor_ids[editor] = model.store.ids[row]
+        return row
+
+    def editor_row_id(self, widget):
+        """Stable row id of the transaction edited by `widget` or any widget
+        inside it; None when it is not an open editor.
+        """
+        try:
+            while widget is not None:
+                rid = self._editor_ids.get(widget)
+                if rid is not None:
+                    return rid
+                widget = widget.parentWidget()
+        except Exception:
+            pass
+        return None
+
+    def editor_row(self, widget) -> int:
+        """Current store row of an open editor, -1 if unknown or deleted."""
+        rid = self.editor_row_id(widget)
+        if rid is None or self._store is None:
+            return -1
+        return self._store.row_of(rid)
+
+    def destroyEditor(self, editor, index):
+        self._editor_ids.pop(editor, None)
+        super().destroyEditor(editor, index)
+
+    # --- editors ------------------------------------------------------------
+    def createEditor(self, parent, option, index):
+        col = index.column()
+        if col == COL_ITEM:
+            le = QLineEdit(parent)
+            le.setPlaceholderText("Название предмета")
+            le.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
+            le.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
+            le.setStyleSheet("""
+                QLineEdit { background-color: white; color: black; border-radius: 6px; padding: 4px 8px; border: 1px solid #555; }
+                QLineEdit:focus { border: 2px solid #4aa3df; }
+            """)
+            row = self._register_editor(le, index)
+            # Commit on every keystroke so totals/stats follow the typed name
+            le.textChanged.connect(lambda _txt, e=le: self.commitData.emit(e))
+            self.item_editor_created.emit(le, row)
+            return le
+        if col in (COL_QTY, COL_PRICE):
+            spin = NoScrollSpinBox(parent)
+            spin.setRange(*(QTY_RANGE if col == COL_QTY else PRICE_RANGE))
+            spin.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            try:
+                spin.setButtonSymbols(QAbstractSpinBox.ButtonSymbols.NoButtons)
+            except Exception:
+                pass
+            spin.valueChanged.connect(lambda _v, e=spin: self.commitData.emit(e))
+            self._register_editor(spin, index)
+            return spin
+        return None
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.EditRole)
+        # Signals are blocked so loading the value does not commit it straight back
+        editor.blockSignals(True)
+        try:
+            if isinstance(editor, QLineEdit):
+                text = value or ""
+                # Avoid resetting the cursor while the user is typing
+                if editor.text() != text:
+                    editor.setText(text)
+            elif isinstance(editor, NoScrollSpinBox):
+                try:
+                    v = int(value or 0)
+                except Exception:
+                    v = 0
+                if editor.value() != v:
+                    editor.setValue(v)
+        finally:
+            editor.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QLineEdit):
+            model.setData(index, editor.text(), Qt.ItemDataRole.EditRole)
+        elif isinstance(editor, NoScrollSpinBox):
+            model.setData(index, int(editor.value()), Qt.ItemDataRole.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        if index.column() == COL_ITEM:
+            editor.setGeometry(self.item_box(option.rect))
+        else:
+            editor.setGeometry(self.cell_box(option.rect))
+
+
+class TransactionTableView(QTableView):
+    """QTableView for TransactionTableModel: keeps the trailing '+' row spanning all
+    columns and shows a pointing-hand cursor over clickable cells. Works with any
+    model providing is_add_row(); subclasses set CLICKABLE_COLUMNS.
+    """
+    CLICKABLE_COLUMNS = (COL_DATE, COL_TYPE, COL_DELETE)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.CurrentChanged
+                             | QAbstractItemView.EditTrigger.SelectedClicked
+                             | QAbstractItemView.EditTrigger.DoubleClicked
+                             | QAbstractItemView.EditTrigger.EditKeyPressed
+                             | QAbstractItemView.EditTrigger.AnyKeyPressed)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setWordWrap(False)
+        self.add_row_height = 50
+
+    def setModel(self, model):
+        old = self.model()
+        if old is not None:
+            for sig in (old.rowsInserted, old.rowsRemoved, old.modelReset, old.layoutChanged):
+                try:
+                    sig.disconnect(self._update_add_row)
+                except Exception:
+                    pass
+        super().setModel(model)
+        if model is not None:
+            for sig in (model.rowsInserted, model.rowsRemoved, model.modelReset, model.layoutChanged):
+                sig.connect(self._update_add_row)
+        self._update_add_row()
+
+    def _update_add_row(self, *args):
+        model = self.model()
+        if model is None:
+            return
+        try:
+            last = model.rowCount() - 1
+            self.clearSpans()
+            if last >= 0:
+                self.setSpan(last, 0, 1, model.columnCount())
+                self.setRowHeight(last, self.add_row_height)
+                if last > 0 and self.rowHeight(last - 1) == self.add_row_height:
+                    self.setRowHeight(last - 1, self.verticalHeader().defaultSectionSize())
+        except Exception:
+            pass
+
+    def mouseMoveEvent(self, event):
+        try:
+            index = self.indexAt(event.position().toPoint())
+            model = self.model()
+            clickable = False
+            if index.isValid() and model is not None:
+                clickable = model.is_add_row(index.row()) or index.column() in self.CLICKABLE_COLUMNS
+            self.viewport().setCursor(Qt.CursorShape.PointingHandCursor if clickable
+                                      else Qt.CursorShape.ArrowCursor)
+        except Exception:
+            pass
+        super().mouseMoveEvent(event)
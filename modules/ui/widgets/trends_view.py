@@ -0,0 +1,111 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableView, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QPointF
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+
+from modules.core.transaction_store import day_to_date
+from .period_report import ReportTableModel
+from .transaction_table import format_display_amount
+
+TOP_HEADERS = ["Предмет", "Кол-во", "Операций", "Расходы"]
+
+
+class TrendChart(QWidget):
+    """Line chart of the running balance and the moving average of daily expense.
+    Series are reduced to one point per horizontal pixel before painting.
+    """
+
+    BALANCE_COLOR = QColor('#2a82da')
+    EXPENSE_COLOR = QColor('#e05050')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trends = None
+        self.setMinimumHeight(160)
+
+    def set_trends(self, trends):
+        self.trends = trends
+        self.update()
+
+    @staticmethod
+    def _points(values, rect):
+        n = len(values)
+        width = max(1, int(rect.width()))
+        if n > width:
+            # last value of each pixel column
+            idx = ((i * (n - 1)) // (width - 1) if width > 1 else n - 1 for i in range(width))
+            values = [float(values[i]) for i in idx]
+            n = width
+        else:
+            values = [float(v) for v in values]
+        lo, hi = min(values), max(values)
+        if hi == lo:
+            hi = lo + 1
+        step = rect.width() / max(1, n - 1)
+        return QPolygonF([QPointF(rect.left() + i * step, rect.bottom() - (v - lo) / (hi - lo) * rect.height())
+                          for i, v in enumerate(values)])
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor('#2d2d2d'))
+        trends = self.trends
+        if trends is None or trends.days < 2:
+            painter.setPen(QColor('#aaaaaa'))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Недостаточно данных за период")
+            return
+        plot = self.rect().adjusted(10, 24, -10, -10)
+        painter.setPen(QPen(self.BALANCE_COLOR, 2))
+        painter.drawPolyline(self._points(trends.balance, plot))
+        painter.setPen(QPen(self.EXPENSE_COLOR, 1.5))
+        painter.drawPolyline(self._points(-trends.moving_expense, plot))
+        painter.setPen(self.BALANCE_COLOR)
+        painter.drawText(10, 16, "Баланс")
+        painter.setPen(self.EXPENSE_COLOR)
+        painter.drawText(80, 16, f"Расходы, среднее за {trends.window} дн.")
+
+
+class TrendsWidget(QWidget):
+    """Trends tab: period summary, balance/expense chart and the top spenders."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.summary = QLabel("")
+        self.summary.setWordWrap(True)
+        layout.addWidget(self.summary)
+        self.chart = TrendChart(self)
+        layout.addWidget(self.chart, stretch=1)
+        self.top_model = ReportTableModel(self)
+        self.top_table = QTableView()
+        self.top_table.setModel(self.top_model)
+        self.top_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.top_table.setShowGrid(False)
+        self.top_table.verticalHeader().setVisible(False)
+        self.top_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.top_table, stretch=1)
+
+    def set_unavailable(self, text):
+        self.summary.setText(text)
+        self.chart.set_trends(None)
+        self.top_model.set_table(TOP_HEADERS, [])
+
+    def set_trends(self, trends):
+        self.chart.set_trends(trends)
+        if not trends.count:
+            self.summary.setText("Нет транзакций за выбранный период")
+            self.top_model.set_table(TOP_HEADERS, [])
+            return
+        per_day = trends.expense / trends.days if trends.days else 0
+        last = trends.first_day + trends.days - 1
+        self.summary.setText(
+            f"{day_to_date(trends.first_day)} – {day_to_date(last)}: {trends.count} операций, "
+            f"доходы {format_display_amount(trends.income)}, расходы {format_display_amount(trends.expense)}, "
+            f"баланс {format_display_amount(trends.income + trends.expense)}, "
+            f"в среднем {format_display_amount(int(per_day))} в день")
+        # Total row first (bold), then the items
+        spent = sum(e for _n, e, _q, _c in trends.top)
+        rows = [[f"Топ-{len(trends.top)}", "", "", format_display_amount(spent)]]
+        rows.extend([name or "(без названия)", str(qty), str(count), format_display_amount(expense)]
+                    for name, expense, qty, count in trends.top)
+        self.top_model.set_table(TOP_HEADERS, rows)